@@ -40,8 +40,15 @@ def load_app_config() -> dict:
 app_config = load_app_config()
 
 # --- 导入模块 ---
-from src.vision import Camera, HolisticRunner, FeatureExtractor
-from src.engine import VisionSignal, StateMachine, MappingEngine
+from src.vision import (
+    Camera, ThreadedCamera, ReplaySource, HolisticRunner, InferenceScheduler, FeatureExtractor, SessionRecorder,
+)
+from src.engine import VisionSignal, StateMachine, MappingEngine, MonotonicClock, VirtualClock
+from src.telemetry import FrameTracer, StatsFile
+from src.renderer import Hud, BackgroundCompositor, MemeTransitions, AssetManager, LandmarkOverlay
+from src.audio import (
+    KeywordPipeline, MicrophoneSource, WavFileSource, VadGate, SoundBank, SfxPlayer, NullOutput, SoundDeviceOutput,
+)
 
 
 def main():
@@ -50,33 +57,56 @@ def main():
     camera_cfg = app_config.get("camera", {})
     mp_cfg = app_config.get("mediapipe", {})
     debug_cfg = app_config.get("debug", {})
+    telemetry_cfg = app_config.get("telemetry", {})
 
-    # 1. 初始化视觉管道
-    camera = Camera(
-        index=camera_cfg.get("index", 0),
-        width=camera_cfg.get("width", 640),
-        height=camera_cfg.get("height", 480),
-        fps=camera_cfg.get("fps", 30),
+    # 逐帧延迟追踪（阶段 / 检测器 / 手势→吊图）
+    tracer = FrameTracer(
+        window=telemetry_cfg.get("window", 600),
+        enabled=telemetry_cfg.get("enabled", True),
     )
+    stats_file = None
+    if tracer.enabled and telemetry_cfg.get("stats_path"):
+        stats_file = StatsFile(
+            os.path.join(PROJECT_ROOT, telemetry_cfg["stats_path"]),
+            interval_s=telemetry_cfg.get("flush_interval_s", 5.0),
+        )
+
+    # 1. 初始化视觉管道
+    camera = _create_frame_source(camera_cfg)
     if not camera.open():
         log.error("摄像头不可用，退出")
         return
+    # 快速回放时不限帧率，用于离线基准测试
+    target_fps = 0 if isinstance(camera, ReplaySource) and camera_cfg.get("replay_pacing") == "fast" else 30
 
     model_path = os.path.join(PROJECT_ROOT, mp_cfg.get("model_path", "assets/models/holistic_landmarker.task"))
     holistic = HolisticRunner(
         model_path=model_path,
         min_detection_confidence=mp_cfg.get("min_detection_confidence", 0.5),
         min_tracking_confidence=mp_cfg.get("min_tracking_confidence", 0.5),
+        running_mode=mp_cfg.get("running_mode", "image"),
     )
     if not holistic.initialize():
         log.error("MediaPipe 初始化失败，退出")
         camera.release()
         return
 
+    # 自适应推理频率（仅同步模式）：静止时隔帧推理，中间帧外推关键点
+    scheduler = None
+    max_interval = mp_cfg.get("max_inference_interval", 1)
+    if not holistic.is_async and max_interval > 1:
+        scheduler = InferenceScheduler(
+            holistic,
+            max_interval=max_interval,
+            frame_budget_ms=1000.0 / camera_cfg.get("fps", 30),
+        )
+
     feature_extractor = FeatureExtractor(
         os.path.join(PROJECT_ROOT, "config", "features.json")
     )
     log.info("已注册特征: %s", feature_extractor.feature_names)
+    if tracer.enabled:
+        feature_extractor.set_tracer(tracer)
 
     # 2. 初始化引擎
     mapping_engine = MappingEngine()
@@ -84,11 +114,31 @@ def main():
         default_path=os.path.join(PROJECT_ROOT, "config", "mappings.default.json"),
         user_path=os.path.join(PROJECT_ROOT, "config", "mappings.user.json"),
     )
-    state_machine = StateMachine(mapping_engine)
+    # 引擎时钟：回放时按源帧率推进虚拟时钟，极速回放下去抖动/冷却仍按媒体时间计算
+    engine_clock = VirtualClock() if isinstance(camera, ReplaySource) else MonotonicClock()
+    state_machine = StateMachine(mapping_engine, clock=engine_clock)
+    # 语音关键词：后台线程识别，主循环每帧取一个 AudioSignal
+    audio_pipeline = _create_audio_pipeline(app_config.get("vosk", {}), mapping_engine.voice_keywords, engine_clock)
+    # 音效：启动时解码全部引用的音效，专用线程混音
+    sfx_player = _create_sfx_player(app_config.get("audio", {}), mapping_engine.enabled_mappings)
+    # 只计算启用映射实际引用的特征
+    feature_extractor.set_active_features(mapping_engine.required_features)
+    # 只转换这些特征读取的关键点（人脸 478 点通常只需 5 个）
+    landmark_selection = feature_extractor.required_landmarks
+
+    # 会话录制：逐帧写入完整关键点 + 特征，供离线调参
+    recorder = None
+    recorder_cfg = app_config.get("recorder", {})
+    if recorder_cfg.get("enabled", False):
+        session_dir = os.path.join(
+            PROJECT_ROOT, recorder_cfg.get("output_dir", "recordings"), time.strftime("%Y%m%d-%H%M%S"))
+        recorder = SessionRecorder(session_dir, features=feature_extractor.active_features)
+        recorder.open()
+        landmark_selection = None  # 录制需要完整关键点
+    holistic.set_landmark_selection(landmark_selection)
 
     # 3. 初始化 PyGame 渲染
     import pygame
-    import cv2
     import numpy as np
 
     pygame.init()
@@ -98,37 +148,80 @@ def main():
     screen = pygame.display.set_mode((screen_w, screen_h))
     pygame.display.set_caption("AutoMeme - Debug Mode")
     clock = pygame.time.Clock()
-
-    # 加载素材缓存
-    def load_image(rel_path: str | None):
-        if rel_path is None:
-            return None
-        full = os.path.join(PROJECT_ROOT, "assets", rel_path)
-        if not os.path.exists(full):
-            return None
-        try:
-            img = pygame.image.load(full).convert_alpha()
-            return pygame.transform.scale(img, (400, 400))
-        except Exception as e:
-            log.warning("Failed to load image %s: %s", rel_path, e)
-            return None
-
-    # 预加载默认素材
-    default_images = {}
-    for m in mapping_engine._mappings:
+    background = BackgroundCompositor((screen_w, screen_h))
+
+    # 吊图素材：后台线程解码缩放（GIF / APNG 打包为动图图集），LRU 字节预算 + 磁盘缓存
+    cache_dir = renderer_cfg.get("asset_cache_dir")
+    assets = AssetManager(
+        size=(400, 400),
+        budget_bytes=int(renderer_cfg.get("asset_cache_mb", 256) * (1 << 20)),
+        cache_dir=os.path.join(PROJECT_ROOT, cache_dir) if cache_dir else None,
+        gif_max_size=(renderer_cfg.get("gif_max_width", 800), renderer_cfg.get("gif_max_height", 800)),
+        gif_max_frames=renderer_cfg.get("gif_max_frames", 60),
+        gif_budget_bytes=int(renderer_cfg.get("gif_max_mb", 32) * (1 << 20)),
+    )
+    memes = MemeTransitions(
+        duration_ms=renderer_cfg.get("fade_duration_ms", 300),
+        steps=renderer_cfg.get("fade_steps", 32),
+        easing=renderer_cfg.get("fade_easing", "ease_out"),
+        pop_scale=renderer_cfg.get("pop_scale", 1.0),
+        pop_steps=renderer_cfg.get("pop_steps", 6),
+    )
+    # 按优先级预加载；素材就绪后登记到过渡层（预计算缩放档位），被淘汰时注销
+    meme_paths: dict[str, str] = {}           # 映射 → 素材路径
+    asset_users: dict[tuple, list[str]] = {}  # 素材 key → 引用它的映射
+    for m in sorted(mapping_engine._mappings, key=lambda m: -m.priority):
         if m.image_path:
-            default_images[m.id] = load_image(m.image_path)
+            full = os.path.join(PROJECT_ROOT, "assets", m.image_path)
+            if not os.path.exists(full):
+                continue
+            meme_paths[m.id] = full
+            asset_users.setdefault(assets.request(full), []).append(m.id)
+    assets.start()
+
+    # Debug 骨骼叠加层
+    landmark_overlay = None
+    if debug_cfg.get("draw_landmarks", False):
+        landmark_overlay = LandmarkOverlay((screen_w, screen_h), refresh_hz=debug_cfg.get("landmarks_refresh_hz", 15))
+
+    # Debug HUD：字体与文字 surface 缓存在组件内
+    hud = None
+    if debug_cfg.get("show_status_text", False):
+        hud = Hud(refresh_hz=debug_cfg.get("hud_refresh_hz", 10))
+
+    def status_lines() -> list[str]:
+        lines = [
+            f"State: {state_machine.state.name}",
+            f"Debounce: {state_machine.debounce_progress:.0%}",
+            f"Features: {', '.join(f'{k}={v}' for k,v in fv.features.evaluated.items())}",
+            f"Frame: {frame_id}",
+        ]
+        if isinstance(camera, ThreadedCamera):
+            cam_stats = camera.stats
+            lines.append(f"Camera: age={cam_stats.last_age_ms:.0f}ms dropped={cam_stats.dropped}")
+        if audio_pipeline is not None and audio_pipeline.vad is not None:
+            vad_stats = audio_pipeline.vad.stats
+            lines.append(
+                f"VAD: skipped={vad_stats.skipped_ratio:.0%} segments={vad_stats.segments} "
+                f"+{vad_stats.added_latency_ms:.1f}ms")
+        if tracer.enabled:
+            for name in tracer.names:
+                p50, p95, p99 = tracer.percentiles(name)
+                lines.append(f"{name}: p50={p50:.1f} p95={p95:.1f} p99={p99:.1f} ms")
+        return lines
 
     # --- 主循环 ---
     frame_id = 0
-    active_meme_id: str | None = None
-    fade_alpha = 0
-    fade_speed = 15
+    results = None
+    fv = feature_extractor.extract(None, 0, 0.0)
+    meme_priority = {m.id: m.priority for m in mapping_engine.enabled_mappings}
+    meme_pending: dict[str, float] = {}  # 已触发但尚未显示的吊图 → 检测开始时间
+    recorded_frame_id = -1
     running = True
 
     log.info("进入主循环")
     while running:
-        dt = clock.tick(30) / 1000.0
+        dt = clock.tick(target_fps) / 1000.0
 
         # 事件
         for event in pygame.event.get():
@@ -139,135 +232,207 @@ def main():
                     running = False
 
         # 摄像头
+        tracer.begin_frame()
         ret, frame = camera.read()
         if not ret:
             break
-
-        # MediaPipe 推理
-        results = holistic.process(frame)
-        now = time.time()
-
-        # 特征提取
-        fv = feature_extractor.extract(results, frame_id, now)
-
-        # 引擎更新
-        event = state_machine.update(
+        tracer.mark("capture")
+
+        if isinstance(engine_clock, VirtualClock):
+            engine_clock.advance(1.0 / camera.fps)
+        now = engine_clock.now()
+
+        # BGR→RGB 只转换一次，推理与背景显示共用
+        frame_rgb = background.convert(frame)
+
+        # MediaPipe 推理 + 特征提取
+        if holistic.is_async:
+            # 异步：提交当前帧，取回最近完成的推理结果（属于更早的帧）
+            holistic.submit(frame, frame_id, now, rgb_frame=frame_rgb)
+            inference = holistic.poll()
+            tracer.mark("inference")
+            if inference is not None:
+                results = inference.results
+                fv = feature_extractor.extract(results, inference.frame_id, inference.timestamp)
+        elif scheduler is not None:
+            # 有映射在 DETECTING（去抖动计数中）时每帧推理，保证确认不被推迟
+            results = scheduler.process(frame, now, force=state_machine.debounce_progress > 0, rgb_frame=frame_rgb)
+            tracer.mark("inference")
+            fv = feature_extractor.extract(results, frame_id, now)
+        else:
+            results = holistic.process(frame, now, rgb_frame=frame_rgb)
+            tracer.mark("inference")
+            fv = feature_extractor.extract(results, frame_id, now)
+        tracer.mark("extract")
+
+        # 引擎更新（按显示帧率运行，使用最新特征向量；各映射独立去抖动/冷却）
+        # 异步推理未出新结果时 fv 不变，状态机按 frame_id/timestamp 识别重复，不重复计入去抖动
+        events = state_machine.update_all(
             vision_signal=VisionSignal(
                 features=fv.features,
-                frame_id=frame_id,
-                timestamp=now,
-            )
+                frame_id=fv.frame_id,
+                timestamp=fv.timestamp,
+            ),
+            audio_signal=audio_pipeline.poll() if audio_pipeline is not None else None,
         )
 
+        # 特征按需求值，检测器耗时计入 engine 阶段（另有 detector.* 单独统计）
+        tracer.mark("engine")
+
+        if recorder is not None and fv.frame_id != recorded_frame_id:
+            recorder.write(results, fv.frame_id, fv.timestamp, fv.features)
+            recorded_frame_id = fv.frame_id
+
         # 触发处理
-        if event is not None:
+        for event in events:
             log.info("触发! mapping=%s type=%s image=%s",
                      event.mapping_id, event.action_type, event.image_path)
-            active_meme_id = event.mapping_id
-
-        # 淡入淡出
-        if active_meme_id is not None:
-            if state_machine.state.value >= 3:  # TRIGGERED or COOLDOWN
-                fade_alpha = min(255, fade_alpha + fade_speed)
-            else:
-                fade_alpha = max(0, fade_alpha - fade_speed)
-            if fade_alpha <= 0:
-                active_meme_id = None
+            if event.action_type in ("audio", "both") and sfx_player is not None and event.audio_path:
+                sfx_player.play(event.audio_path)
+            if event.action_type != "audio" and event.detected_at is not None:
+                meme_pending[event.mapping_id] = event.detected_at
+            if event.mapping_id in meme_paths and event.mapping_id not in memes.assets:
+                assets.get(meme_paths[event.mapping_id])   # 已被淘汰：加急后台加载，不阻塞本帧
+
+        # 素材：显示中的吊图刷新 LRU 且不被淘汰；登记已就绪的，注销被淘汰的
+        # （surface 转换在主线程，每帧最多 asset_poll_limit 个）
+        showing = [m.id for m in state_machine.active_mappings if m.action_mode != "audio"]
+        assets.set_in_use(assets.key(meme_paths[mapping_id]) for mapping_id in {*showing, *memes.active}
+                          if mapping_id in meme_paths)
+        ready, evicted = assets.poll(limit=renderer_cfg.get("asset_poll_limit", 2))
+        for key in ready:
+            for mapping_id in asset_users.get(key, ()):
+                memes.add_asset(mapping_id, assets.get(key[0], key[1]))
+        for key in evicted:
+            for mapping_id in asset_users.get(key, ()):
+                memes.remove_asset(mapping_id)
+
+        # 淡入淡出：TRIGGERED / COOLDOWN 的映射淡入，其余淡出（按经过时间，与帧率无关）
+        memes.sync(showing, now)
 
         # --- 渲染 ---
         # 背景：摄像头画面
-        frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-        bg_surface = pygame.surfarray.make_surface(frame_rgb.swapaxes(0, 1))
-        screen.blit(pygame.transform.scale(bg_surface, (screen_w, screen_h)), (0, 0))
-
-        # Debug：绘制骨骼线
-        if debug_cfg.get("draw_landmarks", False) and results is not None:
-            _draw_landmarks(screen, results, screen_w, screen_h, frame.shape)
-
-        # Debug：状态文字
-        if debug_cfg.get("show_status_text", False):
-            font = pygame.font.SysFont("consolas", 18)
-            status_lines = [
-                f"State: {state_machine.state.name}",
-                f"Debounce: {state_machine.debounce_progress:.0%}",
-                f"Features: {', '.join(f'{k}={v}' for k,v in fv.features.items())}",
-                f"Frame: {frame_id}",
-            ]
-            y = 10
-            for line in status_lines:
-                surf = font.render(line, True, (0, 255, 0))
-                screen.blit(surf, (10, y))
-                y += 22
-
-        # 渲染吊图
-        if active_meme_id and fade_alpha > 0:
-            meme_img = default_images.get(active_meme_id)
-            if meme_img is None and event is not None:
-                meme_img = load_image(event.image_path)
-                if meme_img is not None:
-                    default_images[active_meme_id] = meme_img
-            if meme_img is not None:
-                meme_surface = meme_img.copy()
-                meme_surface.set_alpha(fade_alpha)
-                screen.blit(
-                    meme_surface,
-                    meme_surface.get_rect(center=(screen_w // 2, screen_h // 2)),
-                )
+        background.draw(screen, frame_rgb)
+
+        # Debug：绘制骨骼线（按 landmarks_refresh_hz 重新光栅化，像素数组批量写入）
+        if landmark_overlay is not None and results is not None:
+            landmark_overlay.draw(screen, results, now, landmark_selection)
+
+        # Debug：状态文字（按 hud_refresh_hz 刷新，内容未变的行不重新渲染）
+        if hud is not None:
+            hud.draw(screen, status_lines, now)
+
+        # 渲染吊图（低优先级先画，高优先级在上层）
+        memes.draw(screen, (screen_w // 2, screen_h // 2), now, order=meme_priority.get)
 
         pygame.display.flip()
+        tracer.mark("render")
+        tracer.end_frame()
+
+        # 手势开始 → 吊图可见
+        for meme_id in list(meme_pending):
+            if memes.visible(meme_id, now):
+                tracer.record("gesture_to_meme", (engine_clock.now() - meme_pending.pop(meme_id)) * 1000)
+            elif meme_id not in memes.active:
+                del meme_pending[meme_id]
+        if stats_file is not None:
+            stats_file.maybe_flush(tracer)
+
         frame_id += 1
 
     # --- 清理 ---
+    assets.stop()
+    if audio_pipeline is not None:
+        audio_pipeline.stop()
+    if sfx_player is not None:
+        sfx_player.stop()
+    if recorder is not None:
+        recorder.close()
+    if stats_file is not None:
+        stats_file.flush(tracer)
     camera.release()
     holistic.close()
     pygame.quit()
     log.info("AutoMeme 退出")
 
 
-def _draw_landmarks(screen, results, sw: int, sh: int, frame_shape):
-    """Debug：绘制 MediaPipe 骨骼线。"""
-    import pygame
+def _create_frame_source(camera_cfg: dict):
+    """根据 camera 配置创建帧源：回放文件 / 线程摄像头 / 普通摄像头。"""
+    replay_path = camera_cfg.get("replay_path")
+    if replay_path:
+        return ReplaySource(
+            path=os.path.join(PROJECT_ROOT, replay_path),
+            fps=camera_cfg.get("replay_fps"),
+            pacing=camera_cfg.get("replay_pacing", "realtime"),
+            loop=camera_cfg.get("replay_loop", False),
+            flip=camera_cfg.get("replay_flip", True),
+        )
+    camera_cls = ThreadedCamera if camera_cfg.get("threaded", False) else Camera
+    return camera_cls(
+        index=camera_cfg.get("index", 0),
+        width=camera_cfg.get("width", 640),
+        height=camera_cfg.get("height", 480),
+        fps=camera_cfg.get("fps", 30),
+    )
 
-    h, w = frame_shape[:2]
-    scale_x = sw / w
-    scale_y = sh / h
-    color = (0, 255, 0)
-
-    def pt(lm):
-        return (int(lm.x * w * scale_x), int(lm.y * h * scale_y))
-
-    # Pose
-    if results.pose_landmarks and results.pose_landmarks.landmark:
-        lm_list = results.pose_landmarks.landmark
-        for connection in [(11, 12), (11, 23), (12, 24), (23, 24),
-                           (23, 25), (24, 26), (25, 27), (26, 28)]:
-            if connection[0] < len(lm_list) and connection[1] < len(lm_list):
-                a = pt(lm_list[connection[0]])
-                b = pt(lm_list[connection[1]])
-                pygame.draw.line(screen, color, a, b, 2)
-
-    # Hands
-    for hand_lm in [results.left_hand_landmarks, results.right_hand_landmarks]:
-        if hand_lm is None:
-            continue
-        lm_list = hand_lm.landmark
-        for connection in [(0, 1), (1, 2), (2, 3), (3, 4),           # thumb
-                           (0, 5), (5, 6), (6, 7), (7, 8),           # index
-                           (0, 9), (9, 10), (10, 11), (11, 12),      # middle
-                           (0, 13), (13, 14), (14, 15), (15, 16),    # ring
-                           (0, 17), (17, 18), (18, 19), (19, 20),    # pinky
-                           (5, 9), (9, 13), (13, 17)]:
-            if connection[0] < len(lm_list) and connection[1] < len(lm_list):
-                a = pt(lm_list[connection[0]])
-                b = pt(lm_list[connection[1]])
-                pygame.draw.line(screen, (255, 255, 0), a, b, 1)
-
-    # Face mesh (simplified)
-    if results.face_landmarks and results.face_landmarks.landmark:
-        for lm in results.face_landmarks.landmark:
-            x, y = pt(lm)
-            if 0 <= x < sw and 0 <= y < sh:
-                pygame.draw.circle(screen, (0, 128, 255), (x, y), 1)
+
+def _create_audio_pipeline(vosk_cfg: dict, keywords: list[str], clock) -> "KeywordPipeline | None":
+    """根据 vosk 配置创建并启动语音关键词管道；未启用、无关键词或启动失败时返回 None。"""
+    if not vosk_cfg.get("enabled", False) or not keywords:
+        return None
+    model_path = os.path.join(PROJECT_ROOT, vosk_cfg.get("model_path", ""))
+    if not os.path.isdir(model_path):
+        log.warning("Vosk model not found: %s, voice keywords disabled", model_path)
+        return None
+    sample_rate = vosk_cfg.get("sample_rate", 16000)
+    block_size = sample_rate * vosk_cfg.get("block_ms", 100) // 1000
+    if vosk_cfg.get("input", "mic") == "wav":
+        source = WavFileSource(
+            os.path.join(PROJECT_ROOT, vosk_cfg["wav_path"]), block_size=block_size, pacing="realtime")
+    else:
+        source = MicrophoneSource(sample_rate=sample_rate, block_size=block_size, device=vosk_cfg.get("device"))
+    vad = None
+    vad_cfg = vosk_cfg.get("vad", {})
+    if vad_cfg.get("enabled", True):
+        vad = VadGate(
+            sample_rate=sample_rate,
+            frame_ms=vad_cfg.get("frame_ms", 20),
+            energy_db=vad_cfg.get("energy_db", -45.0),
+            zcr_threshold=vad_cfg.get("zcr_threshold", 0.3),
+            unvoiced_margin_db=vad_cfg.get("unvoiced_margin_db", 10.0),
+            hangover_ms=vad_cfg.get("hangover_ms", 400),
+            preroll_ms=vad_cfg.get("preroll_ms", 300),
+        )
+    pipeline = KeywordPipeline(
+        source, keywords, model_path=model_path, sample_rate=sample_rate,
+        chunk_ms=vosk_cfg.get("block_ms", 100), clock=clock, vad=vad,
+        partial_results=vosk_cfg.get("partial_results", True),
+    )
+    return pipeline if pipeline.start() else None
+
+
+def _create_sfx_player(audio_cfg: dict, mappings) -> "SfxPlayer | None":
+    """解码 audio / both 映射引用的音效并启动混音线程；没有音效或输出不可用时返回 None。"""
+    # 以素材路径为键（多个映射共用同一音效只解码一次）；映射已按优先级降序，高优先级音效先占缓存预算
+    paths = dict.fromkeys(m.audio_path for m in mappings if m.audio_path and m.action_mode in ("audio", "both"))
+    items = [(p, os.path.join(PROJECT_ROOT, "assets", p)) for p in paths]
+    if not items:
+        return None
+    sample_rate = audio_cfg.get("sample_rate", 44100)
+    bank = SoundBank(sample_rate=sample_rate, channels=2, budget_bytes=int(audio_cfg.get("cache_mb", 64) * 2**20))
+    if not bank.load_all(items):
+        return None
+    if audio_cfg.get("output", "default") == "null":
+        output = NullOutput(sample_rate, 2)
+    else:
+        output = SoundDeviceOutput(sample_rate, 2, device=audio_cfg.get("device"))
+    player = SfxPlayer(
+        bank, output,
+        master_volume=audio_cfg.get("master_volume", 0.8),
+        block_size=audio_cfg.get("block_size", 512),
+        max_voices=audio_cfg.get("max_voices", 16),
+    )
+    return player if player.start() else None
 
 
 if __name__ == "__main__":
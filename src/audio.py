@@ -1 +0,0 @@
-# Phase 3: 听觉识别模块 (Vosk)\n# TODO: 实现 src/audio/ 包\n
\ No newline at end of file
@@ -0,0 +1,18 @@
+# Lazy imports，避免未使用语音时加载 vosk / sounddevice
+def __getattr__(name):
+    if name == "PcmRingBuffer":
+        from .ring_buffer import PcmRingBuffer
+        return PcmRingBuffer
+    if name == "MicrophoneSource" or name == "WavFileSource":
+        from .sources import MicrophoneSource, WavFileSource
+        return locals()[name]
+    if name == "VadGate":
+        from .vad import VadGate
+        return VadGate
+    if name in ("SoundBank", "SfxPlayer", "NullOutput", "SoundDeviceOutput"):
+        from .sfx import SoundBank, SfxPlayer, NullOutput, SoundDeviceOutput
+        return locals()[name]
+    if name == "KeywordPipeline":
+        from .keyword_pipeline import KeywordPipeline
+        return KeywordPipeline
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,237 @@
+"""语音关键词管道：输入源 → PCM 环形缓冲 → Vosk（关键词受限语法）→ AudioSignal 队列。"""
+import json
+import logging
+import queue
+import threading
+from dataclasses import dataclass
+
+from ..engine.clock import Clock, default_clock
+from ..engine.keyword_matcher import KeywordMatcher, KeywordSpotter, normalize_text
+from ..engine.signals import AudioSignal
+from .ring_buffer import PcmRingBuffer
+from .vad import VadGate
+
+logger = logging.getLogger(__name__)
+
+UNKNOWN_WORD = "[unk]"
+
+
+def _is_cjk(ch: str) -> bool:
+    return "一" <= ch <= "鿿"
+
+
+def build_grammar(keywords) -> list[str]:
+    """Vosk 受限语法：关键词 + [unk]。
+
+    中文关键词额外加入逐字空格分隔的写法——整词不在模型词表中时，Vosk 仍能按单字识别。
+    """
+    phrases: dict[str, None] = {}
+    for kw in keywords:
+        phrases.setdefault(kw, None)
+        if " " not in kw and len(kw) > 1 and all(_is_cjk(ch) for ch in kw):
+            phrases.setdefault(" ".join(kw), None)
+    phrases.setdefault(UNKNOWN_WORD, None)
+    return list(phrases)
+
+
+@dataclass
+class PipelineStats:
+    """管道统计。"""
+    processed_s: float = 0.0    # 送入识别器的音频时长
+    results: int = 0            # 识别器最终结果数
+    partial_hits: int = 0       # 在部分结果中提前检出的关键词数
+    signals: int = 0            # 产生的 AudioSignal 数
+    dropped_samples: int = 0    # 环形缓冲溢出丢弃的样本数
+    queue_full: int = 0         # 队列已满被丢弃的信号数
+
+
+class KeywordPipeline:
+    """后台语音关键词识别。
+
+    识别线程从环形缓冲按 chunk_ms 取块送入识别器；识别器只认识映射表中的 voice_keywords
+    （受限语法比开放词表省得多的 CPU，这部分 CPU 与视觉推理共享）。
+    关键词由 Aho-Corasick 自动机在流式部分结果上检出（不必等到句末的最终结果），
+    同一句的部分结果与最终结果去重后作为 AudioSignal 放入线程安全队列，主循环每帧 poll()。
+    给出 vad 时只把语音段（含预卷）送入识别器，语音段结束即取最终结果，静音和音乐间隙不占 CPU。
+    recognizer_factory(grammar_json, sample_rate) 可替换识别器（测试用）；缺省使用 vosk。
+    """
+
+    def __init__(self, source, keywords, model_path: str | None = None, sample_rate: int = 16000,
+                 chunk_ms: int = 100, buffer_s: float = 5.0, clock: Clock | None = None,
+                 recognizer_factory=None, queue_size: int = 32, vad: VadGate | None = None,
+                 partial_results: bool = True):
+        self._source = source
+        keywords = list(keywords)
+        matcher = KeywordMatcher(keywords)
+        self._keywords = matcher.keywords   # 归一化（匹配用）
+        # 识别器语法用原始短语：多词关键词去掉空格后不在模型词表中
+        self._phrases = list(dict.fromkeys(" ".join(kw.lower().split()) for kw in keywords if normalize_text(kw)))
+        self._spotter = KeywordSpotter(matcher)
+        self._partial_results = partial_results
+        self._model_path = model_path
+        self._sample_rate = sample_rate
+        self._chunk = max(1, sample_rate * chunk_ms // 1000)
+        self._ring = PcmRingBuffer(int(sample_rate * buffer_s))
+        self._clock = clock or default_clock()
+        self._recognizer_factory = recognizer_factory
+        self._vad = vad
+        self._queue: queue.Queue[AudioSignal] = queue.Queue(maxsize=queue_size)
+        self._thread: threading.Thread | None = None
+        self._running = False
+        self._stats = PipelineStats()
+
+    @property
+    def keywords(self) -> list[str]:
+        return list(self._keywords)
+
+    @property
+    def grammar(self) -> str:
+        return json.dumps(build_grammar(self._phrases), ensure_ascii=False)
+
+    @property
+    def stats(self) -> PipelineStats:
+        self._stats.dropped_samples = self._ring.dropped
+        return self._stats
+
+    @property
+    def vad(self) -> VadGate | None:
+        """语音门控（统计见 vad.stats）。"""
+        return self._vad
+
+    @property
+    def is_running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> bool:
+        """创建识别器并启动输入源与识别线程，返回是否成功。"""
+        if not self._keywords:
+            logger.info("No voice keywords mapped, audio pipeline not started")
+            return False
+        if getattr(self._source, "sample_rate", self._sample_rate) != self._sample_rate:
+            logger.error("Audio source sample rate %s != recognizer %d",
+                         self._source.sample_rate, self._sample_rate)
+            return False
+        recognizer = self._create_recognizer()
+        if recognizer is None:
+            return False
+        self._running = True
+        self._thread = threading.Thread(target=self._run, args=(recognizer,), name="KeywordPipeline", daemon=True)
+        self._thread.start()
+        if not self._source.start(self._ring):
+            self.stop()
+            return False
+        logger.info("Audio keyword pipeline started (%d keywords)", len(self._keywords))
+        return True
+
+    def stop(self) -> None:
+        self._running = False
+        self._source.stop()
+        self._ring.close()
+        if self._thread is not None:
+            self._thread.join(timeout=2.0)
+            self._thread = None
+
+    def join(self, timeout: float | None = None) -> bool:
+        """等待有限输入（如 WAV 文件）处理完毕，返回是否已结束。"""
+        if self._thread is None:
+            return True
+        self._thread.join(timeout)
+        return not self._thread.is_alive()
+
+    def poll(self) -> AudioSignal | None:
+        """取出一个待处理的 AudioSignal（非阻塞）。"""
+        try:
+            return self._queue.get_nowait()
+        except queue.Empty:
+            return None
+
+    def _create_recognizer(self):
+        grammar = self.grammar
+        if self._recognizer_factory is not None:
+            return self._recognizer_factory(grammar, self._sample_rate)
+        try:
+            from vosk import KaldiRecognizer, Model, SetLogLevel
+        except ImportError as e:
+            logger.error("vosk not available: %s", e)
+            return None
+        try:
+            SetLogLevel(-1)
+            model = Model(self._model_path)
+        except Exception as e:
+            logger.error("Failed to load Vosk model %s: %s", self._model_path, e)
+            return None
+        recognizer = KaldiRecognizer(model, self._sample_rate, grammar)
+        recognizer.SetWords(True)
+        return recognizer
+
+    def _run(self, recognizer) -> None:
+        while True:
+            block = self._ring.read(self._chunk, timeout=0.1)
+            if block is None:
+                if self._ring.closed or (self._source.finished and self._ring.available == 0):
+                    break
+                continue
+            if self._vad is None:
+                self._feed(recognizer, block)
+                continue
+            for samples, segment_end in self._vad.process(block):
+                self._feed(recognizer, samples)
+                if segment_end:
+                    self._handle_result(recognizer.FinalResult())
+        if self._vad is not None:
+            for samples, _ in self._vad.flush():
+                self._feed(recognizer, samples)
+            stats = self._vad.stats
+            logger.info("VAD skipped %.0f%% of audio (%d segments, +%.1f ms)",
+                        stats.skipped_ratio * 100, stats.segments, stats.added_latency_ms)
+        if self._running or self._source.finished:
+            self._handle_result(recognizer.FinalResult())
+
+    def _feed(self, recognizer, samples) -> None:
+        if not len(samples):
+            return
+        self._stats.processed_s += len(samples) / self._sample_rate
+        if recognizer.AcceptWaveform(samples.tobytes()):
+            self._handle_result(recognizer.Result())
+        elif self._partial_results:
+            self._handle_partial(recognizer.PartialResult())
+
+    def _handle_partial(self, result_json: str) -> None:
+        try:
+            text = json.loads(result_json).get("partial", "")
+        except (TypeError, ValueError, AttributeError):
+            return
+        if not text:
+            return
+        found = self._spotter.partial(text)
+        if found:
+            now = self._clock.now()
+            self._stats.partial_hits += len(found)
+            for kw in found:
+                # 部分结果没有逐词置信度
+                self._emit(AudioSignal(keyword=kw, confidence=1.0, timestamp=now, partial=True))
+
+    def _handle_result(self, result_json: str) -> None:
+        try:
+            result = json.loads(result_json)
+        except (TypeError, ValueError):
+            self._spotter.reset()
+            return
+        found = self._spotter.final(result.get("text", ""))
+        if normalize_text(result.get("text", "")):
+            self._stats.results += 1
+        if not found:
+            return
+        words = result.get("result") or []
+        confidence = sum(w.get("conf", 1.0) for w in words) / len(words) if words else 1.0
+        now = self._clock.now()
+        for kw in found:
+            self._emit(AudioSignal(keyword=kw, confidence=confidence, timestamp=now))
+
+    def _emit(self, signal: AudioSignal) -> None:
+        try:
+            self._queue.put_nowait(signal)
+            self._stats.signals += 1
+            logger.info("Voice keyword: %s (conf=%.2f)", signal.keyword, signal.confidence)
+        except queue.Full:
+            self._stats.queue_full += 1
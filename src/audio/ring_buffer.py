@@ -0,0 +1,101 @@
+"""单生产者/单消费者 PCM 环形缓冲：采集回调写入，识别线程按块读出。"""
+import threading
+
+import numpy as np
+
+
+class PcmRingBuffer:
+    """预分配的 int16 环形缓冲。
+
+    - write(overwrite=True)：空间不足时丢弃最旧的样本（麦克风回调不能阻塞），计入 dropped
+    - write(overwrite=False)：等待消费者腾出空间（文件输入的背压）
+    - read(n)：等待至少 n 个样本（或超时 / 关闭），返回拷贝出的样本
+    """
+
+    def __init__(self, capacity: int):
+        self._buf = np.zeros(max(1, capacity), dtype=np.int16)
+        self._read_pos = 0      # 累计读出的样本数
+        self._write_pos = 0     # 累计写入的样本数
+        self._dropped = 0
+        self._closed = False
+        self._cond = threading.Condition()
+
+    @property
+    def capacity(self) -> int:
+        return len(self._buf)
+
+    @property
+    def available(self) -> int:
+        with self._cond:
+            return self._write_pos - self._read_pos
+
+    @property
+    def dropped(self) -> int:
+        """因溢出被覆盖的样本数。"""
+        return self._dropped
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    def write(self, samples: np.ndarray, overwrite: bool = True, timeout: float | None = None) -> int:
+        """写入 int16 样本，返回实际写入数（关闭或超时时可能少于输入）。"""
+        samples = np.asarray(samples, dtype=np.int16).reshape(-1)
+        cap = len(self._buf)
+        written = 0
+        with self._cond:
+            while written < len(samples) and not self._closed:
+                free = cap - (self._write_pos - self._read_pos)
+                if free == 0:
+                    if overwrite:
+                        # 丢弃最旧的样本，为本次写入腾出空间
+                        drop = min(len(samples) - written, cap)
+                        self._read_pos += drop
+                        self._dropped += drop
+                        free = drop
+                    elif not self._cond.wait(timeout):
+                        break
+                    else:
+                        continue
+                n = min(free, len(samples) - written)
+                self._copy_in(samples[written:written + n])
+                written += n
+                self._cond.notify_all()
+        return written
+
+    def read(self, n: int, timeout: float | None = None) -> np.ndarray | None:
+        """读出恰好 n 个样本；超时返回 None；关闭后返回剩余样本（可能不足 n，为空时返回 None）。"""
+        n = min(n, len(self._buf))
+        with self._cond:
+            if not self._cond.wait_for(lambda: self._write_pos - self._read_pos >= n or self._closed, timeout):
+                return None
+            n = min(n, self._write_pos - self._read_pos)
+            if n == 0:
+                return None
+            out = self._copy_out(n)
+            self._cond.notify_all()
+            return out
+
+    def close(self) -> None:
+        """停止写入并唤醒等待者；已写入的样本仍可读出。"""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+    def _copy_in(self, samples: np.ndarray) -> None:
+        cap = len(self._buf)
+        start = self._write_pos % cap
+        first = min(len(samples), cap - start)
+        self._buf[start:start + first] = samples[:first]
+        self._buf[:len(samples) - first] = samples[first:]
+        self._write_pos += len(samples)
+
+    def _copy_out(self, n: int) -> np.ndarray:
+        cap = len(self._buf)
+        start = self._read_pos % cap
+        first = min(n, cap - start)
+        out = np.empty(n, dtype=np.int16)
+        out[:first] = self._buf[start:start + first]
+        out[first:] = self._buf[:n - first]
+        self._read_pos += n
+        return out
@@ -0,0 +1,274 @@
+"""音效播放：启动时解码为 PCM 缓存，专用线程逐块混音输出。"""
+import logging
+import threading
+import time
+import wave
+from collections.abc import Iterable
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+_SAMPLE_DTYPES = {1: np.uint8, 2: np.int16, 4: np.int32}
+
+
+def load_wav(path: str, sample_rate: int, channels: int) -> np.ndarray:
+    """解码 PCM WAV 为 (N, channels) float32，线性插值重采样到 sample_rate。"""
+    with wave.open(path, "rb") as w:
+        width = w.getsampwidth()
+        if width not in _SAMPLE_DTYPES:
+            raise ValueError(f"Unsupported WAV sample width {width}: {path}")
+        src_rate = w.getframerate()
+        src_channels = w.getnchannels()
+        raw = np.frombuffer(w.readframes(w.getnframes()), dtype=_SAMPLE_DTYPES[width])
+    data = raw.reshape(-1, src_channels).astype(np.float32)
+    if width == 1:
+        data = (data - 128.0) / 128.0
+    else:
+        data /= float(2 ** (8 * width - 1))
+
+    # 声道：单声道复制，多声道取前 channels 个（不足时复制第一声道）
+    if src_channels != channels:
+        if src_channels == 1:
+            data = np.repeat(data, channels, axis=1)
+        elif src_channels > channels:
+            data = data[:, :channels] if channels > 1 else data.mean(axis=1, keepdims=True)
+        else:
+            data = np.concatenate([data] + [data[:, :1]] * (channels - src_channels), axis=1)
+
+    if src_rate != sample_rate and len(data):
+        n = max(1, int(round(len(data) * sample_rate / src_rate)))
+        src_t = np.arange(len(data)) / src_rate
+        dst_t = np.arange(n) / sample_rate
+        data = np.stack([np.interp(dst_t, src_t, data[:, c]) for c in range(channels)], axis=1)
+    return np.ascontiguousarray(data, dtype=np.float32)
+
+
+class SoundBank:
+    """音效 PCM 缓存：所有音效按输出格式解码一次，总大小受 budget_bytes 限制。
+
+    超出预算的音效不加载（记录警告）；调用方应按优先级顺序 load()，高优先级音效先占预算。
+    目前支持 PCM WAV（8/16/32-bit）。
+    """
+
+    def __init__(self, sample_rate: int = 44100, channels: int = 2, budget_bytes: int = 64 << 20):
+        self.sample_rate = sample_rate
+        self.channels = channels
+        self.budget_bytes = budget_bytes
+        self._sounds: dict[str, np.ndarray] = {}
+        self._used = 0
+
+    @property
+    def used_bytes(self) -> int:
+        return self._used
+
+    @property
+    def keys(self) -> list[str]:
+        return list(self._sounds)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._sounds
+
+    def get(self, key: str) -> np.ndarray | None:
+        return self._sounds.get(key)
+
+    def load(self, key: str, path: str) -> bool:
+        """解码并缓存一个音效，返回是否成功。"""
+        try:
+            data = load_wav(path, self.sample_rate, self.channels)
+        except (OSError, EOFError, ValueError, wave.Error) as e:
+            logger.warning("Failed to load sound %s: %s", path, e)
+            return False
+        return self.add(key, data)
+
+    def add(self, key: str, data: np.ndarray) -> bool:
+        """缓存已解码的 (N, channels) float32 PCM。"""
+        data = np.ascontiguousarray(data, dtype=np.float32).reshape(-1, self.channels)
+        old = self._sounds.get(key)
+        used = self._used - (old.nbytes if old is not None else 0)
+        if used + data.nbytes > self.budget_bytes:
+            logger.warning("Sound cache budget exceeded, skipping %s (%.1f MB)", key, data.nbytes / 2**20)
+            return False
+        self._sounds[key] = data
+        self._used = used + data.nbytes
+        return True
+
+    def load_all(self, items: Iterable[tuple[str, str]]) -> int:
+        """按顺序加载 (key, path)，返回成功数。"""
+        loaded = sum(self.load(key, path) for key, path in items)
+        logger.info("Sound cache: %d sounds, %.1f MB", loaded, self._used / 2**20)
+        return loaded
+
+
+class NullOutput:
+    """空输出设备（无头测试）：按块接收混音结果，可选按实时节奏阻塞，保留最近的块供检查。"""
+
+    def __init__(self, sample_rate: int = 44100, channels: int = 2, realtime: bool = True, keep: int = 256):
+        self.sample_rate = sample_rate
+        self.channels = channels
+        self._realtime = realtime
+        self._keep = keep
+        self._next = None
+        self.blocks: list[np.ndarray] = []
+        self.blocks_written = 0
+
+    def open(self, block_size: int) -> bool:
+        self._next = time.monotonic()
+        return True
+
+    def write(self, block: np.ndarray) -> None:
+        self.blocks.append(block.copy())
+        if len(self.blocks) > self._keep:
+            del self.blocks[0]
+        self.blocks_written += 1
+        if self._realtime:
+            self._next += len(block) / self.sample_rate
+            delay = self._next - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            else:
+                self._next = time.monotonic()
+
+    def close(self) -> None:
+        pass
+
+
+class SoundDeviceOutput:
+    """sounddevice 阻塞式输出流（float32 交错 PCM）；write() 在设备缓冲满时阻塞，为混音线程定节奏。"""
+
+    def __init__(self, sample_rate: int = 44100, channels: int = 2, device=None):
+        self.sample_rate = sample_rate
+        self.channels = channels
+        self._device = device
+        self._stream = None
+
+    def open(self, block_size: int) -> bool:
+        try:
+            import sounddevice as sd
+        except (ImportError, OSError) as e:
+            logger.error("Audio output unavailable (sounddevice): %s", e)
+            return False
+        try:
+            self._stream = sd.RawOutputStream(
+                samplerate=self.sample_rate, blocksize=block_size, device=self._device,
+                channels=self.channels, dtype="float32", latency="low",
+            )
+            self._stream.start()
+        except Exception as e:
+            logger.error("Failed to open audio output: %s", e)
+            self._stream = None
+            return False
+        return True
+
+    def write(self, block: np.ndarray) -> None:
+        self._stream.write(block.tobytes())
+
+    def close(self) -> None:
+        if self._stream is not None:
+            self._stream.stop()
+            self._stream.close()
+            self._stream = None
+
+
+class SfxPlayer:
+    """音效混音器。
+
+    play() 只把音效加入待播放队列；混音线程每块取出新音效，与正在播放的音效叠加，
+    乘主音量并限幅后写入输出设备。新音效在下一个混音块开始播放（延迟不超过一个音频缓冲）。
+    同时播放的音效超过 max_voices 时丢弃最早的。
+    """
+
+    def __init__(self, bank: SoundBank, output=None, master_volume: float = 0.8,
+                 block_size: int = 512, max_voices: int = 16):
+        self._bank = bank
+        self._output = output or NullOutput(bank.sample_rate, bank.channels)
+        self.master_volume = master_volume
+        self.block_size = block_size
+        self._max_voices = max_voices
+        self._pending: list[tuple[np.ndarray, float, float]] = []   # (PCM, 音量, 请求时间)
+        self._voices: list[list] = []                                # [PCM, 位置, 音量]
+        self._lock = threading.Lock()
+        self._clear = False
+        self._mix = np.zeros((block_size, bank.channels), dtype=np.float32)
+        self._thread: threading.Thread | None = None
+        self._running = False
+        self.start_latency_ms = 0.0   # 最近一次 play() → 开始混音的延迟
+
+    @property
+    def active_voices(self) -> int:
+        return len(self._voices)
+
+    @property
+    def is_running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def play(self, key: str, volume: float = 1.0) -> bool:
+        """播放缓存中的音效，返回是否存在。"""
+        data = self._bank.get(key)
+        if data is None:
+            return False
+        with self._lock:
+            self._pending.append((data, volume, time.perf_counter()))
+        return True
+
+    def stop_all(self) -> None:
+        """停止所有音效（在下一个混音块生效）。"""
+        with self._lock:
+            self._pending.clear()
+            self._clear = True
+
+    def mix_block(self) -> np.ndarray:
+        """混合一个输出块（混音线程调用；返回内部缓冲，下次调用前有效）。"""
+        with self._lock:
+            pending, self._pending = self._pending, []
+            if self._clear:
+                self._voices = []
+                self._clear = False
+        if pending:
+            now = time.perf_counter()
+            for data, volume, requested in pending:
+                self._voices.append([data, 0, volume])
+                self.start_latency_ms = (now - requested) * 1000.0
+            if len(self._voices) > self._max_voices:
+                del self._voices[:len(self._voices) - self._max_voices]
+
+        mix = self._mix
+        mix.fill(0.0)
+        n = self.block_size
+        mixed = bool(self._voices)   # 本块有音效参与混音（含在本块内结束的）
+        alive = []
+        for voice in self._voices:
+            data, pos, volume = voice
+            chunk = data[pos:pos + n]
+            if volume == 1.0:
+                mix[:len(chunk)] += chunk
+            else:
+                mix[:len(chunk)] += chunk * np.float32(volume)
+            voice[1] = pos + n
+            if voice[1] < len(data):
+                alive.append(voice)
+        self._voices = alive
+        if mixed:
+            mix *= np.float32(self.master_volume)
+            np.clip(mix, -1.0, 1.0, out=mix)
+        return mix
+
+    def start(self) -> bool:
+        if not self._output.open(self.block_size):
+            return False
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name="SfxPlayer", daemon=True)
+        self._thread.start()
+        logger.info("SFX player started (%d Hz, block=%d)", self._bank.sample_rate, self.block_size)
+        return True
+
+    def stop(self) -> None:
+        self._running = False
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
+            self._thread = None
+        self._output.close()
+
+    def _run(self) -> None:
+        while self._running:
+            self._output.write(self.mix_block())
@@ -0,0 +1,115 @@
+"""音频输入源：麦克风（sounddevice 回调）或 WAV 文件，均把 16-bit 单声道 PCM 写入环形缓冲。"""
+import logging
+import threading
+import time
+import wave
+
+import numpy as np
+
+from .ring_buffer import PcmRingBuffer
+
+logger = logging.getLogger(__name__)
+
+
+class MicrophoneSource:
+    """麦克风输入：PortAudio 回调线程直接写入环形缓冲，溢出时丢弃最旧样本。"""
+
+    def __init__(self, sample_rate: int = 16000, block_size: int = 1600, device=None):
+        self.sample_rate = sample_rate
+        self._block_size = block_size
+        self._device = device
+        self._stream = None
+
+    @property
+    def finished(self) -> bool:
+        return False
+
+    def start(self, ring: PcmRingBuffer) -> bool:
+        try:
+            import sounddevice as sd
+        except (ImportError, OSError) as e:
+            logger.error("Microphone unavailable (sounddevice): %s", e)
+            return False
+
+        def callback(indata, frames, time_info, status):
+            if status:
+                logger.debug("Microphone status: %s", status)
+            ring.write(np.frombuffer(indata, dtype=np.int16))
+
+        try:
+            self._stream = sd.RawInputStream(
+                samplerate=self.sample_rate, blocksize=self._block_size, device=self._device,
+                dtype="int16", channels=1, callback=callback,
+            )
+            self._stream.start()
+        except Exception as e:
+            logger.error("Failed to open microphone: %s", e)
+            self._stream = None
+            return False
+        logger.info("Microphone opened (%d Hz, block=%d)", self.sample_rate, self._block_size)
+        return True
+
+    def stop(self) -> None:
+        if self._stream is not None:
+            self._stream.stop()
+            self._stream.close()
+            self._stream = None
+
+
+class WavFileSource:
+    """WAV 文件输入（16-bit PCM），用于离线测试。
+
+    pacing="realtime" 按采样率节流；"fast" 以环形缓冲的背压为限尽快写入。
+    多声道文件只取第一声道；采样率必须与识别器一致（不做重采样）。
+    """
+
+    def __init__(self, path: str, block_size: int = 1600, pacing: str = "fast"):
+        if pacing not in ("realtime", "fast"):
+            raise ValueError(f"Unknown pacing: {pacing!r}")
+        self._path = path
+        self._block_size = block_size
+        self._pacing = pacing
+        self._thread: threading.Thread | None = None
+        self._running = False
+        self._finished = False
+        self.sample_rate = 0
+        self.samples: np.ndarray | None = None
+        self._load()
+
+    @property
+    def finished(self) -> bool:
+        """文件已全部写入缓冲。"""
+        return self._finished
+
+    def _load(self) -> None:
+        with wave.open(self._path, "rb") as w:
+            if w.getsampwidth() != 2:
+                raise ValueError(f"Only 16-bit PCM WAV is supported: {self._path}")
+            self.sample_rate = w.getframerate()
+            data = np.frombuffer(w.readframes(w.getnframes()), dtype=np.int16)
+            self.samples = data.reshape(-1, w.getnchannels())[:, 0].copy()
+
+    def start(self, ring: PcmRingBuffer) -> bool:
+        self._running = True
+        self._finished = False
+        self._thread = threading.Thread(target=self._feed, args=(ring,), name="WavFileSource", daemon=True)
+        self._thread.start()
+        return True
+
+    def _feed(self, ring: PcmRingBuffer) -> None:
+        start = time.monotonic()
+        for pos in range(0, len(self.samples), self._block_size):
+            if not self._running:
+                break
+            if self._pacing == "realtime":
+                delay = start + pos / self.sample_rate - time.monotonic()
+                if delay > 0:
+                    time.sleep(delay)
+            ring.write(self.samples[pos:pos + self._block_size], overwrite=False)
+        self._finished = True
+
+    def stop(self) -> None:
+        self._running = False
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
+            self._thread = None
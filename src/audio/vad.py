@@ -0,0 +1,178 @@
+"""语音活动门控：能量 + 过零率 VAD，只把语音段（含预卷）送入识别器。"""
+import logging
+from dataclasses import dataclass
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+_INT16_FULL_SCALE = 32768.0
+
+
+def frame_features(frames: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """(n, L) int16 帧 → 每帧 RMS 电平 (dBFS) 与过零率 (0~1)，整块向量化计算。"""
+    x = frames.astype(np.float32) / _INT16_FULL_SCALE
+    rms = np.sqrt((x * x).mean(axis=1))
+    db = 20.0 * np.log10(np.maximum(rms, 1e-10))
+    signs = np.signbit(frames)
+    zcr = (signs[:, 1:] != signs[:, :-1]).mean(axis=1) if frames.shape[1] > 1 else np.zeros(len(frames))
+    return db, zcr
+
+
+@dataclass
+class GateStats:
+    """门控统计。"""
+    received_samples: int = 0   # 输入样本数
+    passed_samples: int = 0     # 送入识别器的样本数（含预卷）
+    segments: int = 0           # 语音段数
+    latency_sum_s: float = 0.0  # 送出片段的额外等待时间累计（帧对齐引入，块长为帧长整数倍时为 0）
+    latency_count: int = 0
+
+    @property
+    def skipped_ratio(self) -> float:
+        """未送入识别器的音频比例。"""
+        if not self.received_samples:
+            return 0.0
+        return max(0.0, 1.0 - self.passed_samples / self.received_samples)
+
+    @property
+    def added_latency_ms(self) -> float:
+        """门控为送出的音频平均增加的延迟（毫秒）。"""
+        return self.latency_sum_s / self.latency_count * 1000.0 if self.latency_count else 0.0
+
+
+class VadGate:
+    """能量/过零率语音活动检测门。
+
+    PCM 按 frame_ms 切帧，每块一次性计算各帧电平和过零率：
+    电平 ≥ energy_db 为浊音；电平在 energy_db - unvoiced_margin_db 之上且过零率 ≥ zcr_threshold 为清音
+    （擦音能量低但过零多）。最后一个语音帧之后 hangover_ms 内仍视为语音，
+    语音段开始时补发此前 preroll_ms 的音频，避免切掉词首。
+    process() 返回 [(samples, segment_end)]，segment_end 为 True 时语音段在该块之后结束。
+    """
+
+    def __init__(self, sample_rate: int = 16000, frame_ms: int = 20, energy_db: float = -45.0,
+                 zcr_threshold: float = 0.3, unvoiced_margin_db: float = 10.0,
+                 hangover_ms: int = 400, preroll_ms: int = 300):
+        self.sample_rate = sample_rate
+        self.frame_len = max(1, sample_rate * frame_ms // 1000)
+        self.energy_db = energy_db
+        self.zcr_threshold = zcr_threshold
+        self.unvoiced_margin_db = unvoiced_margin_db
+        self._hang_frames = hangover_ms * sample_rate // 1000 // self.frame_len
+        self._preroll = np.zeros(preroll_ms * sample_rate // 1000, dtype=np.int16)
+        self._preroll_fill = 0
+        self._pending = np.zeros(0, dtype=np.int16)   # 不足一帧的尾部样本
+        self._since_speech = self._hang_frames + 1   # 距上一个语音帧的帧数（封顶）
+        self._active = False
+        self._stats = GateStats()
+
+    @property
+    def stats(self) -> GateStats:
+        return self._stats
+
+    @property
+    def active(self) -> bool:
+        """当前是否处于语音段内。"""
+        return self._active
+
+    def is_speech(self, frames: np.ndarray) -> np.ndarray:
+        """(n, L) int16 帧 → (n,) bool 语音帧标志。"""
+        db, zcr = frame_features(frames)
+        voiced = db >= self.energy_db
+        unvoiced = (db >= self.energy_db - self.unvoiced_margin_db) & (zcr >= self.zcr_threshold)
+        return voiced | unvoiced
+
+    def activity(self, speech: np.ndarray) -> np.ndarray:
+        """语音帧标志 → 含 hangover 的门开启标志，并更新跨块状态。"""
+        n = len(speech)
+        idx = np.arange(n, dtype=np.int64)
+        last = np.maximum.accumulate(np.where(speech, idx, -1))
+        since = np.where(last >= 0, idx - last, self._since_speech + idx + 1)
+        if n:
+            self._since_speech = min(int(since[-1]), self._hang_frames + 1)
+        return since <= self._hang_frames
+
+    def process(self, block: np.ndarray) -> list[tuple[np.ndarray, bool]]:
+        """输入一块 int16 PCM，返回应送入识别器的片段。"""
+        block = np.asarray(block, dtype=np.int16).reshape(-1)
+        self._stats.received_samples += len(block)
+        carried = len(self._pending)
+        wait_s = len(block) / self.sample_rate   # 上一块不足一帧的尾部等到本块才送出
+        if carried:
+            block = np.concatenate((self._pending, block))
+        n_frames = len(block) // self.frame_len
+        usable = n_frames * self.frame_len
+        self._pending = block[usable:].copy()
+        if not n_frames:
+            return []
+
+        frames = block[:usable].reshape(n_frames, self.frame_len)
+        active = self.activity(self.is_speech(frames))
+
+        # 连续开启区间 [start, stop)（帧）；上一块结束时门开启，则首个区间从 0 开始续接（可能为空）
+        prev = self._active
+        edges = np.diff(np.concatenate(([prev], active, [False])).astype(np.int8))
+        starts = np.flatnonzero(edges[:-1] == 1)
+        if prev:
+            starts = np.concatenate(([0], starts))
+        stops = np.flatnonzero(edges == -1)
+        out: list[tuple[np.ndarray, bool]] = []
+        floor = 0                   # 预卷不能越过已送出的音频
+        for k, (start, stop) in enumerate(zip(starts, stops)):
+            a, b = start * self.frame_len, stop * self.frame_len
+            samples = block[a:b]
+            if not (prev and k == 0):
+                samples = np.concatenate((self._preroll_before(block, a, floor), samples))
+                self._stats.segments += 1
+            floor = b
+            out.append((samples, bool(stop < n_frames)))
+            self._stats.passed_samples += len(samples)
+            if a < carried:
+                self._stats.latency_sum_s += wait_s
+            self._stats.latency_count += 1
+        self._active = bool(active[-1])
+        self._remember(block[:usable], active)
+        return out
+
+    def flush(self) -> list[tuple[np.ndarray, bool]]:
+        """输入结束：语音段中的尾部样本送出并结束该段。"""
+        out = []
+        if self._active:
+            out.append((self._pending, True))
+            self._stats.passed_samples += len(self._pending)
+        self._pending = np.zeros(0, dtype=np.int16)
+        self._active = False
+        return out
+
+    def _preroll_before(self, block: np.ndarray, pos: int, floor: int) -> np.ndarray:
+        """语音段起点之前 preroll 长度的音频（本块之前的部分取自预卷缓冲）。"""
+        size = len(self._preroll)
+        if not size:
+            return block[:0]
+        local = block[max(floor, pos - size):pos]
+        need = size - len(local)
+        if need <= 0 or floor > 0:
+            return local
+        history = self._preroll[size - min(need, self._preroll_fill):]
+        return np.concatenate((history, local))
+
+    def _remember(self, samples: np.ndarray, active: np.ndarray) -> None:
+        """更新预卷缓冲：保留最近 preroll 长度的输入。"""
+        size = len(self._preroll)
+        if not size:
+            return
+        if active[-1]:
+            # 门仍开启时预卷不会被使用，下次闭合后重新积累
+            self._preroll_fill = 0
+            return
+        opened = np.flatnonzero(active)
+        if len(opened):
+            # 只保留最后一个语音段之后（尚未送出）的音频
+            self._preroll_fill = 0
+            samples = samples[(opened[-1] + 1) * self.frame_len:]
+        recent = samples[-size:]
+        keep = size - len(recent)
+        self._preroll[:keep] = self._preroll[len(recent):]
+        self._preroll[keep:] = recent
+        self._preroll_fill = min(size, self._preroll_fill + len(recent))
@@ -11,6 +11,12 @@ def __getattr__(name):
     if name == "Cooldown":
         from .cooldown import Cooldown
         return Cooldown
+    if name == "Clock" or name == "MonotonicClock" or name == "VirtualClock":
+        from .clock import Clock, MonotonicClock, VirtualClock
+        return locals()[name]
+    if name == "KeywordMatcher" or name == "KeywordSpotter":
+        from .keyword_matcher import KeywordMatcher, KeywordSpotter
+        return locals()[name]
     if name == "MappingEngine":
         from .mapping_engine import MappingEngine
         return MappingEngine
@@ -0,0 +1,49 @@
+"""可注入时钟：引擎内所有计时都经由 Clock.now()，便于回放和测试以快于实时的速度运行。"""
+import abc
+import time
+
+
+class Clock(abc.ABC):
+    """时钟接口，now() 返回单调递增的秒数（起点任意）。"""
+
+    @abc.abstractmethod
+    def now(self) -> float:
+        """当前时间（秒）。"""
+        ...
+
+
+class MonotonicClock(Clock):
+    """系统单调时钟（time.monotonic），不受系统时间调整影响。"""
+
+    def now(self) -> float:
+        return time.monotonic()
+
+
+class VirtualClock(Clock):
+    """手动推进的虚拟时钟：回放录制的信号或单元测试时使用。"""
+
+    def __init__(self, start: float = 0.0):
+        self._now = start
+
+    def now(self) -> float:
+        return self._now
+
+    def advance(self, seconds: float) -> float:
+        """前进 seconds 秒，返回新的时间。"""
+        if seconds < 0:
+            raise ValueError("VirtualClock cannot go backwards")
+        self._now += seconds
+        return self._now
+
+    def set(self, t: float) -> None:
+        """跳到时间 t（不可早于当前时间）。"""
+        if t < self._now:
+            raise ValueError("VirtualClock cannot go backwards")
+        self._now = t
+
+
+_DEFAULT = MonotonicClock()
+
+
+def default_clock() -> Clock:
+    return _DEFAULT
@@ -0,0 +1,136 @@
+"""语音关键词多模式匹配：Aho-Corasick 自动机 + 流式部分结果去重。"""
+from collections import deque
+from collections.abc import Iterable
+
+
+def normalize_text(text: str) -> str:
+    """识别文本/关键词归一化：小写并去掉空白（中文模型的输出按词以空格分隔）。"""
+    return "".join(text.lower().split())
+
+
+class KeywordMatcher:
+    """关键词 Aho-Corasick 自动机，逐字符扫描，一遍找出所有关键词（含中文多字短语）的出现。
+
+    状态为整数，scan() 可从任意状态继续，用于在上一次部分结果的基础上增量扫描。
+    """
+
+    def __init__(self, keywords: Iterable[str]):
+        self._goto: list[dict[str, int]] = [{}]
+        self._fail: list[int] = [0]
+        self._out: list[tuple[str, ...]] = [()]
+        self.keywords: list[str] = []
+        for kw in keywords:
+            kw = normalize_text(kw)
+            if kw and kw not in self.keywords:
+                self.keywords.append(kw)
+                self._insert(kw)
+        self._build()
+
+    def _insert(self, keyword: str) -> None:
+        state = 0
+        for ch in keyword:
+            nxt = self._goto[state].get(ch)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[state][ch] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append(())
+            state = nxt
+        self._out[state] += (keyword,)
+
+    def _build(self) -> None:
+        """BFS 计算失败指针，并把失败链上的输出合并到每个状态。"""
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in self._goto[state].items():
+                queue.append(nxt)
+                f = self._fail[state]
+                while f and ch not in self._goto[f]:
+                    f = self._fail[f]
+                self._fail[nxt] = self._goto[f].get(ch, 0)
+                self._out[nxt] += self._out[self._fail[nxt]]
+
+    def outputs(self, state: int) -> tuple[str, ...]:
+        """在该状态结束的关键词。"""
+        return self._out[state]
+
+    def step(self, state: int, ch: str) -> int:
+        goto = self._goto
+        while state and ch not in goto[state]:
+            state = self._fail[state]
+        return goto[state].get(ch, 0)
+
+    def scan(self, text: str, state: int = 0) -> tuple[list[tuple[int, str]], int]:
+        """扫描已归一化的文本，返回 ([(结束位置, 关键词)], 结束状态)。"""
+        hits = []
+        for i, ch in enumerate(text):
+            state = self.step(state, ch)
+            for kw in self._out[state]:
+                hits.append((i, kw))
+        return hits, state
+
+    def find(self, text: str) -> list[str]:
+        """文本中出现的关键词（按出现顺序，可重复）。"""
+        return [kw for _, kw in self.scan(normalize_text(text))[0]]
+
+
+class KeywordSpotter:
+    """流式关键词检出：对同一句话的部分结果与最终结果去重。
+
+    识别器的部分结果是当前句子的完整假设（会增长，也可能被改写）。
+    每句记录各关键词已报告的次数，新的假设中出现次数更多时才报告新增部分；
+    与上一次假设的公共前缀从缓存的自动机状态继续扫描，不重复扫描整句。
+    final() 报告剩余关键词并开始新的一句。
+    """
+
+    def __init__(self, matcher: KeywordMatcher):
+        self._matcher = matcher
+        self._reported: dict[str, int] = {}
+        self._text = ""
+        self._states: list[int] = [0]        # _states[i] = 扫描前 i 个字符后的状态
+        self._hits: list[tuple[int, str]] = []
+
+    def partial(self, text: str) -> list[str]:
+        """处理一次部分结果，返回新检出的关键词。"""
+        return self._update(normalize_text(text))
+
+    def final(self, text: str) -> list[str]:
+        """处理一句的最终结果，返回尚未报告的关键词，并重置为新的一句。"""
+        found = self._update(normalize_text(text))
+        self.reset()
+        return found
+
+    def reset(self) -> None:
+        self._reported.clear()
+        self._text = ""
+        self._states = [0]
+        self._hits = []
+
+    def _update(self, text: str) -> list[str]:
+        # 与上一次假设的公共前缀
+        common = 0
+        limit = min(len(text), len(self._text))
+        while common < limit and text[common] == self._text[common]:
+            common += 1
+        del self._states[common + 1:]
+        self._hits = [h for h in self._hits if h[0] < common]
+        state = self._states[common]
+        for i in range(common, len(text)):
+            state = self._matcher.step(state, text[i])
+            self._states.append(state)
+            for kw in self._matcher.outputs(state):
+                self._hits.append((i, kw))
+        self._text = text
+
+        counts: dict[str, int] = {}
+        for _, kw in self._hits:
+            counts[kw] = counts.get(kw, 0) + 1
+        found = []
+        for kw in self._matcher.keywords:
+            new = counts.get(kw, 0) - self._reported.get(kw, 0)
+            if new > 0:
+                found.extend([kw] * new)
+                self._reported[kw] = counts[kw]
+        return found
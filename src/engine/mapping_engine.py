@@ -2,6 +2,9 @@
 import json
 import logging
 import os
+from collections.abc import Mapping
+
+from .keyword_matcher import KeywordMatcher, normalize_text
 
 logger = logging.getLogger(__name__)
 
@@ -23,14 +26,26 @@ class MappingEntry:
         self.priority: int = data.get("priority", 0)
         self.cooldown_ms: int = data.get("cooldown_ms", 3000)
         self.debounce_frames: int = data.get("debounce_frames", 8)
+        self.debounce_ms: int | None = data.get("debounce_ms")  # 设置后按持续时间去抖动，忽略 debounce_frames
 
 
 class MappingEngine:
-    """管理映射表，接受特征向量和语音信号，返回匹配的 TriggerEvent。"""
+    """管理映射表，接受特征向量和语音信号，返回匹配的 TriggerEvent。
+
+    load() 时把启用映射的视觉条件编译为特征位掩码（位序 = required_features），
+    匹配只做整数位运算；另建 特征位 → 映射位集 的倒排索引，无真特征的帧直接返回。
+    """
 
     def __init__(self):
         self._mappings: list[MappingEntry] = []
         self._audio_keyword_map: dict[str, list[MappingEntry]] = {}
+        self._voice_phrases: list[str] = []   # 原始短语（小写、空白压缩为单个空格），供识别器语法使用
+        self._keyword_matcher = KeywordMatcher(())
+        self._feature_index: dict[str, int] = {}
+        self._feature_names: list[str] = []
+        self._enabled: list[MappingEntry] = []
+        self._compiled: list[tuple[int, bool, MappingEntry, int]] = []  # (特征掩码, 是否 all, 映射, 启用序号)
+        self._feature_to_mappings: list[int] = []  # 特征位 i → 引用它的编译映射位集
 
     def load(self, default_path: str, user_path: str | None = None) -> None:
         """加载默认映射 + 用户映射（用户覆盖默认）。"""
@@ -57,40 +72,199 @@ class MappingEngine:
 
         # 构建语音关键词索引
         self._audio_keyword_map.clear()
+        phrases: dict[str, None] = {}
         for m in self._mappings:
             if not m.enabled:
                 continue
             for kw in m.voice_keywords:
-                kw_lower = kw.lower()
-                if kw_lower not in self._audio_keyword_map:
-                    self._audio_keyword_map[kw_lower] = []
-                self._audio_keyword_map[kw_lower].append(m)
+                kw_norm = normalize_text(kw)
+                if not kw_norm:
+                    continue
+                phrases.setdefault(" ".join(kw.lower().split()), None)
+                if kw_norm not in self._audio_keyword_map:
+                    self._audio_keyword_map[kw_norm] = []
+                self._audio_keyword_map[kw_norm].append(m)
+        self._voice_phrases = list(phrases)
+        self._keyword_matcher = KeywordMatcher(self._audio_keyword_map)
 
+        self._compile()
         logger.info("Total mappings: %d", len(self._mappings))
 
-    def match_vision(self, features: dict[str, bool]) -> MappingEntry | None:
-        """根据特征向量匹配映射条目（优先级最高者）。"""
+    def _compile(self) -> None:
+        """把启用映射的视觉条件编译为位掩码 + 倒排索引。"""
+        self._feature_names = self.required_features
+        self._feature_index = {name: i for i, name in enumerate(self._feature_names)}
+        self._enabled = [m for m in self._mappings if m.enabled]
+        self._compiled = []
+        self._feature_to_mappings = [0] * len(self._feature_names)
+        for slot, m in enumerate(self._enabled):
+            if not m.features:
+                continue
+            mask = 0
+            for f in m.features:
+                mask |= 1 << self._feature_index[f]
+            j = len(self._compiled)
+            self._compiled.append((mask, m.condition_type == "all", m, slot))
+            for f in m.features:
+                self._feature_to_mappings[self._feature_index[f]] |= 1 << j
+        logger.debug("Compiled %d vision mappings over %d features", len(self._compiled), len(self._feature_names))
+
+    @property
+    def enabled_mappings(self) -> list[MappingEntry]:
+        """启用的映射，按优先级降序；序号即 match_vision_all() 位集中的位。"""
+        return list(self._enabled)
+
+    @property
+    def required_features(self) -> list[str]:
+        """启用映射引用的全部特征，按映射优先级排序去重。"""
+        seen: dict[str, None] = {}
         for m in self._mappings:
-            if not m.enabled or not m.features:
+            if m.enabled:
+                for f in m.features:
+                    seen.setdefault(f, None)
+        return list(seen)
+
+    @property
+    def voice_keywords(self) -> list[str]:
+        """启用映射引用的全部语音关键词短语（小写，保留词间空格），即语音识别的受限词表。
+
+        多词短语（如 "good job"）必须保留空格才在识别器词表内；匹配时由 keyword_matcher 归一化。
+        """
+        return list(self._voice_phrases)
+
+    @property
+    def keyword_matcher(self) -> KeywordMatcher:
+        """全部语音关键词的多模式匹配自动机。"""
+        return self._keyword_matcher
+
+    @property
+    def feature_index(self) -> dict[str, int]:
+        """特征名 → 位序号（pack() 使用的位布局）。"""
+        return dict(self._feature_index)
+
+    def pack(self, features: Mapping[str, bool]) -> int:
+        """把特征向量打包为位掩码（会求值所有被映射引用的特征）。"""
+        bits = 0
+        for name, i in self._feature_index.items():
+            if features.get(name, False):
+                bits |= 1 << i
+        return bits
+
+    def match_vision(self, features: Mapping[str, bool] | int) -> MappingEntry | None:
+        """根据特征向量匹配映射条目（优先级最高者）。
+
+        features 可以是已打包的位掩码（走倒排索引），也可以是特征字典：
+        后者按优先级逐条评估，每个特征至多访问一次并记入位掩码，在首个满足的映射处停止；
+        配合按需求值的特征向量，低优先级映射引用的特征不会被计算。
+        """
+        if isinstance(features, int):
+            return self.match_bits(features)
+
+        names = self._feature_names
+        known = 0   # 已求值的特征位
+        true = 0    # 已求值且为真的特征位
+        for mask, is_all, m, _ in self._compiled:
+            if is_all:
+                if mask & known & ~true:
+                    continue  # 已知有特征为假
+                pending = mask & ~known
+                while pending:
+                    low = pending & -pending
+                    pending ^= low
+                    known |= low
+                    if features.get(names[low.bit_length() - 1], False):
+                        true |= low
+                    else:
+                        break
+                if (true & mask) == mask:
+                    return m
+            else:  # "any"
+                if true & mask:
+                    return m
+                pending = mask & ~known
+                while pending:
+                    low = pending & -pending
+                    pending ^= low
+                    known |= low
+                    if features.get(names[low.bit_length() - 1], False):
+                        return m
+        return None
+
+    def match_vision_all(self, features: Mapping[str, bool], allowed: int = -1) -> int:
+        """返回本帧满足条件的全部映射（位集，位 = enabled_mappings 序号）。
+
+        共用特征的映射互相冲突：按优先级，已满足映射引用的特征不再让低优先级映射满足。
+        allowed 之外的映射（如冷却中的映射）照常参与冲突判定、占用特征，只是不出现在返回位集中。
+        每个特征至多求值一次。
+        """
+        names = self._feature_names
+        known = 0
+        true = 0
+        taken = 0   # 已满足映射占用的特征位
+        satisfied = 0
+        for mask, is_all, m, slot in self._compiled:
+            if mask & taken:
                 continue
-            if self._evaluate_condition(m, features):
+            pending = mask & ~known
+            if is_all:
+                if mask & known & ~true:
+                    continue
+                while pending:
+                    low = pending & -pending
+                    pending ^= low
+                    known |= low
+                    if features.get(names[low.bit_length() - 1], False):
+                        true |= low
+                    else:
+                        break
+                ok = (true & mask) == mask
+            else:
+                ok = bool(true & mask)
+                while pending and not ok:
+                    low = pending & -pending
+                    pending ^= low
+                    known |= low
+                    if features.get(names[low.bit_length() - 1], False):
+                        true |= low
+                        ok = True
+            if ok:
+                satisfied |= 1 << slot
+                taken |= mask
+        return satisfied & allowed
+
+    def match_bits(self, bits: int) -> MappingEntry | None:
+        """根据打包后的特征位掩码匹配映射条目（优先级最高者）。"""
+        if not bits:
+            return None
+        # 倒排索引：只检查至少引用了一个真特征的映射
+        candidates = 0
+        b = bits
+        while b:
+            low = b & -b
+            b ^= low
+            i = low.bit_length() - 1
+            if i < len(self._feature_to_mappings):
+                candidates |= self._feature_to_mappings[i]
+        # 编译映射按优先级排列，低位优先
+        while candidates:
+            low = candidates & -candidates
+            candidates ^= low
+            mask, is_all, m, _ = self._compiled[low.bit_length() - 1]
+            if not is_all or (bits & mask) == mask:
                 return m
         return None
 
     def match_audio(self, keyword: str) -> MappingEntry | None:
-        """根据语音关键词匹配映射条目。"""
-        matches = self._audio_keyword_map.get(keyword.lower(), [])
+        """根据语音关键词匹配映射条目。
+
+        keyword 不是完整关键词时按识别文本处理：取其中出现的关键词里优先级最高的映射。
+        """
+        key = normalize_text(keyword)
+        matches = self._audio_keyword_map.get(key)
+        if matches is None:
+            matches = [m for kw in self._keyword_matcher.find(key) for m in self._audio_keyword_map[kw]]
+            matches.sort(key=lambda m: -m.priority)
         for m in matches:
             if m.enabled:
                 return m
         return None
-
-    def _evaluate_condition(self, mapping: MappingEntry, features: dict[str, bool]) -> bool:
-        """评估特征条件。"""
-        if not mapping.features:
-            return False
-        results = [features.get(f, False) for f in mapping.features]
-        if mapping.condition_type == "all":
-            return all(results)
-        else:  # "any"
-            return any(results)
@@ -16,6 +16,7 @@ class AudioSignal:
     keyword: str
     confidence: float
     timestamp: float
+    partial: bool = False  # 来自识别器的部分结果（句子尚未结束）
 
 
 @dataclass
@@ -27,3 +28,4 @@ class TriggerEvent:
     audio_path: str | None
     priority: int
     timestamp: float
+    detected_at: float | None = None  # 本轮检测开始（首次满足条件）的时间，用于端到端延迟统计
@@ -1,11 +1,12 @@
-"""判定引擎状态机：IDLE → DETECTING → TRIGGERED → COOLDOWN。"""
-import time
+"""判定引擎状态机：每个映射独立运行 IDLE → DETECTING → TRIGGERED → COOLDOWN。"""
 import logging
 from enum import Enum, auto
-from .debounce import Debounce, DebounceState
-from .cooldown import Cooldown
+
+import numpy as np
+
+from .clock import Clock, default_clock
 from .signals import VisionSignal, AudioSignal, TriggerEvent
-from .mapping_engine import MappingEngine
+from .mapping_engine import MappingEngine, MappingEntry
 
 logger = logging.getLogger(__name__)
 
@@ -17,99 +18,176 @@ class EngineState(Enum):
     COOLDOWN = auto()
 
 
+_IDLE = EngineState.IDLE.value
+_DETECTING = EngineState.DETECTING.value
+_TRIGGERED = EngineState.TRIGGERED.value
+_COOLDOWN = EngineState.COOLDOWN.value
+
+
 class StateMachine:
     """核心判定引擎。
 
     消费视觉/音频信号，管理状态转移，输出 TriggerEvent。
+    每个启用映射各有一台状态机，使用自己的 debounce_frames / cooldown_ms；
+    状态、去抖动计数和冷却截止时间存放在按映射序号索引的数组里，每帧一次性更新。
+    互不冲突（不共用特征）的映射可以同时处于触发/冷却状态。
+
+    计时以信号的 timestamp 为准（无信号的帧取 clock.now()），调用方应使用同一时钟给信号打时间戳；
+    注入 VirtualClock 即可以快于实时的速度回放录制的信号。设置了 debounce_ms 的映射按持续时间去抖动。
+    语音关键词命中是离散事件（识别器已给出最终结果），不经过去抖动，直接触发。
+    与上一次相同（frame_id 与 timestamp 都不变）的视觉信号视为推理结果尚未更新（异步推理落后于显示帧率）：
+    不计入去抖动、也不打断去抖动，本轮时间取 clock.now()，冷却照常到期。
+    本轮时间不早于上一轮（之后到达的较旧时间戳按上一轮时间计）。
     """
 
-    def __init__(self, mapping_engine: MappingEngine):
+    def __init__(self, mapping_engine: MappingEngine, clock: Clock | None = None):
         self._mapping = mapping_engine
-        self._state = EngineState.IDLE
-        self._active_mapping_id: str | None = None
-        self._cooldown = Cooldown(3000)
-        self._debounce = Debounce(8)
+        self._clock = clock or default_clock()
+        self._entries: list[MappingEntry] = mapping_engine.enabled_mappings
+        self._slots = {m.id: i for i, m in enumerate(self._entries)}
+        n = len(self._entries)
+        self._states = np.full(n, _IDLE, dtype=np.int8)
+        self._counters = np.zeros(n, dtype=np.int32)
+        self._thresholds = np.array([max(1, m.debounce_frames) for m in self._entries], dtype=np.int32)
+        # 时间去抖动窗口（秒），NaN 表示按帧数去抖动
+        self._windows = np.array(
+            [np.nan if m.debounce_ms is None else m.debounce_ms / 1000.0 for m in self._entries], dtype=np.float64)
+        self._timed = ~np.isnan(self._windows)
+        self._since = np.zeros(n, dtype=np.float64)   # 本轮检测开始时间
+        self._now = -np.inf   # 上一轮的时间（只增不减）
+        self._cooldown_s = np.array([m.cooldown_ms / 1000.0 for m in self._entries], dtype=np.float64)
+        self._cooldown_until = np.zeros(n, dtype=np.float64)
+        self._last_vision: tuple[int, float] | None = None   # 上一个视觉信号的 (frame_id, timestamp)
 
     @property
     def state(self) -> EngineState:
-        return self._state
+        """汇总状态：任一映射 TRIGGERED > DETECTING > COOLDOWN > IDLE。"""
+        for code in (_TRIGGERED, _DETECTING, _COOLDOWN):
+            if (self._states == code).any():
+                return EngineState(code)
+        return EngineState.IDLE
 
     @property
     def debounce_progress(self) -> float:
-        return self._debounce.progress
+        """去抖动进度最高的映射的进度。"""
+        if not len(self._counters):
+            return 0.0
+        progress = self._counters / self._thresholds
+        if self._timed.any():
+            elapsed = np.where(self._counters > 0, self._now - self._since, 0.0)
+            with np.errstate(divide="ignore", invalid="ignore"):
+                timed = np.where(self._windows > 0, elapsed / self._windows, 1.0)
+            progress = np.where(self._timed, np.where(self._counters > 0, timed, 0.0), progress)
+        return float(np.minimum(1.0, progress).max())
+
+    def mapping_state(self, mapping_id: str) -> EngineState:
+        slot = self._slots.get(mapping_id)
+        return EngineState.IDLE if slot is None else EngineState(int(self._states[slot]))
+
+    @property
+    def active_mappings(self) -> list[MappingEntry]:
+        """处于 TRIGGERED / COOLDOWN 的映射（即应显示的吊图），按优先级降序。"""
+        return [self._entries[i] for i in np.flatnonzero(self._states >= _TRIGGERED)]
 
     def update(
         self,
         vision_signal: VisionSignal | None = None,
         audio_signal: AudioSignal | None = None,
     ) -> TriggerEvent | None:
-        """每帧调用，返回本轮是否产生触发事件。"""
-        now = time.time()
-
-        # --- 信号合并：获取当前最佳候选映射 ---
-        candidate: object | None = None
+        """每帧调用，返回本轮优先级最高的触发事件。"""
+        events = self.update_all(vision_signal, audio_signal)
+        return events[0] if events else None
 
+    def update_all(
+        self,
+        vision_signal: VisionSignal | None = None,
+        audio_signal: AudioSignal | None = None,
+    ) -> list[TriggerEvent]:
+        """每帧调用，返回本轮所有映射产生的触发事件（按优先级降序）。"""
+        stale = False
+        if vision_signal is not None:
+            key = (vision_signal.frame_id, vision_signal.timestamp)
+            stale = key == self._last_vision
+            self._last_vision = key
+            if stale:
+                vision_signal = None
         if vision_signal is not None:
-            candidate = self._mapping.match_vision(vision_signal.features)
-        if candidate is None and audio_signal is not None:
-            candidate = self._mapping.match_audio(audio_signal.keyword)
-
-        # --- 状态机转移 ---
-        if self._state == EngineState.IDLE:
-            if candidate is not None:
-                self._active_mapping_id = candidate.id
-                self._debounce.reset()
-                self._debounce.update(True)
-                self._state = EngineState.DETECTING
-                logger.debug("IDLE → DETECTING (%s)", candidate.id)
-
-        elif self._state == EngineState.DETECTING:
-            if candidate is not None and candidate.id == self._active_mapping_id:
-                # 同一映射持续满足
-                result = self._debounce.update(True)
-                if result == DebounceState.CONFIRMED:
-                    self._state = EngineState.TRIGGERED
-                    self._cooldown.trigger()
-                    logger.info("DETECTING → TRIGGERED (%s)", candidate.id)
-
-                    return TriggerEvent(
-                        mapping_id=candidate.id,
-                        action_type=candidate.action_mode,
-                        image_path=candidate.image_path,
-                        audio_path=candidate.audio_path,
-                        priority=candidate.priority,
-                        timestamp=now,
-                    )
-            elif candidate is not None:
-                # 不同映射，重置去抖动跟踪新映射
-                self._active_mapping_id = candidate.id
-                self._debounce.reset()
-                self._debounce.update(True)
-            else:
-                # 条件消失
-                self._debounce.update(False)
-                if self._debounce.counter == 0:
-                    self._state = EngineState.IDLE
-                    self._active_mapping_id = None
-                    logger.debug("DETECTING → IDLE (lost)")
-
-        elif self._state == EngineState.TRIGGERED:
-            # 立即进入冷却
-            self._state = EngineState.COOLDOWN
-            logger.debug("TRIGGERED → COOLDOWN")
-
-        elif self._state == EngineState.COOLDOWN:
-            if not self._cooldown.is_active:
-                # 冷却结束，检查是否有持续信号
-                self._state = EngineState.IDLE
-                self._active_mapping_id = None
-                self._debounce.reset()
-                logger.debug("COOLDOWN → IDLE")
-
-                # 回查：冷却期间是否有持续信号可直接进入 DETECTING
-                if candidate is not None:
-                    self._active_mapping_id = candidate.id
-                    self._debounce.update(True)
-                    self._state = EngineState.DETECTING
-
-        return None
+            now = vision_signal.timestamp
+        elif audio_signal is not None:
+            now = audio_signal.timestamp
+        else:
+            now = self._clock.now()
+        # 异步推理的信号时间戳落后于 clock.now()：夹紧使时间不倒退，冷却与去抖动窗口始终按同一时间轴判定
+        now = max(now, self._now)
+        self._now = now
+        states = self._states
+        counters = self._counters
+
+        # --- 上一帧触发的映射进入冷却；冷却结束的回到 IDLE ---
+        states[states == _TRIGGERED] = _COOLDOWN
+        expired = (states == _COOLDOWN) & (self._cooldown_until <= now)
+        if expired.any():
+            states[expired] = _IDLE
+            counters[expired] = 0
+            logger.debug("COOLDOWN → IDLE (%s)", self._ids(expired))
+
+        # --- 信号合并：冷却中的映射不会满足，但仍占用其特征（共用特征时高优先级者胜出） ---
+        ready = states != _COOLDOWN
+        allowed = 0
+        for i in np.flatnonzero(ready):
+            allowed |= 1 << int(i)
+        satisfied_bits = 0
+        if vision_signal is not None and allowed:
+            satisfied_bits = self._mapping.match_vision_all(vision_signal.features, allowed)
+        audio_bits = 0
+        if audio_signal is not None:
+            entry = self._mapping.match_audio(audio_signal.keyword)
+            if entry is not None and entry.id in self._slots:
+                audio_bits = (1 << self._slots[entry.id]) & allowed
+        satisfied = self._bits_to_mask(satisfied_bits | audio_bits)
+
+        # --- 去抖动：满足则计数 +1，否则清零；重复的视觉信号只处理语音命中，其余保持进度 ---
+        update = satisfied & ready if stale else ready
+        lost = update & ~satisfied & (states == _DETECTING)
+        if lost.any():
+            logger.debug("DETECTING → IDLE (%s lost)", self._ids(lost))
+        counters[update & ~satisfied] = 0
+        self._since[satisfied & (counters == 0)] = now
+        counters[satisfied] += 1
+        states[update] = np.where(satisfied[update], _DETECTING, _IDLE)
+
+        confirmed = np.where(self._timed, now - self._since >= self._windows - 1e-9, counters >= self._thresholds)
+        fired = satisfied & confirmed
+        if audio_bits:
+            fired |= self._bits_to_mask(audio_bits)
+        if not fired.any():
+            return []
+        states[fired] = _TRIGGERED
+        counters[fired] = 0
+        self._cooldown_until[fired] = now + self._cooldown_s[fired]
+
+        events = []
+        for i in np.flatnonzero(fired):
+            m = self._entries[i]
+            logger.info("DETECTING → TRIGGERED (%s)", m.id)
+            events.append(TriggerEvent(
+                mapping_id=m.id,
+                action_type=m.action_mode,
+                image_path=m.image_path,
+                audio_path=m.audio_path,
+                priority=m.priority,
+                timestamp=now,
+                detected_at=float(self._since[i]),
+            ))
+        return events
+
+    def _bits_to_mask(self, bits: int) -> np.ndarray:
+        mask = np.zeros(len(self._entries), dtype=bool)
+        while bits:
+            low = bits & -bits
+            bits ^= low
+            mask[low.bit_length() - 1] = True
+        return mask
+
+    def _ids(self, mask: np.ndarray) -> str:
+        return ", ".join(self._entries[i].id for i in np.flatnonzero(mask))
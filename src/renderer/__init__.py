@@ -0,0 +1,24 @@
+# Lazy imports，避免未使用渲染时加载 pygame
+def __getattr__(name):
+    if name == "Hud":
+        from .hud import Hud
+        return Hud
+    if name == "BackgroundCompositor":
+        from .background import BackgroundCompositor
+        return BackgroundCompositor
+    if name == "MemeTransitions":
+        from .transitions import MemeTransitions
+        return MemeTransitions
+    if name == "AnimatedAsset":
+        from .animated import AnimatedAsset
+        return AnimatedAsset
+    if name == "load_animated":
+        from .animated import load_animated
+        return load_animated
+    if name == "AssetManager":
+        from .assets import AssetManager
+        return AssetManager
+    if name == "LandmarkOverlay":
+        from .landmarks import LandmarkOverlay
+        return LandmarkOverlay
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,125 @@
+"""动图素材（GIF / APNG）：Pillow 一次性解码为纹理图集，按经过时间取帧。"""
+import logging
+
+import numpy as np
+import pygame
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_FRAME_MS = 100   # 缺失或过小（≤10ms）的帧时长按浏览器惯例取 100ms
+MIN_FRAME_MS = 10
+
+
+def surface_from_rgba(pixels: np.ndarray) -> pygame.Surface:
+    """(H, W, 4) RGBA 数组 → 自有像素的 surface；已有显示窗口时转换为屏幕像素格式（须在主线程调用）。"""
+    h, w = pixels.shape[:2]
+    surface = pygame.image.frombuffer(np.ascontiguousarray(pixels), (w, h), "RGBA")
+    if pygame.display.get_init() and pygame.display.get_surface() is not None:
+        return surface.convert_alpha()
+    return surface.copy()
+
+
+class AnimatedAsset:
+    """预解码的动图。
+
+    所有帧纵向排列在一张图集 surface 上，frames 为其子 surface（共享像素，不另占内存）；
+    frame_at(t) 按帧时长的累计表二分查找，播放只读缓存，不分配。
+    loop 为 0 表示无限循环，否则播放 loop 遍后停在最后一帧。
+    """
+
+    def __init__(self, atlas: pygame.Surface, frame_size: tuple[int, int], durations_ms, loop: int = 0):
+        w, h = frame_size
+        self.atlas = atlas
+        self.size = frame_size
+        self.frames = [atlas.subsurface((0, i * h, w, h)) for i in range(len(durations_ms))]
+        self.durations = np.asarray(durations_ms, dtype=np.float64) / 1000.0
+        self._ends = np.cumsum(self.durations)
+        self.total = float(self._ends[-1]) if len(self._ends) else 0.0
+        self.loop = loop
+
+    @classmethod
+    def from_pixels(cls, pixels: np.ndarray, frame_size: tuple[int, int], durations_ms,
+                    loop: int = 0) -> "AnimatedAsset":
+        """由 decode_animated() 的图集数组构造（须在主线程调用）。"""
+        return cls(surface_from_rgba(pixels), frame_size, durations_ms, loop)
+
+    def __len__(self) -> int:
+        return len(self.frames)
+
+    @property
+    def nbytes(self) -> int:
+        return self.atlas.get_bytesize() * self.atlas.get_width() * self.atlas.get_height()
+
+    def frame_index(self, elapsed: float) -> int:
+        if self.total <= 0 or elapsed <= 0:
+            return 0
+        if self.loop and elapsed >= self.total * self.loop:
+            return len(self.frames) - 1
+        t = elapsed % self.total
+        return min(int(np.searchsorted(self._ends, t, side="right")), len(self.frames) - 1)
+
+    def frame_at(self, elapsed: float) -> pygame.Surface:
+        return self.frames[self.frame_index(elapsed)]
+
+
+def _fit(size: tuple[int, int], limit: tuple[int, int]) -> tuple[int, int]:
+    """等比缩小到 limit 之内（不放大）。"""
+    w, h = size
+    scale = min(1.0, limit[0] / w, limit[1] / h)
+    return max(1, round(w * scale)), max(1, round(h * scale))
+
+
+def decode_animated(path: str, max_size: tuple[int, int] = (800, 800), max_frames: int = 60,
+                    target_size: tuple[int, int] | None = None, budget_bytes: int | None = None
+                    ) -> tuple[np.ndarray, tuple[int, int], np.ndarray, int, int] | None:
+    """解码 GIF / APNG 为图集数组；单帧图片返回 None。不涉及 pygame，可在后台线程调用。
+
+    帧等比缩小到 max_size（以及 target_size，若给出）之内；帧数超过 max_frames、
+    或图集超过 budget_bytes 时均匀抽帧，被跳过的帧时长并入保留帧，总时长不变。
+    返回 (图集 (H*n, W, 4) uint8, 帧尺寸, 逐帧时长 ms, loop, 原帧数)。
+    """
+    from PIL import Image, ImageSequence
+
+    with Image.open(path) as img:
+        n = getattr(img, "n_frames", 1)
+        if n <= 1:
+            return None
+        limit = max_size if target_size is None else (min(max_size[0], target_size[0]),
+                                                      min(max_size[1], target_size[1]))
+        size = _fit(img.size, limit)
+        loop = int(img.info.get("loop", 0) or 0)
+
+        limit_frames = max(1, max_frames)
+        if budget_bytes is not None:
+            limit_frames = min(limit_frames, max(1, budget_bytes // (size[0] * size[1] * 4)))
+        keep = np.unique(np.linspace(0, n - 1, limit_frames).round().astype(int)) if n > limit_frames \
+            else np.arange(n)
+        slot = np.searchsorted(keep, np.arange(n), side="right") - 1   # 原帧 → 保留帧
+        durations = np.zeros(len(keep))
+        w, h = size
+        pixels = np.empty((h * len(keep), w, 4), dtype=np.uint8)
+        for i, frame in enumerate(ImageSequence.Iterator(img)):
+            ms = frame.info.get("duration") or DEFAULT_FRAME_MS
+            durations[slot[i]] += ms if ms > MIN_FRAME_MS else DEFAULT_FRAME_MS
+            k = int(np.searchsorted(keep, i))
+            if k >= len(keep) or keep[k] != i:
+                continue
+            rgba = frame.convert("RGBA")
+            if rgba.size != size:
+                rgba = rgba.resize(size, Image.LANCZOS)
+            pixels[k * h:(k + 1) * h] = np.asarray(rgba)
+    return pixels, size, durations, loop, n
+
+
+def load_animated(path: str, max_size: tuple[int, int] = (800, 800), max_frames: int = 60,
+                  target_size: tuple[int, int] | None = None,
+                  budget_bytes: int | None = None) -> AnimatedAsset | None:
+    """同步解码 GIF / APNG 为 AnimatedAsset；单帧图片返回 None（由静态路径加载）。参数见 decode_animated()。"""
+    decoded = decode_animated(path, max_size, max_frames, target_size, budget_bytes)
+    if decoded is None:
+        return None
+    pixels, size, durations, loop, n = decoded
+    asset = AnimatedAsset.from_pixels(pixels, size, durations, loop)
+    logger.info("Animated asset %s: %d/%d frames, %dx%d, %.1fs, %.1f MB",
+                path, len(asset), n, size[0], size[1], asset.total, asset.nbytes / 2**20)
+    return asset
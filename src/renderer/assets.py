@@ -0,0 +1,254 @@
+"""吊图素材管理：后台线程解码缩放，按字节预算 LRU 缓存，缩放结果持久化到磁盘缓存。"""
+import hashlib
+import itertools
+import logging
+import os
+import queue
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+
+import numpy as np
+import pygame
+
+from .animated import AnimatedAsset, decode_animated, surface_from_rgba
+
+logger = logging.getLogger(__name__)
+
+_CACHE_VERSION = 1   # 磁盘缓存格式或缩放算法变化时递增，使旧缓存失效
+
+AssetKey = tuple[str, tuple[int, int]]
+
+
+@dataclass
+class AssetStats:
+    hits: int = 0
+    misses: int = 0
+    decoded: int = 0       # 从原图解码
+    disk_hits: int = 0     # 从磁盘缓存读取
+    failed: int = 0
+    evictions: int = 0
+
+
+@dataclass
+class _Decoded:
+    """工作线程的结果：像素数组（surface 在主线程创建）。"""
+    key: AssetKey
+    pixels: np.ndarray | None = None
+    frame_size: tuple[int, int] | None = None
+    durations: np.ndarray | None = None   # 动图逐帧时长 ms；静态图为 None
+    loop: int = 0
+    error: str | None = None
+
+
+class AssetManager:
+    """吊图素材缓存。
+
+    request() 只把 (路径, 目标尺寸) 放入工作线程队列；工作线程用 Pillow 解码、缩放
+    （GIF / APNG 打包为动图图集），结果以像素数组交回。主循环每帧调用 poll() 把完成的结果
+    转换为 surface 放入 LRU，返回新就绪与被淘汰的 key；get() 从不阻塞，未命中时发起加载并返回 None。
+    LRU 按 surface 字节数受 budget_bytes 限制，超出时淘汰最久未用的素材；
+    set_in_use() 标记正在显示的素材（刷新 LRU 顺序且不会被淘汰）。
+    加载失败的素材 request() 不再重试，显式 get() 时重新排队（文件可能当时仍在写入）。
+    cache_dir 非空时，缩放后的像素按 原图内容哈希 + mtime + 尺寸参数 存为 .npz，
+    重启时直接读取，不再解码缩放；原图修改后缓存自然失效。
+    静态图缩放到目标尺寸（与原 pygame.transform.scale 一致，不保持比例），动图等比缩小到目标尺寸之内。
+    """
+
+    def __init__(self, size: tuple[int, int] = (400, 400), budget_bytes: int = 256 << 20,
+                 cache_dir: str | None = None, gif_max_size: tuple[int, int] = (800, 800),
+                 gif_max_frames: int = 60, gif_budget_bytes: int | None = None):
+        self.size = size
+        self.budget_bytes = budget_bytes
+        self.cache_dir = cache_dir
+        self._gif_max_size = gif_max_size
+        self._gif_max_frames = gif_max_frames
+        self._gif_budget = gif_budget_bytes
+        self._assets: OrderedDict[AssetKey, pygame.Surface | AnimatedAsset] = OrderedDict()
+        self._sizes: dict[AssetKey, int] = {}
+        self._used = 0
+        self._pending: set[AssetKey] = set()
+        self._failed: set[AssetKey] = set()
+        self._in_use: set[AssetKey] = set()
+        self._requests: queue.PriorityQueue = queue.PriorityQueue()
+        self._results: queue.SimpleQueue = queue.SimpleQueue()
+        self._seq = itertools.count()
+        self._thread: threading.Thread | None = None
+        self.stats = AssetStats()
+
+    @property
+    def used_bytes(self) -> int:
+        return self._used
+
+    @property
+    def pending(self) -> int:
+        return len(self._pending)
+
+    def __contains__(self, key: AssetKey) -> bool:
+        return key in self._assets
+
+    def key(self, path: str, size: tuple[int, int] | None = None) -> AssetKey:
+        return os.path.abspath(path), tuple(size or self.size)
+
+    def start(self) -> None:
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="AssetLoader", daemon=True)
+            self._thread.start()
+
+    def stop(self) -> None:
+        if self._thread is not None:
+            self._requests.put((-1, -1, None))
+            self._thread.join(timeout=2.0)
+            self._thread = None
+
+    def request(self, path: str, size: tuple[int, int] | None = None, urgent: bool = False) -> AssetKey:
+        """排队加载（已缓存、加载中或曾失败的不重复排队）；urgent 插到预加载之前。"""
+        key = self.key(path, size)
+        if key not in self._assets and key not in self._pending and key not in self._failed:
+            self._pending.add(key)
+            self._requests.put((0 if urgent else 1, next(self._seq), key))
+        return key
+
+    def get(self, path: str, size: tuple[int, int] | None = None) -> pygame.Surface | AnimatedAsset | None:
+        """取缓存素材（刷新 LRU 顺序）；未命中时发起加急加载（含重试曾失败的）并返回 None，不阻塞。"""
+        key = self.key(path, size)
+        asset = self._assets.get(key)
+        if asset is None:
+            self.stats.misses += 1
+            self._failed.discard(key)
+            self.request(path, size, urgent=True)
+            return None
+        self.stats.hits += 1
+        self._assets.move_to_end(key)
+        return asset
+
+    def set_in_use(self, keys) -> None:
+        """标记正在使用的素材：刷新其 LRU 顺序，淘汰时跳过；未列出的取消标记。"""
+        self._in_use = set(keys)
+        for key in self._in_use:
+            if key in self._assets:
+                self._assets.move_to_end(key)
+
+    def poll(self, limit: int | None = None) -> tuple[list[AssetKey], list[AssetKey]]:
+        """主线程调用：把最多 limit 个完成的结果转为 surface 放入缓存，返回 (新就绪, 被淘汰)。"""
+        ready: list[AssetKey] = []
+        evicted: list[AssetKey] = []
+        while limit is None or len(ready) < limit:
+            try:
+                result = self._results.get_nowait()
+            except queue.Empty:
+                break
+            self._pending.discard(result.key)
+            if result.error is not None:
+                self._failed.add(result.key)
+                self.stats.failed += 1
+                logger.warning("Failed to load asset %s: %s", result.key[0], result.error)
+                continue
+            if result.durations is None:
+                asset = surface_from_rgba(result.pixels)
+                nbytes = asset.get_bytesize() * asset.get_width() * asset.get_height()
+            else:
+                asset = AnimatedAsset.from_pixels(result.pixels, result.frame_size, result.durations, result.loop)
+                nbytes = asset.nbytes
+            self._insert(result.key, asset, nbytes, evicted)
+            ready.append(result.key)
+        return ready, evicted
+
+    def evict(self, key: AssetKey) -> bool:
+        asset = self._assets.pop(key, None)
+        if asset is None:
+            return False
+        self._used -= self._sizes.pop(key)
+        self.stats.evictions += 1
+        return True
+
+    def _insert(self, key: AssetKey, asset, nbytes: int, evicted: list[AssetKey]) -> None:
+        if key in self._assets:
+            self._used -= self._sizes.pop(key)
+            del self._assets[key]
+        if self._used + nbytes > self.budget_bytes:
+            for old in [k for k in self._assets if k not in self._in_use]:   # 最久未用在前
+                if self._used + nbytes <= self.budget_bytes:
+                    break
+                self.evict(old)
+                evicted.append(old)
+        if self._used + nbytes > self.budget_bytes:   # 单个素材超出预算，或其余素材都在使用中
+            logger.warning("Asset cache over budget after loading %s (%.1f MB)", key[0], nbytes / 2**20)
+        self._assets[key] = asset
+        self._sizes[key] = nbytes
+        self._used += nbytes
+
+    # --- 工作线程 ---
+
+    def _run(self) -> None:
+        while True:
+            _, _, key = self._requests.get()
+            if key is None:
+                break
+            try:
+                result = self._load(key)
+            except Exception as e:   # Pillow 对损坏文件可能抛出各种异常
+                result = _Decoded(key, error=str(e))
+            self._results.put(result)
+
+    def _load(self, key: AssetKey) -> _Decoded:
+        path, size = key
+        with open(path, "rb") as f:
+            data = f.read()
+        cache_path = self._cache_path(data, os.stat(path).st_mtime_ns, size)
+        if cache_path is not None and os.path.exists(cache_path):
+            try:
+                with np.load(cache_path) as npz:
+                    durations = npz["durations"] if npz["animated"] else None
+                    result = _Decoded(key, npz["pixels"], tuple(int(v) for v in npz["frame_size"]),
+                                      durations, int(npz["loop"]))
+                self.stats.disk_hits += 1
+                return result
+            except (OSError, ValueError, KeyError) as e:
+                logger.warning("Ignoring broken asset cache %s: %s", cache_path, e)
+
+        result = self._decode(key)
+        self.stats.decoded += 1
+        if cache_path is not None:
+            self._store(cache_path, result)
+        return result
+
+    def _decode(self, key: AssetKey) -> _Decoded:
+        from PIL import Image
+
+        path, size = key
+        decoded = decode_animated(path, self._gif_max_size, self._gif_max_frames, size, self._gif_budget)
+        if decoded is not None:
+            pixels, frame_size, durations, loop, _ = decoded
+            return _Decoded(key, pixels, frame_size, durations, loop)
+        with Image.open(path) as img:
+            rgba = img.convert("RGBA")
+        if rgba.size != size:
+            rgba = rgba.resize(size, Image.LANCZOS)
+        return _Decoded(key, np.asarray(rgba), size)
+
+    def _cache_path(self, data: bytes, mtime_ns: int, size: tuple[int, int]) -> str | None:
+        if self.cache_dir is None:
+            return None
+        h = hashlib.sha1(data)
+        h.update(repr((_CACHE_VERSION, mtime_ns, size, self._gif_max_size, self._gif_max_frames,
+                       self._gif_budget)).encode())
+        return os.path.join(self.cache_dir, h.hexdigest() + ".npz")
+
+    def _store(self, cache_path: str, result: _Decoded) -> None:
+        """原子写入（临时文件 + rename），写入失败只记录警告。"""
+        tmp = f"{cache_path}.{threading.get_ident()}.tmp"
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            with open(tmp, "wb") as f:
+                np.savez(
+                    f, pixels=result.pixels, frame_size=np.asarray(result.frame_size),
+                    animated=result.durations is not None,
+                    durations=result.durations if result.durations is not None else np.zeros(0),
+                    loop=result.loop,
+                )
+            os.replace(tmp, cache_path)
+        except OSError as e:
+            logger.warning("Failed to write asset cache %s: %s", cache_path, e)
+            if os.path.exists(tmp):
+                os.remove(tmp)
@@ -0,0 +1,98 @@
+"""摄像头背景合成：BGR→RGB 只转换一次（推理与显示共用），缩放结果直接写入屏幕像素缓冲。"""
+import logging
+
+import cv2
+import numpy as np
+import pygame
+
+logger = logging.getLogger(__name__)
+
+# 32 位屏幕的 (R, G, B) 掩码 → RGB 帧转换为该内存布局的 cvtColor 代码（小端）
+_DIRECT_CODES = {
+    (0xFF0000, 0x00FF00, 0x0000FF): cv2.COLOR_RGB2BGRA,
+    (0x0000FF, 0x00FF00, 0xFF0000): cv2.COLOR_RGB2RGBA,
+}
+
+
+class BackgroundCompositor:
+    """摄像头画面背景层。
+
+    convert() 把 BGR 帧转换进常驻 RGB 缓冲，结果同时交给 HolisticRunner（rgb_frame）使用。
+    draw() 在屏幕为无填充的 32 位 surface 时，先在源分辨率上转换为屏幕像素格式（常驻缓冲），
+    再用 cv2.resize 直接写入屏幕像素缓冲——整帧尺寸的写入只有这一次，不创建 surface、不 blit。
+    其他屏幕格式退回：缩放进常驻 RGB 缓冲（frombuffer 共享内存的 surface）后 blit。
+    缺省最近邻缩放，与原 pygame.transform.scale 一致。
+    """
+
+    def __init__(self, size: tuple[int, int], interpolation: int = cv2.INTER_NEAREST):
+        self.size = size
+        self.interpolation = interpolation
+        self._rgb: np.ndarray | None = None
+        self._native: np.ndarray | None = None     # 源分辨率、屏幕像素格式
+        self._scaled: np.ndarray | None = None     # 退回路径：目标尺寸 RGB
+        self._surface: pygame.Surface | None = None
+        self._surface_source: np.ndarray | None = None
+        self.reallocations = 0
+
+    @property
+    def rgb(self) -> np.ndarray | None:
+        """最近一次 convert() 的 RGB 帧（常驻缓冲，下一次 convert() 时被覆盖）。"""
+        return self._rgb
+
+    def convert(self, bgr_frame: np.ndarray) -> np.ndarray:
+        """BGR → RGB，写入常驻缓冲并返回。"""
+        self._rgb = self._buffer(self._rgb, bgr_frame.shape)
+        cv2.cvtColor(bgr_frame, cv2.COLOR_BGR2RGB, dst=self._rgb)
+        return self._rgb
+
+    def draw(self, screen: pygame.Surface, rgb: np.ndarray | None = None, pos: tuple[int, int] = (0, 0)) -> None:
+        src = self._rgb if rgb is None else rgb
+        code = self._direct_code(screen, pos)
+        if code is None:
+            screen.blit(self.compose(src), pos)
+            return
+        w, h = self.size
+        pixels = np.frombuffer(screen.get_buffer(), dtype=np.uint8).reshape(h, w, 4)
+        try:
+            if src.shape[:2] == (h, w):
+                cv2.cvtColor(src, code, dst=pixels)
+            else:
+                self._native = self._buffer(self._native, (*src.shape[:2], 4))
+                cv2.cvtColor(src, code, dst=self._native)
+                cv2.resize(self._native, (w, h), dst=pixels, interpolation=self.interpolation)
+        finally:
+            del pixels   # 释放像素缓冲，解除 surface 锁定
+
+    def compose(self, rgb: np.ndarray | None = None) -> pygame.Surface:
+        """把 RGB 帧更新到目标尺寸的常驻 surface 并返回（退回路径，也可用于离屏合成）。"""
+        src = self._rgb if rgb is None else rgb
+        w, h = self.size
+        if src.shape[:2] == (h, w) and src.flags.c_contiguous:
+            target = src   # 尺寸一致：surface 直接共享源缓冲
+        else:
+            self._scaled = self._buffer(self._scaled, (h, w, 3))
+            cv2.resize(src, (w, h), dst=self._scaled, interpolation=self.interpolation)
+            target = self._scaled
+        if self._surface is None or self._surface_source is not target:
+            self._surface = pygame.image.frombuffer(target, (w, h), "RGB")
+            self._surface_source = target
+        return self._surface
+
+    def resize(self, size: tuple[int, int]) -> None:
+        """修改目标尺寸（窗口大小变化时）。"""
+        if size != self.size:
+            self.size = size
+            self._surface = None
+            self._surface_source = None
+
+    def _direct_code(self, screen: pygame.Surface, pos: tuple[int, int]) -> int | None:
+        w, h = self.size
+        if pos != (0, 0) or screen.get_size() != (w, h) or screen.get_bytesize() != 4 or screen.get_pitch() != w * 4:
+            return None
+        return _DIRECT_CODES.get(tuple(screen.get_masks()[:3]))
+
+    def _buffer(self, buf: np.ndarray | None, shape: tuple[int, ...]) -> np.ndarray:
+        if buf is None or buf.shape != tuple(shape):
+            buf = np.empty(shape, dtype=np.uint8)
+            self.reallocations += 1
+        return buf
@@ -0,0 +1,96 @@
+"""Debug HUD：缓存字体与逐行文字 surface，按较低频率刷新。"""
+import logging
+from collections import OrderedDict
+from collections.abc import Callable, Sequence
+
+import pygame
+
+logger = logging.getLogger(__name__)
+
+
+class Hud:
+    """状态文字叠加层。
+
+    字体只创建一次；每行文字渲染后按内容缓存（LRU），内容未变的行不重新渲染。
+    所有行合成到一张常驻的叠加 surface 上，只有某行变化时才重画，每帧只需一次 blit。
+    refresh_hz 限制文字刷新频率：draw() 的 lines 可以是可调用对象，未到刷新时间时不调用
+    （拼接特征列表等字符串本身也有开销）。
+    """
+
+    def __init__(self, font_name: str | None = "consolas", font_size: int = 18,
+                 color: tuple[int, int, int] = (0, 255, 0), line_height: int = 22,
+                 origin: tuple[int, int] = (10, 10), refresh_hz: float = 10.0, cache_size: int = 256):
+        self.color = color
+        self.line_height = line_height
+        self.origin = origin
+        self.refresh_interval = 1.0 / refresh_hz if refresh_hz > 0 else 0.0
+        self._font_name = font_name
+        self._font_size = font_size
+        self._font: pygame.font.Font | None = None
+        self._cache: OrderedDict[str, pygame.Surface] = OrderedDict()
+        self._cache_size = cache_size
+        self._lines: list[str] = []
+        self._overlay: pygame.Surface | None = None
+        self._next_refresh = float("-inf")
+        self.renders = 0   # 实际渲染的文字行数（统计）
+
+    @property
+    def font(self) -> pygame.font.Font:
+        if self._font is None:
+            if not pygame.font.get_init():
+                pygame.font.init()
+            self._font = pygame.font.SysFont(self._font_name, self._font_size) if self._font_name \
+                else pygame.font.Font(None, self._font_size)
+        return self._font
+
+    @property
+    def lines(self) -> list[str]:
+        return list(self._lines)
+
+    def due(self, now: float) -> bool:
+        """是否到了刷新时间。"""
+        return now >= self._next_refresh
+
+    def update(self, lines: Sequence[str] | Callable[[], Sequence[str]], now: float, force: bool = False) -> bool:
+        """到刷新时间（或 force）时更新文字，返回叠加层是否重画。"""
+        if not force and not self.due(now):
+            return False
+        self._next_refresh = now + self.refresh_interval
+        lines = list(lines() if callable(lines) else lines)
+        if lines == self._lines and self._overlay is not None:
+            return False
+        self._lines = lines
+        self._compose()
+        return True
+
+    def draw(self, screen: pygame.Surface, lines: Sequence[str] | Callable[[], Sequence[str]] | None = None,
+             now: float = 0.0) -> None:
+        """按需更新后把叠加层画到 screen。"""
+        if lines is not None:
+            self.update(lines, now)
+        if self._overlay is not None:
+            screen.blit(self._overlay, self.origin)
+
+    def _line_surface(self, text: str) -> pygame.Surface:
+        surf = self._cache.get(text)
+        if surf is not None:
+            self._cache.move_to_end(text)
+            return surf
+        surf = self.font.render(text, True, self.color)
+        self.renders += 1
+        self._cache[text] = surf
+        if len(self._cache) > self._cache_size:
+            self._cache.popitem(last=False)
+        return surf
+
+    def _compose(self) -> None:
+        surfaces = [self._line_surface(text) for text in self._lines]
+        width = max((s.get_width() for s in surfaces), default=0)
+        height = self.line_height * len(surfaces)
+        overlay = self._overlay
+        if overlay is None or overlay.get_width() < width or overlay.get_height() < height \
+                or overlay.get_height() > 2 * max(height, self.line_height):
+            overlay = self._overlay = pygame.Surface((max(1, width), max(1, height)), pygame.SRCALPHA)
+        overlay.fill((0, 0, 0, 0))
+        for i, surf in enumerate(surfaces):
+            overlay.blit(surf, (0, i * self.line_height))
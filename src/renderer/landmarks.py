@@ -0,0 +1,163 @@
+"""Debug 骨骼叠加层：关键点整组换算为像素坐标，经像素数组批量光栅化，按较低频率刷新。"""
+import logging
+
+import numpy as np
+import pygame
+
+logger = logging.getLogger(__name__)
+
+POSE_CONNECTIONS = np.array([(11, 12), (11, 23), (12, 24), (23, 24),
+                             (23, 25), (24, 26), (25, 27), (26, 28)])
+HAND_CONNECTIONS = np.array([(0, 1), (1, 2), (2, 3), (3, 4),           # thumb
+                             (0, 5), (5, 6), (6, 7), (7, 8),           # index
+                             (0, 9), (9, 10), (10, 11), (11, 12),      # middle
+                             (0, 13), (13, 14), (14, 15), (15, 16),    # ring
+                             (0, 17), (17, 18), (18, 19), (19, 20),    # pinky
+                             (5, 9), (9, 13), (13, 17)])
+
+
+def _square(width: int) -> np.ndarray:
+    """线宽 width 的方形笔刷偏移 (K, 2)。"""
+    r = np.arange(-((width - 1) // 2), width // 2 + 1)
+    return np.stack(np.meshgrid(r, r, indexing="ij"), axis=-1).reshape(-1, 2)
+
+
+def _disc(radius: int) -> np.ndarray:
+    """半径 radius 的圆形笔刷偏移 (K, 2)。"""
+    offsets = _square(2 * radius + 1)
+    return offsets[(offsets ** 2).sum(axis=1) <= radius * radius]
+
+
+def segment_pixels(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """一组线段 a[i]→b[i]（整数像素坐标 (C, 2)）一次性采样为 (P, 2) 像素坐标（DDA，每像素一个采样）。"""
+    if len(a) == 0:
+        return np.empty((0, 2), dtype=np.int32)
+    a = a.astype(np.float32)
+    d = b - a
+    n = np.abs(d).max(axis=1).astype(np.int64) + 1
+    step = d / np.maximum(n - 1, 1)[:, None]
+    k = np.arange(n.sum(), dtype=np.float32) - np.repeat(np.cumsum(n) - n, n).astype(np.float32)
+    points = np.repeat(a + 0.5, n, axis=0) + np.repeat(step, n, axis=0) * k[:, None]
+    return points.astype(np.int32)
+
+
+class LandmarkOverlay:
+    """MediaPipe 关键点 Debug 叠加层（取代逐点 pygame.draw 调用）。
+
+    update() 把各部位 (N,3) 归一化坐标一次换算为屏幕像素，骨骼连线按 DDA 向量化采样，
+    裁剪到屏幕内后套上笔刷偏移，得到每种颜色的扁平像素下标；draw() 通过屏幕的像素缓冲
+    按颜色各做一次批量写入。refresh_hz 限制重新光栅化的频率，期间 draw() 复用上次的下标。
+    selection 为已转换的关键点声明：骨骼线只连两端都已转换的点，面部只画已转换的点。
+    """
+
+    def __init__(self, size: tuple[int, int], refresh_hz: float = 15.0, pose_color=(0, 255, 0),
+                 hand_color=(255, 255, 0), face_color=(0, 128, 255), pose_width: int = 2,
+                 hand_width: int = 1, point_radius: int = 1):
+        self.size = size
+        self.refresh_interval = 1.0 / refresh_hz if refresh_hz > 0 else 0.0
+        self._colors = {"pose": pose_color, "hand": hand_color, "face": face_color}
+        self._brushes = {name: self._brush(offsets) for name, offsets in
+                         (("pose", _square(pose_width)), ("hand", _square(hand_width)), ("face", _disc(point_radius)))}
+        self._layers: list[tuple[tuple[int, int, int], np.ndarray]] = []   # (颜色, 扁平下标 y*w+x)
+        self._next_refresh = float("-inf")
+        self.renders = 0   # 实际光栅化次数（统计）
+
+    @property
+    def pixel_count(self) -> int:
+        return sum(len(idx) for _, idx in self._layers)
+
+    def due(self, now: float) -> bool:
+        """是否到了刷新时间。"""
+        return now >= self._next_refresh
+
+    def clear(self) -> None:
+        self._layers = []
+
+    def update(self, results, now: float, selection=None, force: bool = False) -> bool:
+        """到刷新时间（或 force）时按 results（LandmarkFrame 或 部位 → (N,3) 的映射）重新光栅化。"""
+        if not force and not self.due(now):
+            return False
+        self._next_refresh = now + self.refresh_interval
+        layers = []
+
+        pose = results.get("pose")
+        if pose is not None:
+            indices = None if selection is None else selection.get("pose")
+            c = self._valid(POSE_CONNECTIONS, len(pose), indices)
+            px = self._to_px(pose)
+            layers.append(("pose", segment_pixels(px[c[:, 0]], px[c[:, 1]])))
+
+        # 双手的连线合并为一次采样
+        a, b = [], []
+        for hand in (results.get("left_hand"), results.get("right_hand")):
+            if hand is not None:
+                c = self._valid(HAND_CONNECTIONS, len(hand))
+                px = self._to_px(hand)
+                a.append(px[c[:, 0]])
+                b.append(px[c[:, 1]])
+        if a:
+            layers.append(("hand", segment_pixels(np.concatenate(a), np.concatenate(b))))
+
+        face = results.get("face")
+        if face is not None:
+            indices = None if selection is None else selection.get("face")
+            if indices is not None:
+                face = face[[i for i in indices if i < len(face)]]
+            layers.append(("face", self._to_px(face)))
+
+        self._layers = [(self._colors[name], self._stamp(pixels, self._brushes[name])) for name, pixels in layers]
+        self.renders += 1
+        return True
+
+    def draw(self, screen: pygame.Surface, results=None, now: float = 0.0, selection=None) -> None:
+        """按需更新后把叠加层写入 screen 的像素缓冲。"""
+        if results is not None:
+            self.update(results, now, selection)
+        if not self._layers:
+            return
+        w, h = self.size
+        if screen.get_size() == (w, h) and screen.get_bytesize() == 4 and screen.get_pitch() == w * 4:
+            pixels = np.frombuffer(screen.get_buffer(), dtype=np.uint32)
+            try:
+                for color, idx in self._layers:
+                    pixels[idx] = screen.map_rgb(color)
+            finally:
+                del pixels   # 释放像素缓冲，解除 surface 锁定
+            return
+        # 其他屏幕格式：经 surfarray 按 (x, y) 写入
+        pixels = pygame.surfarray.pixels3d(screen)
+        try:
+            for color, idx in self._layers:
+                pixels[idx % w, idx // w] = color
+        finally:
+            del pixels
+
+    def _to_px(self, points: np.ndarray) -> np.ndarray:
+        # 归一化坐标 → 屏幕像素（整组一次换算）
+        return (points[:, :2] * self.size).astype(np.int32)
+
+    @staticmethod
+    def _valid(connections: np.ndarray, n: int, indices=None) -> np.ndarray:
+        """两端都在范围内（且 indices 给出时都已转换）的连线。"""
+        keep = (connections < n).all(axis=1)
+        if indices is not None:
+            keep &= np.isin(connections, indices).all(axis=1)
+        return connections[keep]
+
+    def _brush(self, offsets: np.ndarray) -> tuple[tuple[int, int, int, int], np.ndarray | None]:
+        """笔刷 → (中心像素的有效范围 x0, x1, y0, y1, 扁平偏移)；单像素笔刷的偏移为 None。"""
+        w, h = self.size
+        x0, y0 = -offsets.min(axis=0)
+        x1, y1 = np.array([w, h]) - offsets.max(axis=0)
+        flat = (offsets[:, 1] * w + offsets[:, 0]).astype(np.int32)
+        return (int(x0), int(x1), int(y0), int(y1)), (None if len(flat) == 1 and flat[0] == 0 else flat)
+
+    def _stamp(self, pixels: np.ndarray, brush) -> np.ndarray:
+        """只保留笔刷完全落在屏幕内的像素，套上笔刷，返回扁平下标。"""
+        (x0, x1, y0, y1), offsets = brush
+        x, y = pixels[:, 0], pixels[:, 1]
+        inside = (x >= x0) & (x < x1) & (y >= y0) & (y < y1)
+        flat = y[inside] * self.size[0] + x[inside]
+        if offsets is None:
+            return flat
+        return (flat[:, None] + offsets).ravel()
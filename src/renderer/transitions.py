@@ -0,0 +1,143 @@
+"""吊图淡入淡出过渡：按经过时间驱动，透明度与缩放档位预先计算，绘制时不分配 surface。"""
+import logging
+from collections.abc import Callable, Iterable
+
+import pygame
+
+from .animated import AnimatedAsset
+
+logger = logging.getLogger(__name__)
+
+
+def ease_out_cubic(t: float) -> float:
+    return 1.0 - (1.0 - t) ** 3
+
+
+def linear(t: float) -> float:
+    return t
+
+
+EASINGS: dict[str, Callable[[float], float]] = {"linear": linear, "ease_out": ease_out_cubic}
+
+
+class MemeTransitions:
+    """吊图叠加层的进入/退出过渡。
+
+    每张吊图的可见度 level ∈ [0, 1] 由 show()/hide() 的时间点和 duration_ms 推算，与帧率无关；
+    中途反向（淡出时再次触发）从当前可见度继续。level 量化为 steps 档，
+    每档的透明度预先算好；pop_scale < 1 时另外为每张素材预先缩放 pop_steps 档 surface
+    （进入时从 pop_scale 放大到原尺寸）。绘制时只对缓存的 surface set_alpha 后 blit，不拷贝素材。
+    动图素材（AnimatedAsset）不做弹出缩放，从进入时刻起按经过时间取帧。
+    """
+
+    def __init__(self, duration_ms: float = 300, steps: int = 32, easing: str = "ease_out",
+                 pop_scale: float = 1.0, pop_steps: int = 6):
+        if easing not in EASINGS:
+            raise ValueError(f"Unknown easing: {easing!r}")
+        self.duration = max(duration_ms, 0) / 1000.0
+        self.steps = max(1, steps)
+        ease = EASINGS[easing]
+        self._alphas = [round(255 * ease(i / self.steps)) for i in range(self.steps + 1)]
+        self.pop_scale = pop_scale
+        self.pop_steps = max(1, pop_steps) if pop_scale != 1.0 else 0
+        self._scales = [pop_scale + (1.0 - pop_scale) * ease(i / self.pop_steps)
+                        for i in range(self.pop_steps + 1)] if self.pop_steps else []
+        self._frames: dict[str, list[tuple[pygame.Surface, tuple[int, int]]]] = {}
+        # key → (起点时间, 是否进入)；level 在起点时为 0（进入）或 1（退出）
+        self._items: dict[str, tuple[float, bool]] = {}
+        self._anims: dict[str, AnimatedAsset] = {}
+        self._played: dict[str, float] = {}   # 动图的播放起点
+
+    @property
+    def assets(self) -> list[str]:
+        return list(self._frames)
+
+    @property
+    def active(self) -> list[str]:
+        """正在显示或淡出中的吊图。"""
+        return list(self._items)
+
+    def add_asset(self, key: str, surface: pygame.Surface | AnimatedAsset) -> None:
+        """登记素材并预计算缩放档位：[(surface, 中心到左上角的偏移)]。"""
+        if isinstance(surface, AnimatedAsset):
+            w, h = surface.size
+            self._anims[key] = surface
+            self._frames[key] = [(surface.frames[0], (-w // 2, -h // 2))]
+            return
+        self._anims.pop(key, None)
+        w, h = surface.get_size()
+        frames = []
+        for scale in self._scales[:-1]:
+            size = (max(1, round(w * scale)), max(1, round(h * scale)))
+            scaled = pygame.transform.smoothscale(surface, size)
+            frames.append((scaled, (-size[0] // 2, -size[1] // 2)))
+        frames.append((surface, (-w // 2, -h // 2)))
+        self._frames[key] = frames
+
+    def remove_asset(self, key: str) -> None:
+        self._frames.pop(key, None)
+        self._items.pop(key, None)
+        self._anims.pop(key, None)
+        self._played.pop(key, None)
+
+    def level(self, key: str, now: float) -> float:
+        item = self._items.get(key)
+        if item is None:
+            return 0.0
+        start, entering = item
+        t = 1.0 if self.duration <= 0 else min(1.0, max(0.0, (now - start) / self.duration))
+        return t if entering else 1.0 - t
+
+    def alpha(self, key: str, now: float) -> int:
+        return self._alphas[round(self.level(key, now) * self.steps)]
+
+    def visible(self, key: str, now: float) -> bool:
+        return self.alpha(key, now) > 0
+
+    def show(self, key: str, now: float) -> None:
+        item = self._items.get(key)
+        if item is not None and item[1]:
+            return
+        if item is None:
+            self._played[key] = now   # 重新出现的动图从第一帧播放；淡出中途再触发则继续
+        level = self.level(key, now)
+        self._items[key] = (now - level * self.duration, True)
+
+    def hide(self, key: str, now: float) -> None:
+        item = self._items.get(key)
+        if item is None or not item[1]:
+            return
+        level = self.level(key, now)
+        self._items[key] = (now - (1.0 - level) * self.duration, False)
+
+    def sync(self, showing: Iterable[str], now: float) -> None:
+        """showing 中的吊图进入，其余退出。"""
+        showing = set(showing)
+        for key in showing:
+            if key in self._frames:
+                self.show(key, now)
+        for key in list(self._items):
+            if key not in showing:
+                self.hide(key, now)
+
+    def draw(self, screen: pygame.Surface, center: tuple[int, int], now: float,
+             order: Callable[[str], object] | None = None) -> None:
+        """按 order（低者先画）绘制所有可见吊图，移除已淡出完毕的。"""
+        keys = sorted(self._items, key=order) if order is not None else list(self._items)
+        cx, cy = center
+        for key in keys:
+            level = self.level(key, now)
+            if level <= 0.0 and not self._items[key][1]:
+                del self._items[key]
+                self._played.pop(key, None)
+                continue
+            frames = self._frames.get(key)
+            alpha = self._alphas[round(level * self.steps)]
+            if frames is None or alpha == 0:
+                continue
+            surface, (dx, dy) = frames[round(level * (len(frames) - 1))]
+            anim = self._anims.get(key)
+            if anim is not None:
+                surface = anim.frame_at(now - self._played.get(key, now))
+            surface.set_alpha(alpha)
+            screen.blit(surface, (cx + dx, cy + dy))
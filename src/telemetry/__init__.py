@@ -0,0 +1,12 @@
+# Lazy imports，与 src.vision / src.engine 保持一致
+def __getattr__(name):
+    if name == "LatencyHistogram":
+        from .histogram import LatencyHistogram
+        return LatencyHistogram
+    if name == "FrameTracer":
+        from .tracer import FrameTracer
+        return FrameTracer
+    if name == "StatsFile":
+        from .stats_file import StatsFile
+        return StatsFile
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
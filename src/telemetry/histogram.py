@@ -0,0 +1,48 @@
+"""滚动延迟直方图：固定窗口的环形缓冲，按需计算分位数。"""
+import numpy as np
+
+PERCENTILES = (50, 95, 99)
+
+
+class LatencyHistogram:
+    """保存最近 window 个样本（毫秒），record() 只做一次数组写入。"""
+
+    __slots__ = ("_samples", "_count")
+
+    def __init__(self, window: int = 600):
+        self._samples = np.zeros(max(1, window), dtype=np.float64)
+        self._count = 0
+
+    @property
+    def count(self) -> int:
+        """累计记录的样本数（含已滚出窗口的）。"""
+        return self._count
+
+    def record(self, ms: float) -> None:
+        self._samples[self._count % len(self._samples)] = ms
+        self._count += 1
+
+    def window(self) -> np.ndarray:
+        """当前窗口内的样本（无序）。"""
+        return self._samples[:min(self._count, len(self._samples))]
+
+    def percentiles(self, qs=PERCENTILES) -> tuple[float, ...]:
+        """窗口内样本的分位数，无样本时为 NaN。"""
+        samples = self.window()
+        if not len(samples):
+            return tuple(float("nan") for _ in qs)
+        return tuple(float(v) for v in np.percentile(samples, qs))
+
+    def summary(self) -> dict[str, float]:
+        samples = self.window()
+        p50, p95, p99 = self.percentiles()
+        return {
+            "count": self._count,
+            "p50": p50,
+            "p95": p95,
+            "p99": p99,
+            "max": float(samples.max()) if len(samples) else float("nan"),
+        }
+
+    def reset(self) -> None:
+        self._count = 0
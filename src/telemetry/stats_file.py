@@ -0,0 +1,49 @@
+"""定期把延迟统计写入 JSON 文件（原子替换，便于外部工具轮询读取）。"""
+import json
+import logging
+import math
+import os
+import time
+
+logger = logging.getLogger(__name__)
+
+
+class StatsFile:
+    """每隔 interval_s 秒把 FrameTracer.summary() 写入 path。"""
+
+    def __init__(self, path: str, interval_s: float = 5.0):
+        self._path = path
+        self._interval_s = interval_s
+        self._last_flush = time.monotonic()
+
+    @property
+    def path(self) -> str:
+        return self._path
+
+    def maybe_flush(self, tracer, now: float | None = None) -> bool:
+        """距上次写入超过 interval_s 时写入，返回是否写入。"""
+        now = time.monotonic() if now is None else now
+        if now - self._last_flush < self._interval_s:
+            return False
+        self._last_flush = now
+        self.flush(tracer)
+        return True
+
+    def flush(self, tracer) -> None:
+        data = {
+            "time": time.time(),
+            "latency_ms": {
+                name: {k: (None if isinstance(v, float) and math.isnan(v) else v) for k, v in s.items()}
+                for name, s in tracer.summary().items()
+            },
+        }
+        directory = os.path.dirname(self._path)
+        try:
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            tmp = self._path + ".tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(data, f, indent=2)
+            os.replace(tmp, self._path)
+        except OSError as e:
+            logger.warning("Failed to write stats file %s: %s", self._path, e)
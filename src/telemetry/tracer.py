@@ -0,0 +1,75 @@
+"""逐帧延迟追踪：主循环在每个阶段结束时打点，按阶段/检测器累计滚动直方图。"""
+import time
+
+from .histogram import LatencyHistogram
+
+# 主循环阶段（按执行顺序），HUD 与统计文件按此顺序输出
+STAGES = ("capture", "inference", "extract", "engine", "render", "frame")
+GESTURE_TO_MEME = "gesture_to_meme"
+DETECTOR_PREFIX = "detector."
+
+
+class FrameTracer:
+    """低开销的逐帧阶段计时器。
+
+    用法：每帧 begin_frame()，每个阶段结束时 mark(stage)（记录距上一次打点的耗时），
+    帧结束时 end_frame()（记录整帧耗时，名为 "frame"）。其他来源的耗时用 record() 直接写入，
+    如检测器耗时（"detector.<特征名>"）和 手势开始 → 吊图可见 的端到端延迟。
+    enabled=False 时所有方法立即返回。
+    """
+
+    def __init__(self, window: int = 600, enabled: bool = True, timer=time.perf_counter):
+        self.enabled = enabled
+        self._window = window
+        self._timer = timer
+        self._histograms: dict[str, LatencyHistogram] = {}
+        self._frame_start = 0.0
+        self._last_mark = 0.0
+
+    def begin_frame(self) -> None:
+        if not self.enabled:
+            return
+        self._frame_start = self._last_mark = self._timer()
+
+    def mark(self, stage: str) -> None:
+        """记录阶段 stage 的耗时（从上一次打点到现在）。"""
+        if not self.enabled:
+            return
+        now = self._timer()
+        self.record(stage, (now - self._last_mark) * 1000)
+        self._last_mark = now
+
+    def end_frame(self) -> None:
+        if not self.enabled:
+            return
+        self.record("frame", (self._timer() - self._frame_start) * 1000)
+
+    def record(self, name: str, ms: float) -> None:
+        if not self.enabled:
+            return
+        hist = self._histograms.get(name)
+        if hist is None:
+            hist = self._histograms[name] = LatencyHistogram(self._window)
+        hist.record(ms)
+
+    def histogram(self, name: str) -> LatencyHistogram | None:
+        return self._histograms.get(name)
+
+    def percentiles(self, name: str) -> tuple[float, float, float]:
+        hist = self._histograms.get(name)
+        if hist is None:
+            return (float("nan"),) * 3
+        return hist.percentiles()
+
+    @property
+    def names(self) -> list[str]:
+        """已记录的指标名：主循环阶段在前（按执行顺序），其余按名称排序。"""
+        staged = [s for s in STAGES if s in self._histograms]
+        rest = sorted(n for n in self._histograms if n not in STAGES)
+        return staged + rest
+
+    def summary(self) -> dict[str, dict[str, float]]:
+        return {name: self._histograms[name].summary() for name in self.names}
+
+    def reset(self) -> None:
+        self._histograms.clear()
@@ -0,0 +1,6 @@
+# Lazy imports，与其他子包保持一致
+def __getattr__(name):
+    if name in ("SweepResult", "run_sweep", "grid_settings", "random_settings", "parse_param_spec"):
+        from . import sweep
+        return getattr(sweep, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,117 @@
+"""阈值扫描命令行。
+
+    python -m src.tuning --feature is_omg --sessions recordings/a recordings/b \\
+        --param ear_distance=0.08:0.16:0.01 --param mouth_open=0.02,0.03,0.04
+
+默认网格搜索；--random N 改为在各参数取值范围内随机采样 N 组。
+去抖动/冷却默认取映射配置中引用该特征的最高优先级映射，可用 --debounce-* / --cooldown-ms 覆盖。
+"""
+import argparse
+import csv
+import json
+import logging
+import math
+import os
+import sys
+import time
+
+from ..engine.mapping_engine import MappingEngine, MappingEntry
+from .sweep import grid_settings, parse_param_spec, random_settings, run_sweep
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def _fmt(v: float) -> str:
+    return "-" if isinstance(v, float) and math.isnan(v) else f"{v:.0f}"
+
+
+def _mapping_for(feature: str, default_path: str, user_path: str | None) -> MappingEntry:
+    """映射配置中引用 feature 的最高优先级启用映射；没有时返回默认参数的映射。"""
+    engine = MappingEngine()
+    engine.load(default_path, user_path)
+    for m in engine.enabled_mappings:
+        if feature in m.features:
+            return m
+    logging.getLogger(__name__).warning("No enabled mapping uses %s, using default trigger rule", feature)
+    return MappingEntry({"id": feature})
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m src.tuning", description="检测器阈值扫描")
+    parser.add_argument("--feature", required=True, help="特征名（features.json 中的键）")
+    parser.add_argument("--sessions", nargs="+", required=True, help="带 labels.json 的录制会话目录")
+    parser.add_argument("--param", action="append", default=[], metavar="NAME=SPEC",
+                        help="参数取值：v1,v2,... 或 start:stop:step，可重复")
+    parser.add_argument("--random", type=int, default=0, metavar="N", help="随机采样 N 组（默认网格搜索）")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=None, help="进程数（默认 CPU 核数）")
+    parser.add_argument("--debounce-frames", type=int, default=None, help="按帧数去抖动（默认取映射配置）")
+    parser.add_argument("--debounce-ms", type=float, default=None, help="按持续时间去抖动（默认取映射配置）")
+    parser.add_argument("--cooldown-ms", type=float, default=None, help="默认取映射配置")
+    parser.add_argument("--mappings", default=os.path.join(PROJECT_ROOT, "config", "mappings.default.json"))
+    parser.add_argument("--user-mappings", default=os.path.join(PROJECT_ROOT, "config", "mappings.user.json"))
+    parser.add_argument("--tolerance-ms", type=float, default=0, help="手势区间结束后仍计为正确的触发窗口")
+    parser.add_argument("--features-config", default=os.path.join(PROJECT_ROOT, "config", "features.json"))
+    parser.add_argument("--top", type=int, default=20, help="打印 F1 最高的前 N 组")
+    parser.add_argument("--output", help="完整结果写入 .csv 或 .json")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
+
+    with open(args.features_config, "r", encoding="utf-8") as f:
+        feature_cfg = json.load(f).get("features", {}).get(args.feature)
+    if feature_cfg is None:
+        parser.error(f"feature {args.feature!r} not found in {args.features_config}")
+    space = dict(parse_param_spec(spec) for spec in args.param)
+    if not space:
+        parser.error("at least one --param is required")
+    settings = random_settings(space, args.random, args.seed) if args.random else grid_settings(space)
+
+    mapping = _mapping_for(args.feature, args.mappings, args.user_mappings)
+    debounce_frames = mapping.debounce_frames if args.debounce_frames is None else args.debounce_frames
+    debounce_ms = mapping.debounce_ms if args.debounce_frames is None else None
+    if args.debounce_ms is not None:
+        debounce_ms = args.debounce_ms
+    cooldown_ms = mapping.cooldown_ms if args.cooldown_ms is None else args.cooldown_ms
+    rule = f"{debounce_frames} frames" if debounce_ms is None else f"{debounce_ms:g} ms"
+    print(f"Trigger rule: debounce {rule}, cooldown {cooldown_ms:g} ms (mapping {mapping.id!r})")
+
+    start = time.perf_counter()
+    results = run_sweep(
+        args.sessions, args.feature, feature_cfg["module"], settings,
+        base_params=feature_cfg.get("params", {}), workers=args.workers,
+        debounce_frames=debounce_frames, debounce_ms=debounce_ms, cooldown_ms=cooldown_ms,
+        tolerance_ms=args.tolerance_ms,
+    )
+    elapsed = time.perf_counter() - start
+    print(f"{len(results)} settings in {elapsed:.1f}s ({len(results) / max(elapsed, 1e-9):.0f}/s)")
+
+    ranked = sorted(results, key=lambda r: (-r.f1, r.latency_mean_ms if not math.isnan(r.latency_mean_ms) else math.inf))
+    names = list(space)
+    header = names + ["precision", "recall", "f1", "triggers", "lat_mean_ms", "lat_p95_ms"]
+    print("\t".join(header))
+    for r in ranked[:args.top]:
+        row = [f"{r.params[n]:.4g}" for n in names]
+        row += [f"{r.precision:.3f}", f"{r.recall:.3f}", f"{r.f1:.3f}", str(r.triggers),
+                _fmt(r.latency_mean_ms), _fmt(r.latency_p95_ms)]
+        print("\t".join(row))
+
+    if args.output:
+        rows = [r.as_dict() for r in ranked]
+        if args.output.endswith(".json"):
+            with open(args.output, "w", encoding="utf-8") as f:
+                json.dump(rows, f, indent=2)
+        else:
+            with open(args.output, "w", encoding="utf-8", newline="") as f:
+                writer = csv.writer(f)
+                writer.writerow(header[:len(names)] + ["precision", "recall", "f1", "triggers", "correct",
+                                                        "gestures", "detected", "latency_mean_ms", "latency_p95_ms"])
+                for r in ranked:
+                    writer.writerow([r.params[n] for n in names] + [
+                        r.precision, r.recall, r.f1, r.triggers, r.correct,
+                        r.gestures, r.detected, r.latency_mean_ms, r.latency_p95_ms])
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
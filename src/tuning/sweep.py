@@ -0,0 +1,206 @@
+"""阈值扫描：在标注过的录制会话上批量评估检测器参数组合，按进程池并行。
+
+每个会话目录（SessionRecorder 的输出）旁放一个 labels.json，记录各特征的真实手势区间
+（与录制时间戳同一时间轴，单位秒）：
+
+    {"is_omg": [[12.3, 14.0], [30.5, 31.2]], "is_nfb": []}
+
+每组参数用 detect_batch() 得到逐帧结果，再按状态机的去抖动（帧数或 debounce_ms 持续时间）/冷却规则模拟触发：
+落在某个手势区间内的触发计为正确；precision = 正确触发 / 全部触发，
+recall = 至少触发一次的区间 / 全部区间，延迟 = 区间开始 → 首次触发。
+"""
+import itertools
+import json
+import logging
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass
+
+import numpy as np
+
+from ..vision.features import FEATURE_REGISTRY
+from ..vision.features.base import FeatureBatch
+from ..vision.session_recorder import SessionReader
+
+logger = logging.getLogger(__name__)
+
+LABELS_FILE = "labels.json"
+
+
+def load_labels(session_path: str, feature: str) -> np.ndarray:
+    """读取会话中某特征的手势区间，返回按开始时间排序的 (K, 2) float64；无标注时为空。"""
+    path = os.path.join(session_path, LABELS_FILE)
+    if not os.path.exists(path):
+        logger.warning("Session has no labels: %s", session_path)
+        return np.empty((0, 2), dtype=np.float64)
+    with open(path, "r", encoding="utf-8") as f:
+        intervals = json.load(f).get(feature, [])
+    arr = np.array(intervals, dtype=np.float64).reshape(-1, 2)
+    return arr[np.argsort(arr[:, 0])]
+
+
+def parse_param_spec(spec: str) -> tuple[str, list[float]]:
+    """解析 "name=v1,v2,v3" 或 "name=start:stop:step"（含 stop）。"""
+    name, sep, values = spec.partition("=")
+    if not sep or not name or not values:
+        raise ValueError(f"Invalid param spec: {spec!r}")
+    if ":" in values:
+        start, stop, step = (float(v) for v in values.split(":"))
+        if step <= 0:
+            raise ValueError(f"Step must be positive: {spec!r}")
+        count = int(math.floor((stop - start) / step + 1e-9)) + 1
+        return name, [round(start + i * step, 10) for i in range(count)]
+    return name, [float(v) for v in values.split(",")]
+
+
+def grid_settings(space: dict[str, list[float]]) -> list[dict[str, float]]:
+    """参数网格的笛卡尔积。"""
+    names = list(space)
+    return [dict(zip(names, combo)) for combo in itertools.product(*(space[n] for n in names))]
+
+
+def random_settings(space: dict[str, list[float]], n: int, seed: int = 0) -> list[dict[str, float]]:
+    """在每个参数取值范围 [min, max] 内均匀随机采样 n 组。"""
+    rng = np.random.default_rng(seed)
+    columns = {name: rng.uniform(min(v), max(v), n) for name, v in space.items()}
+    return [{name: float(columns[name][i]) for name in space} for i in range(n)]
+
+
+def simulate_triggers(active: np.ndarray, timestamps: np.ndarray,
+                      debounce_frames: int = 8, cooldown_s: float = 3.0,
+                      debounce_s: float | None = None) -> np.ndarray:
+    """按 StateMachine 的规则模拟单个映射的触发，返回触发帧下标。
+
+    连续 debounce_frames 帧满足 → 触发；设置 debounce_s 时改为按时间戳持续满足 debounce_s 秒触发
+    （对应映射的 debounce_ms）。冷却期间不计数，冷却结束的那一帧起重新计数。
+    只遍历满足条件的连续区段，不逐帧循环。
+    """
+    n = max(1, debounce_frames)
+    edges = np.diff(active.astype(np.int8), prepend=0, append=0)
+    starts = np.flatnonzero(edges == 1)
+    ends = np.flatnonzero(edges == -1)
+    triggers = []
+    cooldown_until = -math.inf
+    for s, e in zip(starts, ends):
+        i = s
+        while i < e:
+            if timestamps[i] < cooldown_until:
+                i = int(np.searchsorted(timestamps, cooldown_until, side="left"))
+                if i >= e:
+                    break
+            if debounce_s is None:
+                trig = i + n - 1
+            else:
+                # 与状态机相同的比较：now - since >= window
+                held = np.flatnonzero(timestamps[i:e] - timestamps[i] >= debounce_s - 1e-9)
+                trig = i + int(held[0]) if len(held) else e
+            if trig >= e:
+                break
+            triggers.append(trig)
+            cooldown_until = timestamps[trig] + cooldown_s
+            i = trig + 1
+    return np.array(triggers, dtype=np.int64)
+
+
+@dataclass
+class SweepResult:
+    """一组参数在全部会话上的评估结果。"""
+    params: dict[str, float]
+    triggers: int
+    correct: int
+    gestures: int
+    detected: int
+    latency_mean_ms: float
+    latency_p95_ms: float
+
+    @property
+    def precision(self) -> float:
+        return self.correct / self.triggers if self.triggers else 0.0
+
+    @property
+    def recall(self) -> float:
+        return self.detected / self.gestures if self.gestures else 0.0
+
+    @property
+    def f1(self) -> float:
+        p, r = self.precision, self.recall
+        return 2 * p * r / (p + r) if p + r else 0.0
+
+    def as_dict(self) -> dict:
+        d = asdict(self)
+        d.update(precision=self.precision, recall=self.recall, f1=self.f1)
+        return d
+
+
+# --- 工作进程状态：会话只在进程初始化时加载一次，手部几何量随批量缓存 ---
+_WORKER: dict = {}
+
+
+def _init_worker(session_paths, feature, module, base_params, debounce_frames, debounce_s, cooldown_s,
+                 tolerance_s):
+    sessions = []
+    for path in session_paths:
+        reader = SessionReader(path)
+        batch = FeatureBatch.from_session(reader)
+        batch.hand_geometry  # 与参数无关，预先计算
+        sessions.append((batch, np.asarray(reader.timestamps), load_labels(path, feature)))
+    _WORKER.update(
+        sessions=sessions, detector_cls=FEATURE_REGISTRY[module], base_params=dict(base_params),
+        debounce_frames=debounce_frames, debounce_s=debounce_s, cooldown_s=cooldown_s, tolerance_s=tolerance_s,
+    )
+
+
+def _evaluate(params: dict[str, float]) -> SweepResult:
+    w = _WORKER
+    detector = w["detector_cls"]({**w["base_params"], **params})
+    triggers = correct = gestures = detected = 0
+    latencies = []
+    for batch, timestamps, intervals in w["sessions"]:
+        active = detector.detect_batch(batch)
+        times = timestamps[simulate_triggers(active, timestamps, w["debounce_frames"], w["cooldown_s"],
+                                             w["debounce_s"])]
+        triggers += len(times)
+        gestures += len(intervals)
+        if not len(times) or not len(intervals):
+            continue
+        idx = np.searchsorted(intervals[:, 0], times, side="right") - 1
+        hit = (idx >= 0) & (times <= intervals[np.maximum(idx, 0), 1] + w["tolerance_s"])
+        correct += int(hit.sum())
+        # 每个区间的首次触发（times 递增，np.unique 返回首次出现位置）
+        hit_idx, first = np.unique(idx[hit], return_index=True)
+        detected += len(hit_idx)
+        latencies.extend((times[hit][first] - intervals[hit_idx, 0]) * 1000)
+    lat = np.array(latencies)
+    return SweepResult(
+        params=dict(params), triggers=triggers, correct=correct, gestures=gestures, detected=detected,
+        latency_mean_ms=float(lat.mean()) if len(lat) else float("nan"),
+        latency_p95_ms=float(np.percentile(lat, 95)) if len(lat) else float("nan"),
+    )
+
+
+def run_sweep(session_paths: list[str], feature: str, module: str, settings: list[dict[str, float]],
+              base_params: dict | None = None, workers: int | None = None,
+              debounce_frames: int = 8, cooldown_ms: float = 3000, tolerance_ms: float = 0.0,
+              chunksize: int | None = None, debounce_ms: float | None = None) -> list[SweepResult]:
+    """评估全部参数组合，结果顺序与 settings 一致。
+
+    去抖动/冷却应与运行时映射一致：debounce_ms 不为 None 时按持续时间去抖动，忽略 debounce_frames。
+
+    workers=1 时在当前进程内运行；否则使用进程池（默认 CPU 核数），每个进程只加载一次会话。
+    """
+    if module not in FEATURE_REGISTRY:
+        raise ValueError(f"Unknown feature module: {module!r}")
+    initargs = (list(session_paths), feature, module, base_params or {},
+                debounce_frames, None if debounce_ms is None else debounce_ms / 1000.0,
+                cooldown_ms / 1000.0, tolerance_ms / 1000.0)
+    if workers == 1:
+        _init_worker(*initargs)
+        return [_evaluate(p) for p in settings]
+
+    workers = workers or os.cpu_count() or 1
+    chunksize = chunksize or max(1, len(settings) // (workers * 8))
+    logger.info("Sweeping %d settings of %s over %d sessions with %d workers",
+                len(settings), feature, len(session_paths), workers)
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=initargs) as pool:
+        return list(pool.map(_evaluate, settings, chunksize=chunksize))
@@ -1 +0,0 @@
-# Phase 4: 界面渲染模块 (PyGame)\n# TODO: 实现 src/renderer/ 包\n
\ No newline at end of file
@@ -3,10 +3,28 @@ def __getattr__(name):
     if name == "Camera":
         from .camera import Camera
         return Camera
+    if name == "ThreadedCamera":
+        from .threaded_camera import ThreadedCamera
+        return ThreadedCamera
+    if name == "ReplaySource":
+        from .replay_source import ReplaySource
+        return ReplaySource
     if name == "HolisticRunner":
         from .holistic_runner import HolisticRunner
         return HolisticRunner
+    if name == "InferenceScheduler":
+        from .inference_scheduler import InferenceScheduler
+        return InferenceScheduler
     if name == "FeatureExtractor":
         from .feature_extractor import FeatureExtractor
         return FeatureExtractor
+    if name == "SessionRecorder" or name == "SessionReader":
+        from .session_recorder import SessionRecorder, SessionReader
+        return locals()[name]
+    if name == "FeatureBatch":
+        from .features.base import FeatureBatch
+        return FeatureBatch
+    if name == "LandmarkFrame":
+        from .landmarks import LandmarkFrame
+        return LandmarkFrame
     raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -2,28 +2,85 @@
 import json
 import logging
 import os
+import time
+from collections.abc import Iterable, Mapping
 from dataclasses import dataclass, field
-from .features.base import FeatureContext
+import numpy as np
+
+from .features.base import BaseFeature, FeatureBatch, FeatureContext
+from .landmarks import LandmarkFrame, LandmarkSelection, merge_selections
 from .features import FEATURE_REGISTRY
+from ..telemetry.tracer import DETECTOR_PREFIX
 
 logger = logging.getLogger(__name__)
 
 
+class LazyFeatures(Mapping):
+    """按需求值的特征字典：首次访问某特征时才运行对应检测器，结果缓存到本帧结束。
+
+    引用的关键点帧是复用缓冲，只应在产生它的那一帧内读取。
+    传入 tracer 时每次检测的耗时记录为 "detector.<特征名>"。
+    """
+
+    __slots__ = ("_ctx", "_detectors", "_values", "_tracer")
+
+    def __init__(self, ctx: FeatureContext, detectors: dict[str, BaseFeature], tracer=None):
+        self._ctx = ctx
+        self._detectors = detectors
+        self._values: dict[str, bool] = {}
+        self._tracer = tracer
+
+    def __getitem__(self, name: str) -> bool:
+        value = self._values.get(name)
+        if value is not None:
+            return value
+        detector = self._detectors[name]
+        start = time.perf_counter() if self._tracer is not None else 0.0
+        try:
+            value = bool(detector.detect(self._ctx))
+        except Exception as e:
+            logger.error("Feature '%s' detection failed: %s", name, e)
+            value = False
+        if self._tracer is not None:
+            self._tracer.record(DETECTOR_PREFIX + name, (time.perf_counter() - start) * 1000)
+        self._values[name] = value
+        return value
+
+    def __iter__(self):
+        return iter(self._detectors)
+
+    def __len__(self) -> int:
+        return len(self._detectors)
+
+    @property
+    def evaluated(self) -> dict[str, bool]:
+        """本帧实际求值过的特征（不触发新的检测）。"""
+        return dict(self._values)
+
+
 @dataclass
 class FeatureVector:
     """单帧特征向量。"""
     frame_id: int
     timestamp: float
-    features: dict[str, bool] = field(default_factory=dict)
+    features: Mapping[str, bool] = field(default_factory=dict)
 
 
 class FeatureExtractor:
-    """根据 features.json 注册的特征列表，逐特征检测并输出 FeatureVector。"""
+    """根据 features.json 注册的特征列表输出 FeatureVector。
+
+    特征按需求值：只有被访问（通常是 MappingEngine.match_vision 按优先级访问）
+    的特征才会运行检测器。set_active_features() 可进一步把可见特征限定为
+    启用映射实际引用的集合。
+    """
 
     def __init__(self, features_config_path: str):
         self._feature_configs: dict[str, dict] = {}
-        self._feature_instances: dict[str, object] = {}
+        self._feature_instances: dict[str, BaseFeature] = {}
+        self._active_instances: dict[str, BaseFeature] = {}
+        self._tracer = None
         self._load_config(features_config_path)
+        self._active_instances = dict(self._feature_instances)
 
     def _load_config(self, path: str) -> None:
         if not os.path.exists(path):
@@ -47,20 +104,56 @@ class FeatureExtractor:
     def feature_names(self) -> list[str]:
         return list(self._feature_configs.keys())
 
-    def extract(self, results, frame_id: int, timestamp: float) -> FeatureVector:
-        """从 MediaPipe results 提取特征向量。"""
-        ctx = FeatureContext(
-            pose_landmarks=results.pose_landmarks if results else None,
-            left_hand_landmarks=results.left_hand_landmarks if results else None,
-            right_hand_landmarks=results.right_hand_landmarks if results else None,
-            face_landmarks=results.face_landmarks if results else None,
+    @property
+    def active_features(self) -> list[str]:
+        return list(self._active_instances.keys())
+
+    @property
+    def required_landmarks(self) -> LandmarkSelection:
+        """当前启用特征声明读取的关键点（部位 → 索引），供推理端只转换需要的部分。"""
+        return merge_selections(d.landmark_groups for d in self._active_instances.values())
+
+    def set_active_features(self, names: Iterable[str] | None) -> None:
+        """只保留给定特征（如启用映射引用的特征）；None 表示全部已注册特征。"""
+        if names is None:
+            self._active_instances = dict(self._feature_instances)
+            return
+        active: dict[str, BaseFeature] = {}
+        for name in names:
+            if name in self._feature_instances:
+                active[name] = self._feature_instances[name]
+            else:
+                logger.warning("Mapped feature '%s' is not registered", name)
+        self._active_instances = active
+        logger.info("Active features: %d/%d", len(active), len(self._feature_instances))
+
+    def set_tracer(self, tracer) -> None:
+        """设置 FrameTracer，记录每个检测器的耗时；None 关闭。"""
+        self._tracer = tracer
+
+    def extract(self, results: LandmarkFrame | None, frame_id: int, timestamp: float) -> FeatureVector:
+        """从关键点帧构造特征向量，特征在首次访问时才求值。"""
+        ctx = FeatureContext.from_frame(results)
+        # 双手几何量在首个手部检测器访问时计算一次，之后共用
+        return FeatureVector(
+            frame_id=frame_id,
+            timestamp=timestamp,
+            features=LazyFeatures(ctx, self._active_instances, self._tracer),
         )
 
-        fv = FeatureVector(frame_id=frame_id, timestamp=timestamp)
-        for name, detector in self._feature_instances.items():
+    def extract_batch(self, batch: FeatureBatch, names: Iterable[str] | None = None) -> np.ndarray:
+        """批量评估 T 帧，返回 (T, F) bool 矩阵，与逐帧 extract() 结果一致。
+
+        列顺序同 names（缺省为 active_features）；未注册的特征整列为 False。
+        """
+        names = self.active_features if names is None else list(names)
+        out = np.zeros((len(batch), len(names)), dtype=bool)
+        for j, name in enumerate(names):
+            detector = self._feature_instances.get(name)
+            if detector is None:
+                continue
             try:
-                fv.features[name] = detector.detect(ctx)
+                out[:, j] = detector.detect_batch(batch)
             except Exception as e:
-                logger.error("Feature '%s' detection failed: %s", name, e)
-                fv.features[name] = False
-        return fv
+                logger.error("Feature '%s' batch detection failed: %s", name, e)
+        return out
@@ -0,0 +1,107 @@
+"""手部几何核：每帧一次向量化计算所有手势检测器共用的距离、比值和手指状态。"""
+import numpy as np
+
+TIP_IDS = [8, 12, 16, 20]   # 食、中、无、小指尖
+MCP_IDS = [5, 9, 13, 17]    # 对应 MCP 关节
+FACE_IDS = [1, 13, 61, 291]  # 鼻尖、上唇、左右嘴角
+EAR_IDS = [7, 8]             # pose 左右耳
+
+_NAN2 = np.full(2, np.nan, dtype=np.float32)
+
+
+def _norm(v: np.ndarray) -> np.ndarray:
+    """最后一维 (x, y) 的欧氏距离。"""
+    return np.sqrt((v * v).sum(axis=-1))
+
+
+class HandGeometry:
+    """左右手几何量，第一维为手（0=左，1=右），缺失的手 present 为 False。
+
+    所有字段按 numpy 广播计算，可带任意前导维度（单帧为 (2, ...)，批量为 (T, 2, ...)）。
+    依赖人脸/pose 的距离在对应部位缺失时为 NaN（任何比较均为 False）。
+    """
+
+    __slots__ = (
+        "present", "wrist_dist", "tip_dist", "mcp_dist", "extension_ratio", "ratio_valid",
+        "extended", "extended_count", "palm_open", "fist", "half_curled_count",
+        "thumb_extended", "thumb_index_dist", "thumb_up", "thumb_down", "thumb_above_wrist",
+        "tip_nose_dx", "tip_mouth_dy", "tip_corner_dist", "mcp_ear_dist", "cross_tip_dist",
+    )
+
+    def __init__(self, hands: np.ndarray, present: np.ndarray,
+                 face: np.ndarray | None = None, pose: np.ndarray | None = None):
+        """hands: (..., 2, 21, 3)；present: (..., 2)；face: (..., 478, 3)；pose: (..., 33, 3)。"""
+        xy = hands[..., :2]
+        self.present = present
+
+        # 手指状态：指尖/MCP 到手腕的距离
+        self.wrist_dist = _norm(xy - xy[..., :1, :])                 # (..., 2, 21)
+        self.tip_dist = self.wrist_dist[..., TIP_IDS]                # (..., 2, 4)
+        self.mcp_dist = self.wrist_dist[..., MCP_IDS]
+        self.extended = self.tip_dist > self.mcp_dist
+        self.extended_count = self.extended.sum(axis=-1)
+        self.palm_open = self.extended_count >= 4
+        self.fist = self.extended_count == 0
+        self.ratio_valid = self.mcp_dist != 0
+        self.extension_ratio = np.divide(self.tip_dist, self.mcp_dist,
+                                         out=np.zeros_like(self.tip_dist), where=self.ratio_valid)
+        self.half_curled_count = (
+            self.ratio_valid & (self.extension_ratio > 0.4) & (self.extension_ratio < 1.0)
+        ).sum(axis=-1)
+
+        # 拇指
+        y = hands[..., 1]
+        self.thumb_extended = self.wrist_dist[..., 4] > self.wrist_dist[..., 2] * 1.2
+        self.thumb_index_dist = _norm(xy[..., 4, :] - xy[..., 8, :])
+        self.thumb_up = (y[..., 4] < y[..., 3]) & (y[..., 3] < y[..., 2])
+        self.thumb_down = (y[..., 4] > y[..., 3]) & (y[..., 3] > y[..., 2])
+        self.thumb_above_wrist = y[..., 4] < y[..., 0] - 0.03
+
+        # 双手之间：拇指尖、食指尖的距离 (..., 2)
+        self.cross_tip_dist = _norm(xy[..., 0, [4, 8], :] - xy[..., 1, [4, 8], :])
+
+        # 食指尖 → 人脸关键点
+        tip = xy[..., 8, :]                                          # (..., 2, 2)
+        if face is not None:
+            f = face[..., FACE_IDS, :2]                              # (..., 4, 2)
+            nose, m_up = f[..., 0:1, :], f[..., 1:2, :]
+            self.tip_nose_dx = np.abs(tip[..., 0] - nose[..., 0])
+            self.tip_mouth_dy = np.abs(tip[..., 1] - m_up[..., 1])
+            self.tip_corner_dist = _norm(tip[..., :, None, :] - f[..., None, 2:, :])   # (..., 2, 2)
+        else:
+            self.tip_nose_dx = self.tip_mouth_dy = np.broadcast_to(_NAN2, tip.shape[:-1])
+            self.tip_corner_dist = np.broadcast_to(_NAN2, tip.shape)
+
+        # 食指 MCP → 左右耳
+        mcp = xy[..., 5, :]
+        if pose is not None:
+            ears = pose[..., EAR_IDS, :2]                            # (..., 2, 2)
+            self.mcp_ear_dist = _norm(mcp[..., :, None, :] - ears[..., None, :, :])     # (..., 2 手, 2 耳)
+        else:
+            self.mcp_ear_dist = np.broadcast_to(_NAN2, mcp.shape)
+
+    @classmethod
+    def from_context(cls, ctx) -> "HandGeometry":
+        """从 FeatureContext 构造单帧几何量。"""
+        hands = np.zeros((2, 21, 3), dtype=np.float32)
+        present = np.zeros(2, dtype=bool)
+        for i, hand in enumerate((ctx.left_hand_landmarks, ctx.right_hand_landmarks)):
+            if hand is not None:
+                hands[i] = hand[:21]
+                present[i] = True
+        return cls(hands, present, ctx.face_landmarks, ctx.pose_landmarks)
+
+    @classmethod
+    def from_batch(cls, batch) -> "HandGeometry":
+        """从 FeatureBatch 构造 T 帧几何量；缺失的手按单帧路径同样以 0 填充。"""
+        t = len(batch)
+        hands = np.zeros((t, 2, 21, 3), dtype=np.float32)
+        present = np.zeros((t, 2), dtype=bool)
+        for i, group in enumerate(("left_hand", "right_hand")):
+            arr = getattr(batch, group)
+            if arr is None:
+                continue
+            has = batch.has(group)
+            hands[has, i] = arr[has, :21]
+            present[:, i] = has
+        return cls(hands, present, batch.face, batch.pose)
@@ -1,23 +1,132 @@
 """特征检测器基类。"""
 import abc
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+
+import numpy as np
+
+from ..landmarks import GROUPS, LandmarkFrame, LandmarkSelection, as_landmark_array
+from ._hand_geometry import HandGeometry
 
 
 @dataclass
 class FeatureContext:
-    """传递给特征检测器的上下文（单帧 MediaPipe 结果）。"""
-    pose_landmarks: object | None     # mp PoseLandmark 列表
-    left_hand_landmarks: object | None
-    right_hand_landmarks: object | None
-    face_landmarks: object | None
+    """传递给特征检测器的上下文（单帧关键点）。
+
+    各部位为 (N,3) float32 数组（x, y, z 归一化坐标），缺失时为 None。
+    传入带 .landmark 属性的旧式对象时，构造时统一转换为数组。
+    """
+    pose_landmarks: np.ndarray | None
+    left_hand_landmarks: np.ndarray | None
+    right_hand_landmarks: np.ndarray | None
+    face_landmarks: np.ndarray | None
+    _hand_geometry: HandGeometry | None = field(default=None, init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        self.pose_landmarks = as_landmark_array(self.pose_landmarks)
+        self.left_hand_landmarks = as_landmark_array(self.left_hand_landmarks)
+        self.right_hand_landmarks = as_landmark_array(self.right_hand_landmarks)
+        self.face_landmarks = as_landmark_array(self.face_landmarks)
+
+    @property
+    def hand_geometry(self) -> HandGeometry:
+        """本帧双手几何量，首次访问时计算，之后所有检测器共用。"""
+        if self._hand_geometry is None:
+            self._hand_geometry = HandGeometry.from_context(self)
+        return self._hand_geometry
+
+    @classmethod
+    def from_frame(cls, frame: LandmarkFrame | None) -> "FeatureContext":
+        if frame is None:
+            return cls(None, None, None, None)
+        return cls(
+            pose_landmarks=frame.get("pose"),
+            left_hand_landmarks=frame.get("left_hand"),
+            right_hand_landmarks=frame.get("right_hand"),
+            face_landmarks=frame.get("face"),
+        )
+
+
+class FeatureBatch:
+    """T 帧关键点批量，供检测器 detect_batch() 一次性广播计算。
+
+    各部位为 (T,N,3) float32 数组（整组缺失时为 None），has(group) 为逐帧存在标志 (T,)；
+    缺失帧的坐标可以是任意值（如录制文件中的 NaN），检测器必须用存在标志屏蔽。
+    """
+
+    def __init__(self, landmarks: dict[str, np.ndarray | None], presence: dict[str, np.ndarray] | None = None):
+        arrays = {g: landmarks.get(g) for g in GROUPS}
+        lengths = {len(a) for a in arrays.values() if a is not None}
+        if len(lengths) > 1:
+            raise ValueError(f"Landmark arrays have different frame counts: {sorted(lengths)}")
+        self._len = lengths.pop() if lengths else 0
+        self.pose = arrays["pose"]
+        self.face = arrays["face"]
+        self.left_hand = arrays["left_hand"]
+        self.right_hand = arrays["right_hand"]
+        self._has: dict[str, np.ndarray] = {}
+        for g, a in arrays.items():
+            if presence is not None and g in presence:
+                self._has[g] = np.asarray(presence[g], dtype=bool)
+            elif a is None:
+                self._has[g] = np.zeros(self._len, dtype=bool)
+            else:
+                # 未给出存在标志时，坐标全部有限的帧视为存在
+                self._has[g] = np.isfinite(a).all(axis=(1, 2))
+        self._hand_geometry: HandGeometry | None = None
+
+    def __len__(self) -> int:
+        return self._len
+
+    def has(self, group: str) -> np.ndarray:
+        return self._has[group]
+
+    def points(self, group: str, indices) -> np.ndarray:
+        """某部位指定关键点的 (T,K,3) 数组；整组缺失时为 NaN。"""
+        a = getattr(self, group)
+        if a is None:
+            return np.full((self._len, len(indices), 3), np.nan, dtype=np.float32)
+        return a[:, list(indices)]
+
+    @property
+    def hand_geometry(self) -> HandGeometry:
+        """T 帧双手几何量（字段前导维度为 T），首次访问时计算。"""
+        if self._hand_geometry is None:
+            self._hand_geometry = HandGeometry.from_batch(self)
+        return self._hand_geometry
+
+    def context(self, index: int) -> FeatureContext:
+        """第 index 帧的单帧上下文（缺失部位为 None）。"""
+        def pick(group):
+            a = getattr(self, group)
+            return a[index] if a is not None and self._has[group][index] else None
+        return FeatureContext(pick("pose"), pick("left_hand"), pick("right_hand"), pick("face"))
+
+    @classmethod
+    def from_session(cls, reader, start: int = 0, stop: int | None = None) -> "FeatureBatch":
+        """从 SessionReader 构造（切片仍为 memmap 视图，不拷贝）。"""
+        sl = slice(start, stop)
+        return cls(
+            {g: reader.landmarks(g)[sl] for g in GROUPS},
+            {g: reader.has(g)[sl] for g in GROUPS},
+        )
+
+
+# 双手整组（手部几何核读取全部 21 个点）
+BOTH_HANDS: LandmarkSelection = {"left_hand": None, "right_hand": None}
 
 
 class BaseFeature(abc.ABC):
     """所有特征检测器的基类。
 
-    子类必须实现 detect(ctx)→bool 和 category 属性。
+    子类必须实现 detect(ctx)→bool 和 category 属性，并通过 landmark_groups
+    声明读取的部位和关键点索引；管道据此只转换需要的关键点。
+    detect_batch(batch)→(T,) bool 用于离线批量评估，可覆盖为向量化实现。
     """
 
+    #: 部位 → 读取的关键点索引（None 表示整组），未列出的部位不会被转换。
+    #: 默认保守地读取全部部位。
+    landmark_groups: LandmarkSelection = {g: None for g in GROUPS}
+
     def __init__(self, params: dict | None = None):
         self.params = params or {}
 
@@ -31,3 +140,11 @@ class BaseFeature(abc.ABC):
     def detect(self, ctx: FeatureContext) -> bool:
         """返回该特征在当前帧是否触发。"""
         ...
+
+    def detect_batch(self, batch: FeatureBatch) -> np.ndarray:
+        """返回 (T,) bool，必须与逐帧 detect() 的结果完全一致。
+
+        默认逐帧调用 detect()；内置检测器以广播实现覆盖。
+        """
+        return np.fromiter((bool(self.detect(batch.context(t))) for t in range(len(batch))),
+                           dtype=bool, count=len(batch))
@@ -1,8 +1,11 @@
 import numpy as np
-from .base import BaseFeature, FeatureContext
+
+from .base import BOTH_HANDS, BaseFeature, FeatureBatch, FeatureContext
 
 class GuaiQiaoDetector(BaseFeature):
     """GuaiQiao: both hands half-fisted in front of body."""
+    landmark_groups = {"pose": (11, 12, 23, 24), **BOTH_HANDS}
+
     @property
     def category(self) -> str:
         return "combo"
@@ -15,49 +18,43 @@ class GuaiQiaoDetector(BaseFeature):
         if left_h is None or right_h is None:
             return False
 
-        # Check half-fist for each hand
-        if not self._is_half_fist(left_h):
-            return False
-        if not self._is_half_fist(right_h):
+        # Check half-fist for each hand: tip not fully extended (ratio < 1.0)
+        # but not tightly clenched (ratio > 0.4), at least 3 fingers
+        if not (ctx.hand_geometry.half_curled_count >= 3).all():
             return False
 
         # Check hands in front of body
-        pose_lm = ctx.pose_landmarks.landmark
+        pose_lm = ctx.pose_landmarks
         l_shoulder = pose_lm[11]
         r_shoulder = pose_lm[12]
         l_hip = pose_lm[23]
         r_hip = pose_lm[24]
 
         # Hand position: use middle finger MCP (9) as hand center
-        l_center = left_h.landmark[9]
-        r_center = right_h.landmark[9]
+        l_center = left_h[9]
+        r_center = right_h[9]
 
         # Hand x between shoulders, y between shoulders and hips
-        shoulder_mid_y = (l_shoulder.y + r_shoulder.y) / 2
-        hip_mid_y = (l_hip.y + r_hip.y) / 2
+        shoulder_mid_y = (l_shoulder[1] + r_shoulder[1]) / 2
+        hip_mid_y = (l_hip[1] + r_hip[1]) / 2
 
         for hand_center in [l_center, r_center]:
-            if not (l_shoulder.x < hand_center.x < r_shoulder.x):
+            if not (l_shoulder[0] < hand_center[0] < r_shoulder[0]):
                 return False
-            if not (shoulder_mid_y < hand_center.y < hip_mid_y + 0.15):
+            if not (shoulder_mid_y < hand_center[1] < hip_mid_y + 0.15):
                 return False
 
         return True
 
-    def _is_half_fist(self, hand) -> bool:
-        """Check if hand is half-fisted: fingers partially curled."""
-        lm = hand.landmark
-        wrist = lm[0]
-        tip_ids = [8, 12, 16, 20]
-        mcp_ids = [5, 9, 13, 17]
-        curled_count = 0
-        for tid, mid in zip(tip_ids, mcp_ids):
-            d_tip = np.sqrt((lm[tid].x - wrist.x)**2 + (lm[tid].y - wrist.y)**2)
-            d_mcp = np.sqrt((lm[mid].x - wrist.x)**2 + (lm[mid].y - wrist.y)**2)
-            if d_mcp == 0:
-                continue
-            ratio = d_tip / d_mcp
-            # Half-fist: tip not fully extended (ratio < 1.0) but not tightly clenched (ratio > 0.4)
-            if 0.4 < ratio < 1.0:
-                curled_count += 1
-        return curled_count >= 3
+    def detect_batch(self, batch: FeatureBatch) -> np.ndarray:
+        pose = batch.points("pose", (11, 12, 23, 24))
+        l_shoulder, r_shoulder, l_hip, r_hip = (pose[:, i] for i in range(4))
+        shoulder_mid_y = (l_shoulder[:, 1] + r_shoulder[:, 1]) / 2
+        hip_mid_y = (l_hip[:, 1] + r_hip[:, 1]) / 2
+
+        ok = batch.has("pose") & batch.has("left_hand") & batch.has("right_hand")
+        ok &= (batch.hand_geometry.half_curled_count >= 3).all(axis=-1)
+        for c in (batch.points("left_hand", (9,))[:, 0], batch.points("right_hand", (9,))[:, 0]):
+            ok &= (l_shoulder[:, 0] < c[:, 0]) & (c[:, 0] < r_shoulder[:, 0])
+            ok &= (shoulder_mid_y < c[:, 1]) & (c[:, 1] < hip_mid_y + 0.15)
+        return ok
@@ -1,8 +1,10 @@
 import numpy as np
-from .base import BaseFeature, FeatureContext
-from ._palm_util import is_palm_open
+
+from .base import BOTH_HANDS, BaseFeature, FeatureBatch, FeatureContext
 
 class OMGDetector(BaseFeature):
+    landmark_groups = {"face": (13, 14), "pose": (7, 8), **BOTH_HANDS}
+
     @property
     def category(self) -> str:
         return "combo"
@@ -10,26 +12,30 @@ class OMGDetector(BaseFeature):
     def detect(self, ctx: FeatureContext) -> bool:
         if ctx.face_landmarks is None or ctx.pose_landmarks is None:
             return False
-        left_h = ctx.left_hand_landmarks
-        right_h = ctx.right_hand_landmarks
-        if left_h is None or right_h is None:
+        if ctx.left_hand_landmarks is None or ctx.right_hand_landmarks is None:
             return False
 
-        m_up = ctx.face_landmarks.landmark[13]
-        m_down = ctx.face_landmarks.landmark[14]
-        mouth_open = abs(m_down.y - m_up.y)
-        if mouth_open <= 0.03:
+        face = ctx.face_landmarks
+        mouth_open = abs(face[14, 1] - face[13, 1])
+        if mouth_open <= self.params.get("mouth_open", 0.03):
             return False
 
-        if not is_palm_open(left_h) or not is_palm_open(right_h):
+        g = ctx.hand_geometry
+        if not g.palm_open.all():
             return False
 
-        l_ear = ctx.pose_landmarks.landmark[7]
-        r_ear = ctx.pose_landmarks.landmark[8]
-        l_mcp = left_h.landmark[5]
-        r_mcp = right_h.landmark[5]
-
-        d_l = np.sqrt((l_mcp.x - l_ear.x)**2 + (l_mcp.y - l_ear.y)**2)
-        d_r = np.sqrt((r_mcp.x - r_ear.x)**2 + (r_mcp.y - r_ear.y)**2)
+        # 左手 MCP → 左耳，右手 MCP → 右耳
+        ear = self.params.get("ear_distance", 0.12)
+        return bool(g.mcp_ear_dist[0, 0] < ear and g.mcp_ear_dist[1, 1] < ear)
 
-        return d_l < 0.12 and d_r < 0.12
+    def detect_batch(self, batch: FeatureBatch) -> np.ndarray:
+        lips = batch.points("face", (13, 14))
+        mouth_open = ~(np.abs(lips[:, 1, 1] - lips[:, 0, 1]) <= self.params.get("mouth_open", 0.03))
+        g = batch.hand_geometry
+        ear = self.params.get("ear_distance", 0.12)
+        return (
+            batch.has("face") & batch.has("pose") & batch.has("left_hand") & batch.has("right_hand")
+            & mouth_open
+            & g.palm_open.all(axis=-1)
+            & (g.mcp_ear_dist[:, 0, 0] < ear) & (g.mcp_ear_dist[:, 1, 1] < ear)
+        )
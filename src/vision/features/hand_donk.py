@@ -1,7 +1,10 @@
 import numpy as np
-from .base import BaseFeature, FeatureContext
+
+from .base import BOTH_HANDS, BaseFeature, FeatureBatch, FeatureContext
 
 class DonkDetector(BaseFeature):
+    landmark_groups = {"face": (1, 13), **BOTH_HANDS}
+
     @property
     def category(self) -> str:
         return "hand"
@@ -9,15 +12,14 @@ class DonkDetector(BaseFeature):
     def detect(self, ctx: FeatureContext) -> bool:
         if ctx.face_landmarks is None:
             return False
-        nose = ctx.face_landmarks.landmark[1]
-        m_up = ctx.face_landmarks.landmark[13]
+        g = ctx.hand_geometry
+        # 食指尖靠近鼻尖正下方、上唇高度
+        return bool((g.present & self._near_nose(g)).any())
+
+    def detect_batch(self, batch: FeatureBatch) -> np.ndarray:
+        g = batch.hand_geometry
+        return batch.has("face") & (g.present & self._near_nose(g)).any(axis=-1)
 
-        for hand in [ctx.left_hand_landmarks, ctx.right_hand_landmarks]:
-            if hand is None:
-                continue
-            tip = hand.landmark[8]
-            dist_x = abs(tip.x - nose.x)
-            dist_y = abs(tip.y - m_up.y)
-            if dist_y < 0.05 and dist_x < 0.025:
-                return True
-        return False
+    def _near_nose(self, g):
+        return ((g.tip_mouth_dy < self.params.get("mouth_dy", 0.05))
+                & (g.tip_nose_dx < self.params.get("nose_dx", 0.025)))
@@ -1,8 +1,11 @@
 import numpy as np
-from .base import BaseFeature, FeatureContext
+
+from .base import BOTH_HANDS, BaseFeature, FeatureBatch, FeatureContext
 
 class GuaiqiaoDetector(BaseFeature):
     """Guaiqiao: both hands half-fist in front of body."""
+    landmark_groups = {"pose": (11, 12, 23, 24), **BOTH_HANDS}
+
     @property
     def category(self) -> str:
         return "combo"
@@ -15,11 +18,11 @@ class GuaiqiaoDetector(BaseFeature):
         if left_h is None or right_h is None:
             return False
 
-        pose = ctx.pose_landmarks.landmark
+        pose = ctx.pose_landmarks
 
         # Hand center (MCP of middle finger = landmark 9)
-        l_c = left_h.landmark[9]
-        r_c = right_h.landmark[9]
+        l_c = left_h[9]
+        r_c = right_h[9]
 
         # Hands must be below shoulders (y >= shoulder_y) and above hips (y <= hip_y)
         # Use relaxed horizontal: within 1.5x shoulder width
@@ -28,31 +31,39 @@ class GuaiqiaoDetector(BaseFeature):
         l_hip = pose[23]
         r_hip = pose[24]
 
-        shoulder_mid_y = (l_shoulder.y + r_shoulder.y) / 2
-        hip_mid_y = (l_hip.y + r_hip.y) / 2
+        shoulder_mid_y = (l_shoulder[1] + r_shoulder[1]) / 2
+        hip_mid_y = (l_hip[1] + r_hip[1]) / 2
 
         # Vertical: between shoulder and hip (generous margins)
         margin_v = 0.1
         for pt in [l_c, r_c]:
-            if not (shoulder_mid_y - margin_v <= pt.y <= hip_mid_y + margin_v):
+            if not (shoulder_mid_y - margin_v <= pt[1] <= hip_mid_y + margin_v):
                 return False
 
         # Horizontal: within expanded torso width (1.5x shoulder span)
-        shoulder_span = abs(r_shoulder.x - l_shoulder.x)
-        torso_mid_x = (l_shoulder.x + r_shoulder.x) / 2
+        shoulder_span = abs(r_shoulder[0] - l_shoulder[0])
+        torso_mid_x = (l_shoulder[0] + r_shoulder[0]) / 2
         half_width = shoulder_span * 0.9  # generous
         for pt in [l_c, r_c]:
-            if not (torso_mid_x - half_width <= pt.x <= torso_mid_x + half_width):
+            if not (torso_mid_x - half_width <= pt[0] <= torso_mid_x + half_width):
                 return False
 
         # Both hands: all four fingers curled (half-fist)
-        def is_fist(hand_lm):
-            wrist = hand_lm[0]
-            for tip_id, mcp_id in [(8,5),(12,9),(16,13),(20,17)]:
-                d_t = np.sqrt((hand_lm[tip_id].x - wrist.x)**2 + (hand_lm[tip_id].y - wrist.y)**2)
-                d_m = np.sqrt((hand_lm[mcp_id].x - wrist.x)**2 + (hand_lm[mcp_id].y - wrist.y)**2)
-                if d_t > d_m:
-                    return False
-            return True
-
-        return is_fist(left_h.landmark) and is_fist(right_h.landmark)
+        return bool(ctx.hand_geometry.fist.all())
+
+    def detect_batch(self, batch: FeatureBatch) -> np.ndarray:
+        pose = batch.points("pose", (11, 12, 23, 24))
+        l_shoulder, r_shoulder, l_hip, r_hip = (pose[:, i] for i in range(4))
+        g = batch.hand_geometry
+        shoulder_mid_y = (l_shoulder[:, 1] + r_shoulder[:, 1]) / 2
+        hip_mid_y = (l_hip[:, 1] + r_hip[:, 1]) / 2
+        margin_v = 0.1
+        shoulder_span = np.abs(r_shoulder[:, 0] - l_shoulder[:, 0])
+        torso_mid_x = (l_shoulder[:, 0] + r_shoulder[:, 0]) / 2
+        half_width = shoulder_span * 0.9
+
+        ok = batch.has("pose") & batch.has("left_hand") & batch.has("right_hand")
+        for c in (batch.points("left_hand", (9,))[:, 0], batch.points("right_hand", (9,))[:, 0]):
+            ok &= (shoulder_mid_y - margin_v <= c[:, 1]) & (c[:, 1] <= hip_mid_y + margin_v)
+            ok &= (torso_mid_x - half_width <= c[:, 0]) & (c[:, 0] <= torso_mid_x + half_width)
+        return ok & g.fist.all(axis=-1)
@@ -1,9 +1,12 @@
 """双手比心检测。"""
 import numpy as np
-from .base import BaseFeature, FeatureContext
+
+from .base import BOTH_HANDS, BaseFeature, FeatureBatch, FeatureContext
 
 
 class HeartDetector(BaseFeature):
+    landmark_groups = BOTH_HANDS
+
     @property
     def category(self) -> str:
         return "hand"
@@ -13,19 +16,14 @@ class HeartDetector(BaseFeature):
         if ctx.left_hand_landmarks is None or ctx.right_hand_landmarks is None:
             return False
 
-        left_lm = ctx.left_hand_landmarks.landmark
-        right_lm = ctx.right_hand_landmarks.landmark
-
-        # 左手拇指尖(4)与右手拇指尖(4)距离
-        l_thumb = left_lm[4]
-        r_thumb = right_lm[4]
+        # 左右手拇指尖(4)、食指尖(8) 两两距离
+        thumb_dist, index_dist = ctx.hand_geometry.cross_tip_dist
 
-        # 左手食指尖(8)与右手食指尖(8)距离
-        l_index = left_lm[8]
-        r_index = right_lm[8]
-
-        thumb_dist = np.sqrt((l_thumb.x - r_thumb.x)**2 + (l_thumb.y - r_thumb.y)**2)
-        index_dist = np.sqrt((l_index.x - r_index.x)**2 + (l_index.y - r_index.y)**2)
+        threshold = self.params.get("distance_threshold", 0.08)
+        return bool(thumb_dist < threshold and index_dist < threshold)
 
+    def detect_batch(self, batch: FeatureBatch) -> np.ndarray:
+        cross = batch.hand_geometry.cross_tip_dist
         threshold = self.params.get("distance_threshold", 0.08)
-        return thumb_dist < threshold and index_dist < threshold
+        return (batch.has("left_hand") & batch.has("right_hand")
+                & (cross[:, 0] < threshold) & (cross[:, 1] < threshold))
@@ -1,7 +1,10 @@
 import numpy as np
-from .base import BaseFeature, FeatureContext
+
+from .base import BOTH_HANDS, BaseFeature, FeatureBatch, FeatureContext
 
 class MonkeyThinkDetector(BaseFeature):
+    landmark_groups = {"face": (1, 61, 291), **BOTH_HANDS}
+
     @property
     def category(self) -> str:
         return "hand"
@@ -9,19 +12,14 @@ class MonkeyThinkDetector(BaseFeature):
     def detect(self, ctx: FeatureContext) -> bool:
         if ctx.face_landmarks is None:
             return False
-        nose = ctx.face_landmarks.landmark[1]
-        l_corner = ctx.face_landmarks.landmark[61]
-        r_corner = ctx.face_landmarks.landmark[291]
+        g = ctx.hand_geometry
+        return bool((g.present & self._near_corner(g)).any())
+
+    def detect_batch(self, batch: FeatureBatch) -> np.ndarray:
+        g = batch.hand_geometry
+        return batch.has("face") & (g.present & self._near_corner(g)).any(axis=-1)
 
-        for hand in [ctx.left_hand_landmarks, ctx.right_hand_landmarks]:
-            if hand is None:
-                continue
-            tip = hand.landmark[8]
-            dist_x = abs(tip.x - nose.x)
-            if dist_x < 0.025:
-                continue  # too close to nose -> Donk territory
-            d_l = np.sqrt((tip.x - l_corner.x)**2 + (tip.y - l_corner.y)**2)
-            d_r = np.sqrt((tip.x - r_corner.x)**2 + (tip.y - r_corner.y)**2)
-            if d_l < 0.04 or d_r < 0.04:
-                return True
-        return False
+    def _near_corner(self, g):
+        near_corner = (g.tip_corner_dist < self.params.get("corner_distance", 0.04)).any(axis=-1)
+        # too close to nose -> Donk territory
+        return (g.tip_nose_dx >= self.params.get("nose_dx", 0.025)) & near_corner
@@ -1,8 +1,10 @@
 import numpy as np
-from .base import BaseFeature, FeatureContext
-from ._palm_util import is_palm_open
+
+from .base import BOTH_HANDS, BaseFeature, FeatureBatch, FeatureContext
 
 class NFBDetector(BaseFeature):
+    landmark_groups = {"face": (13, 14), "pose": (7, 8), **BOTH_HANDS}
+
     @property
     def category(self) -> str:
         return "hand"
@@ -10,23 +12,19 @@ class NFBDetector(BaseFeature):
     def detect(self, ctx: FeatureContext) -> bool:
         if ctx.face_landmarks is None or ctx.pose_landmarks is None:
             return False
-        m_up = ctx.face_landmarks.landmark[13]
-        m_down = ctx.face_landmarks.landmark[14]
-        mouth_open = abs(m_down.y - m_up.y)
-        if mouth_open >= 0.03:  # mouth must be closed
+        face = ctx.face_landmarks
+        mouth_open = abs(face[14, 1] - face[13, 1])
+        if mouth_open >= self.params.get("mouth_closed", 0.03):  # mouth must be closed
             return False
 
-        l_ear = ctx.pose_landmarks.landmark[7]
-        r_ear = ctx.pose_landmarks.landmark[8]
+        g = ctx.hand_geometry
+        near_ear = (g.mcp_ear_dist < self.params.get("ear_distance", 0.08)).any(axis=-1)
+        return bool((g.present & g.palm_open & near_ear).any())
 
-        for hand in [ctx.left_hand_landmarks, ctx.right_hand_landmarks]:
-            if hand is None:
-                continue
-            if not is_palm_open(hand):
-                continue
-            mcp = hand.landmark[5]
-            d_le = np.sqrt((mcp.x - l_ear.x)**2 + (mcp.y - l_ear.y)**2)
-            d_re = np.sqrt((mcp.x - r_ear.x)**2 + (mcp.y - r_ear.y)**2)
-            if d_le < 0.08 or d_re < 0.08:
-                return True
-        return False
+    def detect_batch(self, batch: FeatureBatch) -> np.ndarray:
+        lips = batch.points("face", (13, 14))
+        mouth_closed = ~(np.abs(lips[:, 1, 1] - lips[:, 0, 1]) >= self.params.get("mouth_closed", 0.03))
+        g = batch.hand_geometry
+        near_ear = (g.mcp_ear_dist < self.params.get("ear_distance", 0.08)).any(axis=-1)
+        return (batch.has("face") & batch.has("pose") & mouth_closed
+                & (g.present & g.palm_open & near_ear).any(axis=-1))
@@ -1,9 +1,11 @@
 """下蹲检测：通过膝盖弯曲角度判定。"""
 import numpy as np
-from .base import BaseFeature, FeatureContext
+from .base import BaseFeature, FeatureBatch, FeatureContext
 
 
 class SquatDetector(BaseFeature):
+    landmark_groups = {"pose": (23, 25, 27)}
+
     @property
     def category(self) -> str:
         return "pose"
@@ -12,22 +14,31 @@ class SquatDetector(BaseFeature):
         if ctx.pose_landmarks is None:
             return False
 
-        lm = ctx.pose_landmarks.landmark
+        lm = ctx.pose_landmarks
         angle_threshold = self.params.get("angle_threshold", 140)
 
         # 左膝角度
-        hip = lm[23]    # 左髋
-        knee = lm[25]   # 左膝
-        ankle = lm[27]  # 左踝
+        hip = lm[23, :2]    # 左髋
+        knee = lm[25, :2]   # 左膝
+        ankle = lm[27, :2]  # 左踝
 
         angle = self._compute_angle(hip, knee, ankle)
-        return angle < angle_threshold
+        return bool(angle < angle_threshold)
+
+    def detect_batch(self, batch: FeatureBatch) -> np.ndarray:
+        leg = batch.points("pose", (23, 25, 27))[..., :2]
+        angle = self._compute_angle(leg[:, 0], leg[:, 1], leg[:, 2])
+        return batch.has("pose") & (angle < self.params.get("angle_threshold", 140))
 
     @staticmethod
-    def _compute_angle(a, b, c) -> float:
-        """计算 a-b-c 三点构成的夹角（度数），b 为顶点。"""
-        ba = np.array([a.x - b.x, a.y - b.y])
-        bc = np.array([c.x - b.x, c.y - b.y])
-        cos_angle = np.dot(ba, bc) / (np.linalg.norm(ba) * np.linalg.norm(bc) + 1e-8)
-        cos_angle = np.clip(cos_angle, -1.0, 1.0)
+    def _compute_angle(a, b, c):
+        """计算 a-b-c 三点构成的夹角（度数），b 为顶点。
+
+        按最后一维逐元素计算，单帧 (2,) 与批量 (T,2) 结果逐位一致。
+        """
+        ba = a - b
+        bc = c - b
+        dot = (ba * bc).sum(axis=-1)
+        norms = np.sqrt((ba * ba).sum(axis=-1)) * np.sqrt((bc * bc).sum(axis=-1))
+        cos_angle = np.clip(dot / (norms + 1e-8), -1.0, 1.0)
         return np.degrees(np.arccos(cos_angle))
@@ -4,66 +4,192 @@ from mediapipe.tasks.python import vision, BaseOptions
 from mediapipe.tasks.python.components.containers import landmark as lm_containers
 import numpy as np
 import logging
+import threading
+import time
+from dataclasses import dataclass
+from .landmarks import LandmarkFrame, LandmarkSelection
 
 logger = logging.getLogger(__name__)
 
 
-class _LegacyLandmarks:
-    """兼容包装：让新 API 的 List[NormalizedLandmark] 支持 .landmark 属性。"""
-    def __init__(self, landmarks: list):
-        self.landmark = landmarks
+@dataclass
+class HolisticResult:
+    """一次推理结果，附带其所属帧的编号和时间戳。"""
+    results: LandmarkFrame
+    frame_id: int
+    timestamp: float      # 帧采集时间（秒），与 submit() 传入一致
+    latency_ms: float     # submit → 结果回调的耗时
 
-    def __bool__(self):
-        return len(self.landmark) > 0
 
-    def __len__(self):
-        return len(self.landmark)
+_RUNNING_MODES = {
+    "image": vision.RunningMode.IMAGE,
+    "video": vision.RunningMode.VIDEO,
+    "live_stream": vision.RunningMode.LIVE_STREAM,
+}
 
 
-class LegacyResults:
-    """兼容包装：让新 API 的 HolisticLandmarkerResult 像旧 mp.solutions 的结果。"""
-    def __init__(self, result):
-        self.pose_landmarks = _LegacyLandmarks(result.pose_landmarks) if result.pose_landmarks else None
-        self.face_landmarks = _LegacyLandmarks(result.face_landmarks) if result.face_landmarks else None
-        self.left_hand_landmarks = _LegacyLandmarks(result.left_hand_landmarks) if result.left_hand_landmarks else None
-        self.right_hand_landmarks = _LegacyLandmarks(result.right_hand_landmarks) if result.right_hand_landmarks else None
+class HolisticRunner:
+    """MediaPipe HolisticLandmarker (0.10+ API) 封装。
 
+    running_mode:
+    - "image"：process() 同步逐帧推理（默认）
+    - "video"：process() 同步推理，利用帧间时间戳做跟踪
+    - "live_stream"：submit() 异步提交，poll() 从结果信箱取最新结果，
+      推理与渲染/引擎更新重叠执行
 
-class HolisticRunner:
-    """MediaPipe HolisticLandmarker (0.10+ API) 封装。"""
+    结果为复用缓冲的 LandmarkFrame：process() 的返回值在下一次 process() 前有效，
+    poll() 的返回值在下一次成功 poll() 前有效；需要长期保留时请 copy()。
+    """
 
-    def __init__(self, model_path: str, min_detection_confidence: float = 0.5, min_tracking_confidence: float = 0.5):
+    def __init__(self, model_path: str, min_detection_confidence: float = 0.5, min_tracking_confidence: float = 0.5,
+                 running_mode: str = "image", max_in_flight_s: float = 1.0):
+        if running_mode not in _RUNNING_MODES:
+            raise ValueError(f"Unknown running mode: {running_mode!r}")
         self._model_path = model_path
         self._min_detection_confidence = min_detection_confidence
         self._min_tracking_confidence = min_tracking_confidence
+        self._running_mode = running_mode
+        self._max_in_flight_s = max_in_flight_s
         self._landmarker: vision.HolisticLandmarker | None = None
 
+        # 异步模式：在途帧 + 结果信箱（只保留最新结果）
+        self._lock = threading.Lock()
+        self._last_ts_ms = -1
+        self._in_flight: tuple[int, int, float, float] | None = None  # (ts_ms, frame_id, timestamp, submit_time)
+        self._mailbox: HolisticResult | None = None
+        self._dropped_submits = 0
+
+        # 复用的关键点帧：同步模式一个；异步模式三缓冲（回调写 back → ready → 调用方持有 front）
+        self._frame = LandmarkFrame()
+        self._back = LandmarkFrame()
+        self._ready = LandmarkFrame()
+        self._front = LandmarkFrame()
+        self._selection: LandmarkSelection | None = None
+
+    @property
+    def is_async(self) -> bool:
+        return self._running_mode == "live_stream"
+
+    @property
+    def dropped_submits(self) -> int:
+        """异步模式下因推理繁忙而未提交的帧数。"""
+        return self._dropped_submits
+
+    def set_landmark_selection(self, selection: LandmarkSelection | None) -> None:
+        """只转换声明的部位/关键点（通常来自 FeatureExtractor.required_landmarks）；None 为全部。"""
+        self._selection = selection
+        logger.info("Landmark selection: %s", "all" if selection is None else {
+            g: "all" if idx is None else len(idx) for g, idx in selection.items()})
+
     def initialize(self) -> bool:
         try:
             options = vision.HolisticLandmarkerOptions(
                 base_options=BaseOptions(model_asset_path=self._model_path),
-                running_mode=vision.RunningMode.IMAGE,
+                running_mode=_RUNNING_MODES[self._running_mode],
                 min_face_detection_confidence=self._min_detection_confidence,
                 min_pose_detection_confidence=self._min_detection_confidence,
                 min_hand_landmarks_confidence=self._min_tracking_confidence,
+                result_callback=self._on_result if self.is_async else None,
             )
             self._landmarker = vision.HolisticLandmarker.create_from_options(options)
-            logger.info("Holistic initialized: model=%s", self._model_path)
+            logger.info("Holistic initialized: model=%s mode=%s", self._model_path, self._running_mode)
             return True
         except Exception as e:
             logger.error("Holistic init failed: %s", e)
             return False
 
-    def process(self, bgr_frame) -> LegacyResults | None:
+    def process(self, bgr_frame, timestamp: float | None = None, rgb_frame=None) -> LandmarkFrame | None:
+        """同步推理（image / video 模式）。timestamp 为帧时间（秒），video 模式使用。
+
+        rgb_frame 为调用方已转换好的同一帧 RGB（与显示共用），给出时不再转换。
+        """
         if self._landmarker is None:
             return None
-        frame_rgb = __import__("cv2").cvtColor(bgr_frame, __import__("cv2").COLOR_BGR2RGB)
-        mp_image = mp.Image(image_format=mp.ImageFormat.SRGB, data=frame_rgb)
-        result = self._landmarker.detect(mp_image)
-        return LegacyResults(result)
+        if self.is_async:
+            raise RuntimeError("process() is not available in live_stream mode, use submit()/poll()")
+        mp_image = self._to_mp_image(bgr_frame, rgb_frame)
+        if self._running_mode == "video":
+            ts_ms = self._next_timestamp_ms(time.monotonic() if timestamp is None else timestamp)
+            result = self._landmarker.detect_for_video(mp_image, ts_ms)
+        else:
+            result = self._landmarker.detect(mp_image)
+        return self._frame.fill(result, self._selection)
+
+    def submit(self, bgr_frame, frame_id: int, timestamp: float, rgb_frame=None) -> bool:
+        """异步提交一帧（live_stream 模式），返回是否已提交。rgb_frame 同 process()。
+
+        上一帧仍在推理时直接丢弃本帧，避免 MediaPipe 内部排队导致结果滞后。
+        """
+        if self._landmarker is None:
+            return False
+        if not self.is_async:
+            raise RuntimeError("submit() requires live_stream mode")
+        now = time.monotonic()
+        with self._lock:
+            if self._in_flight is not None and now - self._in_flight[3] < self._max_in_flight_s:
+                self._dropped_submits += 1
+                return False
+            ts_ms = self._next_timestamp_ms(timestamp)
+            self._in_flight = (ts_ms, frame_id, timestamp, now)
+        mp_image = self._to_mp_image(bgr_frame, rgb_frame)
+        try:
+            self._landmarker.detect_async(mp_image, ts_ms)
+        except Exception as e:
+            logger.error("Holistic detect_async failed: %s", e)
+            with self._lock:
+                self._in_flight = None
+            return False
+        return True
+
+    def poll(self) -> HolisticResult | None:
+        """取走信箱中的最新结果；自上次 poll() 以来没有新结果时返回 None。"""
+        with self._lock:
+            result, self._mailbox = self._mailbox, None
+            if result is not None:
+                self._front, self._ready = self._ready, self._front
+        return result
 
     def close(self) -> None:
         if self._landmarker is not None:
             self._landmarker.close()
             self._landmarker = None
             logger.info("Holistic closed")
+
+    def _on_result(self, result, output_image, timestamp_ms: int) -> None:
+        """MediaPipe 结果回调（在 MediaPipe 线程中执行）。"""
+        # back 缓冲只由回调线程写入，填充无需持锁
+        try:
+            self._back.fill(result, self._selection)
+            converted = True
+        except Exception as e:
+            logger.error("Holistic result conversion failed: %s", e)
+            converted = False
+        with self._lock:
+            in_flight = self._in_flight
+            if in_flight is None or in_flight[0] != timestamp_ms:
+                logger.debug("Holistic result for unknown timestamp %d dropped", timestamp_ms)
+                return
+            self._in_flight = None
+            if not converted:
+                return
+            _, frame_id, frame_ts, submit_time = in_flight
+            self._back, self._ready = self._ready, self._back
+            self._mailbox = HolisticResult(
+                results=self._ready,
+                frame_id=frame_id,
+                timestamp=frame_ts,
+                latency_ms=(time.monotonic() - submit_time) * 1000,
+            )
+
+    def _next_timestamp_ms(self, timestamp: float) -> int:
+        """MediaPipe 要求时间戳严格递增（毫秒）。"""
+        ts_ms = max(int(timestamp * 1000), self._last_ts_ms + 1)
+        self._last_ts_ms = ts_ms
+        return ts_ms
+
+    @staticmethod
+    def _to_mp_image(bgr_frame, rgb_frame=None) -> mp.Image:
+        # mp.Image 会拷贝数据，rgb_frame 可以是调用方逐帧复用的缓冲
+        if rgb_frame is None:
+            rgb_frame = __import__("cv2").cvtColor(bgr_frame, __import__("cv2").COLOR_BGR2RGB)
+        return mp.Image(image_format=mp.ImageFormat.SRGB, data=rgb_frame)
@@ -0,0 +1,144 @@
+"""自适应推理调度：按动作幅度和 CPU 余量决定每 N 帧推理一次，中间帧外推关键点。"""
+import logging
+import time
+
+import numpy as np
+
+from .landmarks import GROUPS, LandmarkFrame
+
+logger = logging.getLogger(__name__)
+
+# 参与运动量估计的关键点组（人脸点数多且几乎不影响手势，排除）
+_MOTION_GROUPS = ("pose", "left_hand", "right_hand")
+
+
+class InferenceScheduler:
+    """包装 HolisticRunner.process：每 interval 帧推理一次，其余帧按匀速模型外推。
+
+    - 运动速度 > motion_high（归一化坐标/秒）：立即回到每帧推理
+    - 运动速度 < motion_low：每次推理后 interval + 1，直到 max_interval
+    - 推理耗时超过 frame_budget_ms（CPU 吃紧）：在非高速运动时额外放宽 1 帧
+    - process(force=True)（如引擎处于 DETECTING）：本帧必定推理，保证触发不被推迟
+    """
+
+    def __init__(self, runner, min_interval: int = 1, max_interval: int = 3,
+                 motion_low: float = 0.05, motion_high: float = 0.3,
+                 frame_budget_ms: float = 33.0, max_extrapolate_s: float = 0.15):
+        self._runner = runner
+        self._min_interval = max(1, min_interval)
+        self._max_interval = max(self._min_interval, max_interval)
+        self._motion_low = motion_low
+        self._motion_high = motion_high
+        self._frame_budget_ms = frame_budget_ms
+        self._max_extrapolate_s = max_extrapolate_s
+
+        self._interval = self._min_interval
+        self._since_inference = 0
+        # 最近两次真实推理的快照 + 外推输出，均为预分配复用的帧
+        self._prev = LandmarkFrame()
+        self._last = LandmarkFrame()
+        self._out = LandmarkFrame()
+        self._prev_ts: float | None = None
+        self._last_ts: float | None = None
+        self._last_valid = False
+        self._inference_ms = 0.0
+        self._motion = 0.0
+        self._frames = 0
+        self._inferences = 0
+
+    @property
+    def interval(self) -> int:
+        return self._interval
+
+    @property
+    def motion(self) -> float:
+        """最近两次推理之间的平均关键点速度（归一化坐标/秒）。"""
+        return self._motion
+
+    @property
+    def inference_ms(self) -> float:
+        """推理耗时的指数滑动平均。"""
+        return self._inference_ms
+
+    @property
+    def inference_ratio(self) -> float:
+        """实际推理帧数 / 总帧数。"""
+        return self._inferences / self._frames if self._frames else 0.0
+
+    def process(self, bgr_frame, timestamp: float, force: bool = False, rgb_frame=None) -> LandmarkFrame | None:
+        """返回本帧的关键点结果（真实推理或外推）。rgb_frame 见 HolisticRunner.process()。"""
+        self._frames += 1
+        if force or self._last_ts is None or self._since_inference + 1 >= self._interval:
+            return self._infer(bgr_frame, timestamp, rgb_frame)
+        self._since_inference += 1
+        return self._extrapolate(timestamp)
+
+    def _infer(self, bgr_frame, timestamp: float, rgb_frame=None) -> LandmarkFrame | None:
+        start = time.perf_counter()
+        results = self._runner.process(bgr_frame, timestamp, rgb_frame)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        self._inference_ms = elapsed_ms if self._inferences == 0 else 0.8 * self._inference_ms + 0.2 * elapsed_ms
+        self._inferences += 1
+        self._since_inference = 0
+
+        # runner 的结果帧会被复用，拷贝进自己的快照
+        self._prev, self._last = self._last, self._prev
+        self._prev_ts, self._last_ts = self._last_ts, timestamp
+        if results is not None:
+            self._last.copy_from(results)
+        else:
+            self._last.clear()
+        self._last_valid = results is not None
+        self._motion = self._estimate_motion()
+        self._adapt()
+        return results
+
+    def _estimate_motion(self) -> float:
+        if self._prev_ts is None:
+            return 0.0
+        dt = self._last_ts - self._prev_ts
+        if dt <= 0:
+            return self._motion
+        speeds = []
+        for group in _MOTION_GROUPS:
+            a = self._prev.get(group)
+            b = self._last.get(group)
+            if a is None or b is None or a.shape != b.shape:
+                continue
+            speeds.append(float(np.linalg.norm(b[:, :2] - a[:, :2], axis=1).mean()) / dt)
+        return max(speeds) if speeds else 0.0
+
+    def _adapt(self) -> None:
+        old = self._interval
+        if self._motion > self._motion_high:
+            self._interval = self._min_interval
+        elif self._motion < self._motion_low:
+            self._interval = min(self._max_interval, self._interval + 1)
+        if self._inference_ms > self._frame_budget_ms and self._motion <= self._motion_high:
+            self._interval = min(self._max_interval, self._interval + 1)
+        if self._interval != old:
+            logger.debug("Inference interval %d → %d (motion=%.3f, inference=%.1fms)",
+                         old, self._interval, self._motion, self._inference_ms)
+
+    def _extrapolate(self, timestamp: float) -> LandmarkFrame | None:
+        if not self._last_valid:
+            return None
+        dt = min(timestamp - self._last_ts, self._max_extrapolate_s)
+        span = self._last_ts - self._prev_ts if self._prev_ts is not None else 0.0
+
+        out = self._out
+        for group in GROUPS:
+            b = self._last.get(group)
+            if b is None:
+                out.discard(group)
+                continue
+            a = self._prev.get(group)
+            view = out.reserve(group, len(b))
+            if a is not None and a.shape == b.shape and span > 0 and dt > 0:
+                # 匀速外推：b + (b - a) * dt / span，直接写入复用缓冲
+                np.subtract(b, a, out=view)
+                view *= dt / span
+                view += b
+            else:
+                np.copyto(view, b)
+        return out
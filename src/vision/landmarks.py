@@ -0,0 +1,138 @@
+"""紧凑关键点帧：各部位为连续 float32 (N,3) 数组 + 存在标志。"""
+import numpy as np
+
+GROUPS = ("pose", "face", "left_hand", "right_hand")
+GROUP_SIZES = {"pose": 33, "face": 478, "left_hand": 21, "right_hand": 21}
+
+_FLAGS = {g: f"has_{g}" for g in GROUPS}
+_RESULT_ATTRS = {g: f"{g}_landmarks" for g in GROUPS}
+_POINT = np.dtype((np.float32, 3))
+
+# 部位 → 需要的关键点索引（None 表示整组）；未列出的部位表示不需要
+LandmarkSelection = dict[str, tuple[int, ...] | None]
+
+
+def merge_selections(selections) -> LandmarkSelection:
+    """合并多个检测器的关键点声明：同部位索引取并集，任一方要求整组则整组。"""
+    merged: dict[str, set[int] | None] = {}
+    for selection in selections:
+        for group, indices in selection.items():
+            if group not in GROUP_SIZES:
+                raise ValueError(f"Unknown landmark group: {group!r}")
+            if indices is None or (group in merged and merged[group] is None):
+                merged[group] = None
+            else:
+                merged.setdefault(group, set()).update(indices)
+    return {g: (None if idx is None else tuple(sorted(idx))) for g, idx in merged.items()}
+
+
+class LandmarkFrame:
+    """单帧 Holistic 关键点。
+
+    pose / face / left_hand / right_hand 是预分配缓冲上的 (N,3) 视图（x, y, z 归一化坐标），
+    仅当对应的 has_* 为 True 时有效。同一对象可逐帧复用，fill() 不会重新分配缓冲。
+    """
+
+    __slots__ = (
+        "pose", "face", "left_hand", "right_hand",
+        "has_pose", "has_face", "has_left_hand", "has_right_hand",
+        "_buffers",
+    )
+
+    def __init__(self):
+        self._buffers = {g: np.zeros((n, 3), dtype=np.float32) for g, n in GROUP_SIZES.items()}
+        for g in GROUPS:
+            setattr(self, g, self._buffers[g][:0])
+            setattr(self, _FLAGS[g], False)
+
+    def get(self, group: str) -> np.ndarray | None:
+        """返回某部位的 (N,3) 数组，不存在时返回 None。"""
+        return getattr(self, group) if getattr(self, _FLAGS[group]) else None
+
+    def reserve(self, group: str, n: int) -> np.ndarray:
+        """标记某部位存在并返回长度 n 的可写视图（内容未初始化）。"""
+        buf = self._buffers[group]
+        if n > len(buf):
+            buf = self._buffers[group] = np.zeros((n, 3), dtype=np.float32)
+        view = buf[:n]
+        setattr(self, group, view)
+        setattr(self, _FLAGS[group], True)
+        return view
+
+    def set(self, group: str, points) -> None:
+        """拷贝 (N,3) 数组到某部位；points 为 None 或空时标记为不存在。"""
+        if points is None or len(points) == 0:
+            self.discard(group)
+            return
+        np.copyto(self.reserve(group, len(points)), points)
+
+    def set_landmarks(self, group: str, landmarks, indices: tuple[int, ...] | None = None) -> None:
+        """从 MediaPipe NormalizedLandmark 列表填充某部位。
+
+        indices 不为 None 时只转换这些点，其余行保留旧值（不可读取）。
+        """
+        if not landmarks:
+            self.discard(group)
+            return
+        n = len(landmarks)
+        view = self.reserve(group, n)
+        if indices is None:
+            view[:] = np.fromiter(((p.x, p.y, p.z) for p in landmarks), dtype=_POINT, count=n)
+            return
+        idx = [i for i in indices if i < n]
+        view[idx] = np.fromiter(
+            ((landmarks[i].x, landmarks[i].y, landmarks[i].z) for i in idx), dtype=_POINT, count=len(idx)
+        )
+
+    def discard(self, group: str) -> None:
+        setattr(self, _FLAGS[group], False)
+
+    def clear(self) -> None:
+        for g in GROUPS:
+            setattr(self, _FLAGS[g], False)
+
+    def fill(self, result, selection: LandmarkSelection | None = None) -> "LandmarkFrame":
+        """从 HolisticLandmarkerResult 填充整帧，返回自身。
+
+        selection 为部位 → 索引的声明（见 merge_selections）：未列出的部位直接跳过并视为缺失，
+        索引为 None 的部位整组转换。selection 为 None 时转换全部部位。
+        """
+        for group in GROUPS:
+            landmarks = getattr(result, _RESULT_ATTRS[group])
+            if selection is None:
+                self.set_landmarks(group, landmarks)
+            elif group in selection:
+                self.set_landmarks(group, landmarks, selection[group])
+            else:
+                self.discard(group)
+        return self
+
+    def copy_from(self, other: "LandmarkFrame") -> "LandmarkFrame":
+        for g in GROUPS:
+            self.set(g, other.get(g))
+        return self
+
+    def copy(self) -> "LandmarkFrame":
+        return LandmarkFrame().copy_from(self)
+
+    @property
+    def is_empty(self) -> bool:
+        return not (self.has_pose or self.has_face or self.has_left_hand or self.has_right_hand)
+
+
+def as_landmark_array(landmarks) -> np.ndarray | None:
+    """把各种关键点表示统一为 (N,3) float32 数组。
+
+    接受 None / ndarray / 带 .landmark 列表的旧式对象（mp.solutions 风格）。
+    """
+    if landmarks is None:
+        return None
+    if isinstance(landmarks, np.ndarray):
+        return landmarks if len(landmarks) else None
+    points = landmarks.landmark
+    if not points:
+        return None
+    return np.array(
+        [(float(p.x), float(p.y), float(getattr(p, "z", 0.0))) for p in points],
+        dtype=np.float32,
+    )
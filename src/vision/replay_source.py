@@ -0,0 +1,162 @@
+"""录制会话回放：视频文件或图片序列作为帧源，接口与 Camera 一致。"""
+import logging
+import os
+import time
+
+import cv2
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+IMAGE_EXTENSIONS = (".png", ".jpg", ".jpeg", ".bmp", ".webp")
+
+
+class ReplaySource:
+    """文件帧源：用于离线基准测试和无摄像头的回归测试。
+
+    - path 为视频文件，或包含图片序列的目录（按文件名排序）
+    - pacing="realtime" 按源帧率节流；"fast" 不等待，尽可能快地读取
+    - loop=True 时读到末尾自动回到第 0 帧
+    - flip=True 时水平镜像，与 Camera.read() 一致（回放未镜像的原始摄像头录制时开启，左右手才与实时运行相同）
+    """
+
+    def __init__(self, path: str, fps: float | None = None, pacing: str = "realtime",
+                 loop: bool = False, flip: bool = False):
+        if pacing not in ("realtime", "fast"):
+            raise ValueError(f"Unknown pacing: {pacing!r}")
+        self._path = path
+        self._fps_override = fps
+        self._pacing = pacing
+        self._loop = loop
+        self._flip = flip
+        self._cap: cv2.VideoCapture | None = None
+        self._images: list[str] | None = None
+        self._fps = 30.0
+        self._frame_count = 0
+        self._position = 0
+        self._width = 0
+        self._height = 0
+        self._pace_start = 0.0
+        self._pace_origin = 0
+        self._frame_timestamp = 0.0
+
+    @property
+    def is_open(self) -> bool:
+        return self._cap is not None or self._images is not None
+
+    @property
+    def width(self) -> int:
+        return self._width
+
+    @property
+    def height(self) -> int:
+        return self._height
+
+    @property
+    def fps(self) -> float:
+        return self._fps
+
+    @property
+    def frame_count(self) -> int:
+        return self._frame_count
+
+    @property
+    def position(self) -> int:
+        """下一次 read() 将返回的帧序号。"""
+        return self._position
+
+    @property
+    def frame_timestamp(self) -> float:
+        """最近一次 read() 返回帧的媒体时间（秒，从第 0 帧起算）。"""
+        return self._frame_timestamp
+
+    def open(self) -> bool:
+        """打开回放文件，返回是否成功。"""
+        if os.path.isdir(self._path):
+            self._images = sorted(
+                os.path.join(self._path, name) for name in os.listdir(self._path)
+                if name.lower().endswith(IMAGE_EXTENSIONS)
+            )
+            if not self._images:
+                logger.error("Replay directory has no images: %s", self._path)
+                self._images = None
+                return False
+            self._frame_count = len(self._images)
+            self._fps = self._fps_override or 30.0
+            first = cv2.imread(self._images[0])
+            if first is None:
+                logger.error("Replay image unreadable: %s", self._images[0])
+                self._images = None
+                return False
+            self._height, self._width = first.shape[:2]
+        else:
+            self._cap = cv2.VideoCapture(self._path)
+            if not self._cap.isOpened():
+                logger.error("Replay file not available: %s", self._path)
+                self._cap = None
+                return False
+            self._frame_count = int(self._cap.get(cv2.CAP_PROP_FRAME_COUNT))
+            self._fps = self._fps_override or self._cap.get(cv2.CAP_PROP_FPS) or 30.0
+            self._width = int(self._cap.get(cv2.CAP_PROP_FRAME_WIDTH))
+            self._height = int(self._cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+
+        self._position = 0
+        self._reset_pacing()
+        logger.info("Replay opened: %s (%d frames, %dx%d @ %.1f FPS, pacing=%s)",
+                    self._path, self._frame_count, self._width, self._height, self._fps, self._pacing)
+        return True
+
+    def read(self) -> tuple[bool, object | None]:
+        """读取下一帧，返回 (成功, BGR帧)。到达末尾且未开启 loop 时返回 (False, None)。"""
+        if not self.is_open:
+            return False, None
+        ret, frame = self._read_next()
+        if not ret and self._loop and self._position > 0:
+            self.seek(0)
+            ret, frame = self._read_next()
+        if not ret:
+            logger.info("Replay finished at frame %d", self._position)
+            return False, None
+
+        index = self._position
+        self._position += 1
+        self._frame_timestamp = index / self._fps
+        if self._pacing == "realtime":
+            due = self._pace_start + (index - self._pace_origin) / self._fps
+            delay = due - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+        if self._flip:
+            frame = cv2.flip(frame, 1)
+        return True, frame
+
+    def seek(self, frame_index: int) -> None:
+        """跳转到指定帧，下一次 read() 从该帧开始。"""
+        frame_index = max(0, frame_index)
+        if self._frame_count:
+            frame_index = min(frame_index, self._frame_count)
+        if self._cap is not None:
+            self._cap.set(cv2.CAP_PROP_POS_FRAMES, frame_index)
+        self._position = frame_index
+        self._reset_pacing()
+
+    def release(self) -> None:
+        if self._cap is not None:
+            self._cap.release()
+            self._cap = None
+        if self._images is not None:
+            self._images = None
+        logger.info("Replay released")
+
+    def _read_next(self) -> tuple[bool, np.ndarray | None]:
+        if self._images is not None:
+            if self._position >= len(self._images):
+                return False, None
+            frame = cv2.imread(self._images[self._position])
+            return frame is not None, frame
+        ret, frame = self._cap.read()
+        return ret, frame if ret else None
+
+    def _reset_pacing(self) -> None:
+        self._pace_start = time.monotonic()
+        self._pace_origin = self._position
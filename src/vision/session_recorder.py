@@ -0,0 +1,209 @@
+"""关键点会话录制：逐帧追加到列式原始文件，读取端通过 np.memmap 零拷贝访问。
+
+会话目录结构（T = 帧数）：
+    meta.json          版本、各部位点数、特征名、帧数
+    timestamps.f64     (T,)        float64 帧时间戳
+    frame_ids.i64      (T,)        int64 帧编号
+    presence.u8        (T, 4)      各部位是否存在（顺序同 GROUPS）
+    <group>.f32        (T, N, 3)   float32 关键点，缺失部位填 NaN
+    features.u8        (T, F)      特征布尔值（顺序同 meta.json 的 features）
+"""
+import json
+import logging
+import os
+from collections.abc import Mapping, Sequence
+
+import numpy as np
+
+from .landmarks import GROUPS, GROUP_SIZES, LandmarkFrame
+
+logger = logging.getLogger(__name__)
+
+FORMAT_VERSION = 1
+META_FILE = "meta.json"
+
+_COLUMNS = {
+    "timestamps": ("timestamps.f64", np.float64, ()),
+    "frame_ids": ("frame_ids.i64", np.int64, ()),
+    "presence": ("presence.u8", np.uint8, (len(GROUPS),)),
+    **{g: (f"{g}.f32", np.float32, (n, 3)) for g, n in GROUP_SIZES.items()},
+}
+
+
+class SessionRecorder:
+    """只追加的会话录制器：每帧把各列写入对应文件末尾，不保留 Python 对象。
+
+    features 为录制的特征名；write() 时逐个读取特征值（惰性特征会因此全部求值）。
+    录制的部位需完整转换（关键点选择为 None），否则未转换的点会是上一帧的旧值。
+    """
+
+    def __init__(self, path: str, features: Sequence[str] = (), buffer_size: int = 1 << 16):
+        self._path = path
+        self._features = list(features)
+        self._buffer_size = buffer_size
+        self._files: dict[str, object] = {}
+        self._count = 0
+        # 每帧复用的行缓冲
+        self._presence = np.zeros(len(GROUPS), dtype=np.uint8)
+        self._rows = {g: np.empty((n, 3), dtype=np.float32) for g, n in GROUP_SIZES.items()}
+        self._feature_row = np.zeros(len(self._features), dtype=np.uint8)
+
+    @property
+    def path(self) -> str:
+        return self._path
+
+    @property
+    def frame_count(self) -> int:
+        return self._count
+
+    @property
+    def is_open(self) -> bool:
+        return bool(self._files)
+
+    def open(self) -> None:
+        if os.path.exists(os.path.join(self._path, META_FILE)):
+            raise FileExistsError(f"Session already exists: {self._path}")
+        os.makedirs(self._path, exist_ok=True)
+        for name, (filename, _, _) in _COLUMNS.items():
+            self._files[name] = open(os.path.join(self._path, filename), "wb", buffering=self._buffer_size)
+        self._files["features"] = open(os.path.join(self._path, "features.u8"), "wb", buffering=self._buffer_size)
+        self._count = 0
+        self._write_meta()
+        logger.info("Session recording started: %s (%d features)", self._path, len(self._features))
+
+    def write(self, frame: LandmarkFrame | None, frame_id: int, timestamp: float,
+              features: Mapping[str, bool] | None = None) -> None:
+        """追加一帧。"""
+        files = self._files
+        files["timestamps"].write(np.float64(timestamp).tobytes())
+        files["frame_ids"].write(np.int64(frame_id).tobytes())
+
+        for i, group in enumerate(GROUPS):
+            row = self._rows[group]
+            points = frame.get(group) if frame is not None else None
+            if points is None:
+                self._presence[i] = 0
+                row.fill(np.nan)
+            else:
+                self._presence[i] = 1
+                n = min(len(points), len(row))
+                row[:n] = points[:n]
+                row[n:] = np.nan
+            files[group].write(row.data)
+        files["presence"].write(self._presence.data)
+
+        if self._features:
+            for i, name in enumerate(self._features):
+                self._feature_row[i] = bool(features.get(name, False)) if features is not None else 0
+            files["features"].write(self._feature_row.data)
+        self._count += 1
+
+    def flush(self) -> None:
+        for f in self._files.values():
+            f.flush()
+        self._write_meta()
+
+    def close(self) -> None:
+        if not self._files:
+            return
+        self.flush()
+        for f in self._files.values():
+            f.close()
+        self._files = {}
+        logger.info("Session recording closed: %s (%d frames)", self._path, self._count)
+
+    def __enter__(self) -> "SessionRecorder":
+        self.open()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def _write_meta(self) -> None:
+        meta = {
+            "version": FORMAT_VERSION,
+            "groups": {g: GROUP_SIZES[g] for g in GROUPS},
+            "features": self._features,
+            "frame_count": self._count,
+        }
+        tmp = os.path.join(self._path, META_FILE + ".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(meta, f, indent=2, ensure_ascii=False)
+        os.replace(tmp, os.path.join(self._path, META_FILE))
+
+
+class SessionReader:
+    """会话读取器：各列为只读 np.memmap 视图，不逐帧解码。
+
+    帧数取各列文件中完整记录数的最小值，录制中断（未写 meta 帧数）也能读取已落盘的帧。
+    """
+
+    def __init__(self, path: str):
+        self._path = path
+        with open(os.path.join(path, META_FILE), "r", encoding="utf-8") as f:
+            self.meta = json.load(f)
+        if self.meta.get("version") != FORMAT_VERSION:
+            raise ValueError(f"Unsupported session format: {self.meta.get('version')!r}")
+        self.feature_names: list[str] = list(self.meta.get("features", []))
+
+        columns = dict(_COLUMNS)
+        columns["features"] = ("features.u8", np.uint8, (len(self.feature_names),))
+        counts = []
+        for name, (filename, dtype, shape) in columns.items():
+            row_bytes = np.dtype(dtype).itemsize * int(np.prod(shape, dtype=np.int64))
+            if row_bytes:
+                counts.append(os.path.getsize(os.path.join(path, filename)) // row_bytes)
+        self._count = min(counts) if counts else 0
+
+        self._columns: dict[str, np.ndarray] = {}
+        for name, (filename, dtype, shape) in columns.items():
+            self._columns[name] = self._map(filename, dtype, (self._count, *shape))
+
+    def _map(self, filename: str, dtype, shape: tuple[int, ...]) -> np.ndarray:
+        if shape[0] == 0 or 0 in shape:
+            return np.empty(shape, dtype=dtype)
+        return np.memmap(os.path.join(self._path, filename), dtype=dtype, mode="r", shape=shape)
+
+    def __len__(self) -> int:
+        return self._count
+
+    @property
+    def timestamps(self) -> np.ndarray:
+        return self._columns["timestamps"]
+
+    @property
+    def frame_ids(self) -> np.ndarray:
+        return self._columns["frame_ids"]
+
+    @property
+    def presence(self) -> np.ndarray:
+        """(T, 4) bool，列顺序同 GROUPS。"""
+        return self._columns["presence"].view(np.bool_)
+
+    @property
+    def features(self) -> np.ndarray:
+        """(T, F) bool，列顺序同 feature_names。"""
+        return self._columns["features"].view(np.bool_)
+
+    def landmarks(self, group: str) -> np.ndarray:
+        """某部位的 (T, N, 3) float32 视图，缺失帧为 NaN。"""
+        return self._columns[group]
+
+    def has(self, group: str) -> np.ndarray:
+        """某部位逐帧是否存在，(T,) bool。"""
+        return self.presence[:, GROUPS.index(group)]
+
+    def feature(self, name: str) -> np.ndarray:
+        """某特征的 (T,) bool 列。"""
+        return self.features[:, self.feature_names.index(name)]
+
+    def frame(self, index: int, out: LandmarkFrame | None = None) -> LandmarkFrame:
+        """把第 index 帧填入 LandmarkFrame（拷贝），用于按帧回放给检测器。"""
+        out = out or LandmarkFrame()
+        row = self.presence[index]
+        for i, group in enumerate(GROUPS):
+            if row[i]:
+                out.set(group, self._columns[group][index])
+            else:
+                out.discard(group)
+        return out
@@ -0,0 +1,197 @@
+"""后台线程摄像头采集：只保留最新帧，主循环永远拿到最新画面。"""
+import dataclasses
+import logging
+import threading
+import time
+from dataclasses import dataclass
+
+import cv2
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class CaptureStats:
+    """采集统计。"""
+    captured: int = 0           # 采集线程成功读取的帧数
+    consumed: int = 0           # 被 read() 取走的帧数
+    dropped: int = 0            # 未被消费就被更新帧覆盖的帧数
+    last_age_ms: float = 0.0    # 最近一次 read() 的帧从采集到被取走的延迟
+
+
+class ThreadedCamera:
+    """Camera 的后台线程版本，接口与 Camera 一致，可直接替换。
+
+    采集线程持续读取驱动帧并水平翻转进预分配的三缓冲：
+    back（采集线程写入）→ ready（最新完整帧）→ front（调用方持有）。
+    read() 只交换缓冲引用，不拷贝像素；返回的帧在下一次 read() 之前保持有效。
+    """
+
+    def __init__(self, index: int = 0, width: int = 640, height: int = 480, fps: int = 30,
+                 read_timeout_s: float = 1.0, release_timeout_s: float = 2.0):
+        self._index = index
+        self._width = width
+        self._height = height
+        self._target_fps = fps
+        self._read_timeout_s = read_timeout_s
+        self._release_timeout_s = release_timeout_s
+        self._cap: cv2.VideoCapture | None = None
+        self._thread: threading.Thread | None = None
+        self._running = False
+        self._failed = False
+        self._loop_done = True          # 采集线程已退出（不再访问驱动）
+        self._release_on_exit = False   # release() 等待超时：由采集线程退出时释放驱动
+        self._cond = threading.Condition()
+
+        # 预分配缓冲（首帧到达时按实际分辨率分配）
+        self._raw: np.ndarray | None = None
+        self._back: np.ndarray | None = None
+        self._ready: np.ndarray | None = None
+        self._front: np.ndarray | None = None
+        self._ready_seq = 0
+        self._ready_ts = 0.0
+        self._consumed_seq = 0
+        self._front_ts = 0.0
+        self._stats = CaptureStats()
+
+    @property
+    def is_open(self) -> bool:
+        return self._cap is not None and self._running
+
+    @property
+    def width(self) -> int:
+        return self._width
+
+    @property
+    def height(self) -> int:
+        return self._height
+
+    @property
+    def frame_timestamp(self) -> float:
+        """最近一次 read() 返回帧的采集时间（time.monotonic 秒）。"""
+        return self._front_ts
+
+    @property
+    def stats(self) -> CaptureStats:
+        with self._cond:
+            return dataclasses.replace(self._stats)
+
+    def open(self) -> bool:
+        """打开摄像头并启动采集线程，返回是否成功。"""
+        with self._cond:
+            if not self._loop_done:
+                # 上次 release() 超时，旧采集线程仍持有驱动
+                logger.error("Previous camera capture thread still running, cannot reopen")
+                return False
+        self._cap = cv2.VideoCapture(self._index)
+        if not self._cap.isOpened():
+            logger.error("Camera index %d not available", self._index)
+            self._cap = None
+            return False
+        self._cap.set(cv2.CAP_PROP_FRAME_WIDTH, self._width)
+        self._cap.set(cv2.CAP_PROP_FRAME_HEIGHT, self._height)
+        self._cap.set(cv2.CAP_PROP_FPS, self._target_fps)
+        # 驱动侧只缓存 1 帧，避免排队的旧帧
+        self._cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+
+        self._running = True
+        self._failed = False
+        self._loop_done = False
+        self._release_on_exit = False
+        self._thread = threading.Thread(target=self._capture_loop, name="camera-capture", daemon=True)
+        self._thread.start()
+        logger.info("Threaded camera opened: %dx%d @ %d FPS", self._width, self._height, self._target_fps)
+        return True
+
+    def read(self) -> tuple[bool, object | None]:
+        """取走最新一帧，返回 (成功, BGR帧)。帧已水平翻转。
+
+        若上一帧已被取走，则阻塞等待下一帧（最多 read_timeout_s）。
+        """
+        if not self.is_open:
+            return False, None
+        with self._cond:
+            has_frame = self._cond.wait_for(
+                lambda: self._ready_seq > self._consumed_seq or self._failed or not self._running,
+                timeout=self._read_timeout_s,
+            )
+            if not has_frame or self._ready_seq <= self._consumed_seq:
+                logger.warning("Camera read failed")
+                return False, None
+            self._front, self._ready = self._ready, self._front
+            self._consumed_seq = self._ready_seq
+            self._front_ts = self._ready_ts
+            self._stats.consumed += 1
+            self._stats.last_age_ms = (time.monotonic() - self._front_ts) * 1000
+        return True, self._front
+
+    def release(self) -> None:
+        """停止采集并释放驱动。
+
+        采集线程可能正阻塞在 cap.read() 中：等待 release_timeout_s 后仍未退出时，
+        不在此处释放驱动（读取中释放会访问已释放的资源），改由采集线程退出时释放。
+        """
+        with self._cond:
+            self._running = False
+            self._cond.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout=self._release_timeout_s)
+            self._thread = None
+        cap, self._cap = self._cap, None
+        if cap is None:
+            return
+        with self._cond:
+            if not self._loop_done:
+                self._release_on_exit = True
+                logger.warning("Camera capture thread still running after %.1fs, "
+                               "deferring capture release to the thread", self._release_timeout_s)
+                return
+        cap.release()
+        logger.info("Camera released (captured=%d consumed=%d dropped=%d)",
+                    self._stats.captured, self._stats.consumed, self._stats.dropped)
+
+    def _capture_loop(self) -> None:
+        cap = self._cap
+        try:
+            self._capture(cap)
+        finally:
+            with self._cond:
+                self._loop_done = True
+                release = self._release_on_exit
+            if release:
+                cap.release()
+                logger.info("Camera released by capture thread")
+
+    def _capture(self, cap: cv2.VideoCapture) -> None:
+        while self._running:
+            ret, raw = cap.read(self._raw)
+            if not ret:
+                logger.warning("Camera capture failed, stopping capture thread")
+                with self._cond:
+                    self._failed = True
+                    self._cond.notify_all()
+                return
+            ts = time.monotonic()
+            if self._back is None or self._back.shape != raw.shape:
+                self._allocate(raw)
+            self._raw = raw
+            cv2.flip(raw, 1, dst=self._back)
+
+            with self._cond:
+                if self._ready_seq > self._consumed_seq:
+                    self._stats.dropped += 1
+                self._back, self._ready = self._ready, self._back
+                self._ready_seq += 1
+                self._ready_ts = ts
+                self._stats.captured += 1
+                self._cond.notify_all()
+
+    def _allocate(self, raw: np.ndarray) -> None:
+        with self._cond:
+            self._back = np.empty_like(raw)
+            self._ready = np.empty_like(raw)
+            self._front = np.empty_like(raw)
+            # 尺寸变化后旧的 ready 帧已无效
+            self._consumed_seq = self._ready_seq
+        logger.debug("Capture buffers allocated: %s", raw.shape)
@@ -0,0 +1,96 @@
+import os
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame
+import pytest
+from PIL import Image
+from src.renderer.animated import load_animated
+from src.renderer.transitions import MemeTransitions
+
+COLORS = [(255, 0, 0), (0, 255, 0), (0, 0, 255), (255, 255, 0)]
+
+
+def _write(path, n=4, size=(80, 40), durations=100, loop=0, fmt="GIF"):
+    frames = [Image.new("RGBA", size, (*COLORS[i % len(COLORS)], 255)) for i in range(n)]
+    frames[0].save(path, format=fmt, save_all=True, append_images=frames[1:],
+                   duration=durations, loop=loop, disposal=1)
+    return str(path)
+
+
+def _color(surface):
+    return tuple(surface.get_at((surface.get_width() // 2, surface.get_height() // 2)))[:3]
+
+
+class TestLoadAnimated:
+    def test_gif_frames_and_durations(self, tmp_path):
+        anim = load_animated(_write(tmp_path / "a.gif", durations=[100, 200, 100, 100]))
+        assert len(anim) == 4
+        assert anim.size == (80, 40)
+        assert anim.durations.tolist() == pytest.approx([0.1, 0.2, 0.1, 0.1])
+        assert anim.total == pytest.approx(0.5)
+        assert [_color(f) for f in anim.frames] == COLORS
+        # 所有帧共享一张图集
+        assert all(f.get_parent() is anim.atlas for f in anim.frames)
+
+    def test_apng(self, tmp_path):
+        anim = load_animated(_write(tmp_path / "a.png", n=3, fmt="PNG"))
+        assert len(anim) == 3
+        assert _color(anim.frame_at(0.15)) == COLORS[1]
+
+    def test_static_image_returns_none(self, tmp_path):
+        path = tmp_path / "s.png"
+        Image.new("RGBA", (10, 10)).save(path)
+        assert load_animated(str(path)) is None
+
+    def test_downsize_keeps_aspect(self, tmp_path):
+        anim = load_animated(_write(tmp_path / "a.gif", size=(200, 100)), max_size=(800, 800),
+                             target_size=(50, 50))
+        assert anim.size == (50, 25)
+        assert anim.atlas.get_size() == (50, 100)
+
+    def test_frame_limit_keeps_total_duration(self, tmp_path):
+        anim = load_animated(_write(tmp_path / "a.gif", n=8, durations=50), max_frames=4)
+        assert len(anim) == 4
+        assert anim.total == pytest.approx(0.4)
+
+    def test_memory_budget(self, tmp_path):
+        anim = load_animated(_write(tmp_path / "a.gif", n=8, size=(10, 10)), budget_bytes=10 * 10 * 4 * 3)
+        assert len(anim) == 3
+        assert anim.nbytes <= 10 * 10 * 4 * 3
+
+    def test_zero_duration_defaults(self, tmp_path):
+        anim = load_animated(_write(tmp_path / "a.gif", n=2, durations=0))
+        assert anim.total == pytest.approx(0.2)
+
+
+class TestPlayback:
+    def test_time_driven_loop(self, tmp_path):
+        anim = load_animated(_write(tmp_path / "a.gif"))
+        assert anim.frame_index(0.0) == 0
+        assert anim.frame_index(0.25) == 2
+        assert anim.frame_index(0.45) == 0   # 第二遍
+        assert anim.frame_at(0.35) is anim.frames[3]
+
+    def test_finite_loop_holds_last_frame(self, tmp_path):
+        anim = load_animated(_write(tmp_path / "a.gif"))
+        anim.loop = 2
+        assert anim.frame_index(0.5) == 0
+        assert anim.frame_index(5.0) == 3
+
+    def test_transitions_play_from_show_time(self, tmp_path):
+        anim = load_animated(_write(tmp_path / "a.gif", size=(20, 20)))
+        tr = MemeTransitions(duration_ms=0, pop_scale=0.5)
+        tr.add_asset("a", anim)
+        screen = pygame.Surface((100, 100))
+        tr.show("a", 10.0)
+        tr.draw(screen, (50, 50), 10.0)
+        assert _color(screen) == COLORS[0]
+        tr.draw(screen, (50, 50), 10.25)
+        assert _color(screen) == COLORS[2]
+        # 淡出完毕后重新出现，从第一帧开始
+        tr.hide("a", 11.0)
+        tr.draw(screen, (50, 50), 11.0)
+        tr.show("a", 12.15)
+        tr.draw(screen, (50, 50), 12.15)
+        assert _color(screen) == COLORS[0]
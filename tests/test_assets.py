@@ -0,0 +1,184 @@
+import os
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pytest
+from PIL import Image
+from src.renderer.animated import AnimatedAsset
+from src.renderer.assets import AssetManager
+
+
+def _png(path, size=(64, 32), color=(255, 0, 0, 255)):
+    Image.new("RGBA", size, color).save(path)
+    return str(path)
+
+
+def _gif(path, n=3, size=(64, 32)):
+    frames = [Image.new("RGBA", size, (i * 80, 0, 0, 255)) for i in range(n)]
+    frames[0].save(path, save_all=True, append_images=frames[1:], duration=100, loop=0)
+    return str(path)
+
+
+def _wait(mgr, timeout=5.0):
+    """轮询直到没有加载中的素材，返回 (就绪, 淘汰)。"""
+    ready, evicted = [], []
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        r, e = mgr.poll()
+        ready += r
+        evicted += e
+        if not mgr.pending:
+            return ready, evicted
+        time.sleep(0.005)
+    raise AssertionError("asset loading timed out")
+
+
+@pytest.fixture
+def manager_factory():
+    managers = []
+
+    def make(**kwargs):
+        mgr = AssetManager(**kwargs)
+        mgr.start()
+        managers.append(mgr)
+        return mgr
+
+    yield make
+    for mgr in managers:
+        mgr.stop()
+
+
+class TestAssetManager:
+    def test_background_load_scales_to_size(self, tmp_path, manager_factory):
+        mgr = manager_factory(size=(40, 40))
+        path = _png(tmp_path / "a.png")
+        key = mgr.request(path)
+        ready, _ = _wait(mgr)
+        assert ready == [key]
+        surf = mgr.get(path)
+        assert surf.get_size() == (40, 40)
+        assert tuple(surf.get_at((5, 5))) == (255, 0, 0, 255)
+        assert mgr.used_bytes == 40 * 40 * 4
+
+    def test_get_miss_does_not_block(self, tmp_path, manager_factory):
+        mgr = manager_factory(size=(40, 40))
+        path = _png(tmp_path / "a.png")
+        assert mgr.get(path) is None
+        assert mgr.stats.misses == 1
+        _wait(mgr)
+        assert mgr.get(path) is not None
+        assert mgr.stats.hits == 1
+
+    def test_animated_asset(self, tmp_path, manager_factory):
+        mgr = manager_factory(size=(32, 32))
+        path = _gif(tmp_path / "a.gif")
+        mgr.request(path)
+        _wait(mgr)
+        anim = mgr.get(path)
+        assert isinstance(anim, AnimatedAsset)
+        assert len(anim) == 3
+        assert anim.size == (32, 16)   # 动图等比缩小
+
+    def test_lru_eviction_under_budget(self, tmp_path, manager_factory):
+        mgr = manager_factory(size=(10, 10), budget_bytes=10 * 10 * 4 * 2)
+        paths = [_png(tmp_path / f"{i}.png") for i in range(3)]
+        mgr.request(paths[0])
+        mgr.request(paths[1])
+        _wait(mgr)
+        mgr.get(paths[0])          # paths[1] 成为最久未用
+        mgr.request(paths[2])
+        _, evicted = _wait(mgr)
+        assert evicted == [mgr.key(paths[1])]
+        assert mgr.key(paths[0]) in mgr and mgr.key(paths[2]) in mgr
+        assert mgr.used_bytes <= mgr.budget_bytes
+        assert mgr.stats.evictions == 1
+
+    def test_keyed_by_target_size(self, tmp_path, manager_factory):
+        mgr = manager_factory(size=(10, 10))
+        path = _png(tmp_path / "a.png")
+        mgr.request(path)
+        mgr.request(path, (20, 20))
+        _wait(mgr)
+        assert mgr.get(path).get_size() == (10, 10)
+        assert mgr.get(path, (20, 20)).get_size() == (20, 20)
+
+    def test_disk_cache_reused_across_instances(self, tmp_path, manager_factory):
+        cache = str(tmp_path / "cache")
+        path = _gif(tmp_path / "a.gif")
+        first = manager_factory(size=(32, 32), cache_dir=cache)
+        first.request(path)
+        _wait(first)
+        assert first.stats.decoded == 1
+        assert len(os.listdir(cache)) == 1
+
+        second = manager_factory(size=(32, 32), cache_dir=cache)
+        second.request(path)
+        _wait(second)
+        assert second.stats.disk_hits == 1 and second.stats.decoded == 0
+        anim = second.get(path)
+        assert len(anim) == 3
+        assert anim.total == pytest.approx(0.3)
+
+    def test_disk_cache_invalidated_by_modification(self, tmp_path, manager_factory):
+        cache = str(tmp_path / "cache")
+        path = _png(tmp_path / "a.png")
+        first = manager_factory(size=(8, 8), cache_dir=cache)
+        first.request(path)
+        _wait(first)
+
+        _png(tmp_path / "a.png", color=(0, 0, 255, 255))
+        st = os.stat(path)
+        os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+        second = manager_factory(size=(8, 8), cache_dir=cache)
+        second.request(path)
+        _wait(second)
+        assert second.stats.decoded == 1
+        assert tuple(second.get(path).get_at((0, 0))) == (0, 0, 255, 255)
+
+    def test_failed_load_retried_on_get(self, tmp_path, manager_factory):
+        mgr = manager_factory(size=(8, 8))
+        path = str(tmp_path / "late.png")
+        mgr.request(path)
+        ready, _ = _wait(mgr)
+        assert ready == [] and mgr.stats.failed == 1
+        mgr.request(path)           # 预加载不重复排队
+        assert mgr.pending == 0
+        _png(path)                  # 文件写入完成后，显式 get() 重试
+        assert mgr.get(path) is None
+        ready, _ = _wait(mgr)
+        assert ready == [mgr.key(path)]
+        assert mgr.get(path) is not None
+
+    def test_in_use_assets_not_evicted(self, tmp_path, manager_factory):
+        mgr = manager_factory(size=(10, 10), budget_bytes=10 * 10 * 4 * 2)
+        paths = [_png(tmp_path / f"{i}.png") for i in range(4)]
+        mgr.request(paths[0])
+        mgr.request(paths[1])
+        _wait(mgr)
+        # paths[0] 最早加载，但正在显示：刷新 LRU 顺序，淘汰 paths[1]
+        mgr.set_in_use([mgr.key(paths[0])])
+        mgr.request(paths[2])
+        _, evicted = _wait(mgr)
+        assert evicted == [mgr.key(paths[1])]
+        # 即使成为最久未用，使用中的素材也不会被淘汰
+        mgr.set_in_use([mgr.key(paths[2]), mgr.key(paths[0])])
+        mgr.request(paths[3])
+        ready, evicted = _wait(mgr)
+        assert evicted == [] and ready == [mgr.key(paths[3])]
+        assert mgr.key(paths[0]) in mgr and mgr.key(paths[2]) in mgr
+        mgr.set_in_use([])
+        mgr.request(paths[1])
+        _, evicted = _wait(mgr)
+        assert len(evicted) == 2 and mgr.used_bytes <= mgr.budget_bytes
+
+    def test_poll_limit(self, tmp_path, manager_factory):
+        mgr = manager_factory(size=(8, 8))
+        for i in range(3):
+            mgr.request(_png(tmp_path / f"{i}.png"))
+        deadline = time.monotonic() + 5.0
+        while mgr._results.qsize() < 3 and time.monotonic() < deadline:
+            time.sleep(0.005)
+        ready, _ = mgr.poll(limit=2)
+        assert len(ready) == 2
+        assert len(mgr.poll()[0]) == 1
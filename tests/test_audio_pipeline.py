@@ -0,0 +1,211 @@
+import json
+import threading
+import wave
+
+import numpy as np
+import pytest
+from src.audio.keyword_pipeline import KeywordPipeline, build_grammar, normalize_text
+from src.audio.ring_buffer import PcmRingBuffer
+from src.audio.sources import WavFileSource
+from src.audio.vad import VadGate
+from src.engine.clock import VirtualClock
+
+
+def _write_wav(path, samples, rate=16000, channels=1):
+    data = np.repeat(np.asarray(samples, dtype=np.int16)[:, None], channels, axis=1)
+    with wave.open(str(path), "wb") as w:
+        w.setnchannels(channels)
+        w.setsampwidth(2)
+        w.setframerate(rate)
+        w.writeframes(data.tobytes())
+    return str(path)
+
+
+class FakeRecognizer:
+    """每收到 every 块给出一个最终结果，文本依次取自 texts。"""
+
+    def __init__(self, grammar, sample_rate, texts, every=2, partials=()):
+        self.grammar = json.loads(grammar)
+        self.sample_rate = sample_rate
+        self._texts = list(texts)
+        self._every = every
+        self._partials = list(partials)
+        self.chunks = []
+        self.final_called = False
+
+    def AcceptWaveform(self, data):
+        self.chunks.append(len(data))
+        return len(self.chunks) % self._every == 0 and bool(self._texts)
+
+    def Result(self):
+        text = self._texts.pop(0)
+        return json.dumps({"text": text, "result": [{"word": w, "conf": 0.8} for w in text.split()]})
+
+    def PartialResult(self):
+        return json.dumps({"partial": self._partials.pop(0) if self._partials else ""})
+
+    def FinalResult(self):
+        self.final_called = True
+        return json.dumps({"text": self._texts.pop(0) if self._texts else ""})
+
+
+class TestPcmRingBuffer:
+    def test_wraparound(self):
+        ring = PcmRingBuffer(8)
+        ring.write(np.arange(6))
+        assert ring.read(4).tolist() == [0, 1, 2, 3]
+        ring.write(np.arange(6, 12))
+        assert ring.available == 8
+        assert ring.read(8).tolist() == list(range(4, 12))
+
+    def test_overwrite_drops_oldest(self):
+        ring = PcmRingBuffer(4)
+        ring.write(np.arange(6))
+        assert ring.dropped == 2
+        assert ring.read(4).tolist() == [2, 3, 4, 5]
+
+    def test_backpressure_timeout(self):
+        ring = PcmRingBuffer(4)
+        assert ring.write(np.arange(6), overwrite=False, timeout=0.05) == 4
+        assert ring.dropped == 0
+
+    def test_read_timeout_and_close(self):
+        ring = PcmRingBuffer(8)
+        ring.write(np.arange(3))
+        assert ring.read(4, timeout=0.01) is None
+        ring.close()
+        assert ring.read(4).tolist() == [0, 1, 2]
+        assert ring.read(4) is None
+
+    def test_blocking_writer_is_released_by_reader(self):
+        ring = PcmRingBuffer(4)
+        written = []
+        t = threading.Thread(target=lambda: written.append(ring.write(np.arange(10), overwrite=False)))
+        t.start()
+        out = []
+        while len(out) < 10:
+            block = ring.read(2, timeout=1.0)
+            assert block is not None
+            out.extend(block.tolist())
+        t.join(timeout=1.0)
+        assert out == list(range(10))
+        assert written == [10]
+
+
+class TestWavFileSource:
+    def test_loads_first_channel(self, tmp_path):
+        path = _write_wav(tmp_path / "a.wav", np.arange(100), rate=8000, channels=2)
+        src = WavFileSource(path)
+        assert src.sample_rate == 8000
+        assert src.samples.tolist() == list(range(100))
+
+    def test_rejects_unknown_pacing(self, tmp_path):
+        path = _write_wav(tmp_path / "a.wav", np.zeros(10))
+        with pytest.raises(ValueError):
+            WavFileSource(path, pacing="slow")
+
+
+class TestKeywordPipeline:
+    def _pipeline(self, tmp_path, texts, keywords=("卧槽", "nice"), seconds=1.0, every=2):
+        path = _write_wav(tmp_path / "speech.wav", np.zeros(int(16000 * seconds)))
+        recognizers = []
+
+        def factory(grammar, rate):
+            recognizers.append(FakeRecognizer(grammar, rate, texts, every))
+            return recognizers[-1]
+
+        clock = VirtualClock(5.0)
+        pipeline = KeywordPipeline(WavFileSource(path, block_size=1600), keywords,
+                                   clock=clock, recognizer_factory=factory, buffer_s=0.5)
+        return pipeline, recognizers
+
+    def _drain(self, pipeline):
+        signals = []
+        while (s := pipeline.poll()) is not None:
+            signals.append(s)
+        return signals
+
+    def test_grammar(self):
+        assert normalize_text(" Ni Ce ") == "nice"
+        assert normalize_text("卧 槽") == "卧槽"
+        assert build_grammar(["卧槽", "nice"]) == ["卧槽", "卧 槽", "nice", "[unk]"]
+
+    def test_spaced_keyword_reaches_grammar(self, tmp_path):
+        # 多词关键词以原短语（小写、单空格）进入受限语法，匹配仍按归一化文本
+        pipeline, recognizers = self._pipeline(tmp_path, ["good job"], keywords=["Good  Job", "卧槽"])
+        assert json.loads(pipeline.grammar) == build_grammar(["good job", "卧槽"])
+        assert pipeline.start()
+        assert pipeline.join(timeout=5.0)
+        signals = self._drain(pipeline)
+        pipeline.stop()
+        assert "good job" in recognizers[0].grammar
+        assert [s.keyword for s in signals] == ["goodjob"]
+
+    def test_keywords_to_signals(self, tmp_path):
+        pipeline, recognizers = self._pipeline(tmp_path, ["[unk]", "卧 槽", "NICE [unk]"])
+        assert pipeline.start()
+        assert pipeline.join(timeout=5.0)
+        signals = self._drain(pipeline)
+        pipeline.stop()
+
+        assert [s.keyword for s in signals] == ["卧槽", "nice"]
+        assert signals[0].confidence == pytest.approx(0.8)
+        assert signals[0].timestamp == 5.0
+        rec = recognizers[0]
+        assert "卧槽" in rec.grammar and "[unk]" in rec.grammar
+        assert rec.sample_rate == 16000
+        # 1 秒音频按 100ms 分块全部送入识别器，结束时取最终结果
+        assert sum(rec.chunks) == 16000 * 2
+        assert rec.final_called
+        assert pipeline.stats.processed_s == pytest.approx(1.0)
+        assert pipeline.stats.signals == 2
+
+    def test_final_result_flushed(self, tmp_path):
+        pipeline, _ = self._pipeline(tmp_path, ["nice"], every=100)
+        assert pipeline.start()
+        assert pipeline.join(timeout=5.0)
+        assert [s.keyword for s in self._drain(pipeline)] == ["nice"]
+        pipeline.stop()
+
+    def test_no_keywords_does_not_start(self, tmp_path):
+        pipeline, recognizers = self._pipeline(tmp_path, [], keywords=())
+        assert not pipeline.start()
+        assert recognizers == []
+
+    def test_sample_rate_mismatch(self, tmp_path):
+        path = _write_wav(tmp_path / "a.wav", np.zeros(800), rate=8000)
+        pipeline = KeywordPipeline(WavFileSource(path), ["nice"], recognizer_factory=lambda g, r: None)
+        assert not pipeline.start()
+
+    def test_vad_feeds_only_speech(self, tmp_path):
+        t = np.arange(8000) / 16000
+        speech = (0.3 * 32767 * np.sin(2 * np.pi * 220 * t)).astype(np.int16)
+        path = _write_wav(tmp_path / "utt.wav", np.concatenate([np.zeros(32000), speech, np.zeros(32000)]))
+        recognizers = []
+
+        def factory(grammar, rate):
+            recognizers.append(FakeRecognizer(grammar, rate, ["nice"], every=1000))
+            return recognizers[-1]
+
+        vad = VadGate(hangover_ms=200, preroll_ms=300)
+        pipeline = KeywordPipeline(WavFileSource(path), ["nice"], recognizer_factory=factory, vad=vad)
+        assert pipeline.start()
+        assert pipeline.join(timeout=5.0)
+        # 语音段结束即取最终结果
+        assert [s.keyword for s in self._drain(pipeline)] == ["nice"]
+        pipeline.stop()
+        assert pipeline.stats.processed_s == pytest.approx(1.0)
+        assert vad.stats.skipped_ratio == pytest.approx(1 - 1.0 / 4.5)
+
+    def test_partial_results_fire_early_and_dedupe(self, tmp_path):
+        path = _write_wav(tmp_path / "speech.wav", np.zeros(16000))
+        rec = FakeRecognizer('["[unk]"]', 16000, ["我 卧 槽 了"], every=6, partials=["我", "我 卧", "我 卧 槽", "我 卧 槽 了"])
+        pipeline = KeywordPipeline(WavFileSource(path), ["卧槽", "nice"], clock=VirtualClock(),
+                                   recognizer_factory=lambda g, r: rec)
+        assert pipeline.start()
+        assert pipeline.join(timeout=5.0)
+        signals = self._drain(pipeline)
+        pipeline.stop()
+        # 第 3 块的部分结果即检出，最终结果不重复报告
+        assert [(s.keyword, s.partial) for s in signals] == [("卧槽", True)]
+        assert pipeline.stats.partial_hits == 1
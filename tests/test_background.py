@@ -0,0 +1,68 @@
+import os
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import cv2
+import numpy as np
+import pygame
+import pytest
+from src.renderer.background import BackgroundCompositor
+
+
+def _frame(seed, shape=(48, 64, 3)):
+    return np.random.default_rng(seed).integers(0, 256, shape, dtype=np.uint8)
+
+
+def _pixels(surface):
+    return pygame.surfarray.array3d(surface).swapaxes(0, 1)
+
+
+class TestBackgroundCompositor:
+    def test_convert_reuses_buffer(self):
+        bg = BackgroundCompositor((128, 96))
+        a = bg.convert(_frame(0))
+        b = bg.convert(_frame(1))
+        assert a is b and bg.reallocations == 1
+        np.testing.assert_array_equal(b, _frame(1)[:, :, ::-1])
+
+    @pytest.mark.parametrize("size", [(128, 96), (64, 48), (100, 70)])
+    @pytest.mark.parametrize("depth", [32, 24])
+    def test_matches_reference(self, size, depth):
+        bg = BackgroundCompositor(size)
+        frame = _frame(2)
+        screen = pygame.Surface(size, 0, depth)
+        bg.draw(screen, bg.convert(frame))
+        expected = cv2.resize(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB), size, interpolation=cv2.INTER_NEAREST)
+        np.testing.assert_array_equal(_pixels(screen), expected)
+        # 直接写像素缓冲后 surface 已解锁，可以继续 blit
+        screen.blit(pygame.Surface((4, 4)), (0, 0))
+
+    def test_direct_path_does_not_allocate_per_frame(self):
+        bg = BackgroundCompositor((128, 96))
+        screen = pygame.Surface((128, 96), 0, 32)
+        for seed in range(3):
+            bg.draw(screen, bg.convert(_frame(seed)))
+        assert bg.reallocations == 2   # RGB 缓冲 + 源分辨率的屏幕格式缓冲
+
+    def test_fallback_surface_is_persistent(self):
+        bg = BackgroundCompositor((128, 96))
+        s1 = bg.compose(bg.convert(_frame(3)))
+        s2 = bg.compose(bg.convert(_frame(4)))
+        assert s1 is s2
+
+    def test_same_size_compose_is_zero_copy(self):
+        bg = BackgroundCompositor((64, 48))
+        rgb = bg.convert(_frame(5))
+        surf = bg.compose(rgb)
+        rgb[0, 0] = (1, 2, 3)
+        assert surf.get_at((0, 0))[:3] == (1, 2, 3)
+
+    def test_frame_size_change(self):
+        bg = BackgroundCompositor((128, 96))
+        screen = pygame.Surface((128, 96), 0, 32)
+        bg.draw(screen, bg.convert(_frame(6)))
+        bg.draw(screen, bg.convert(_frame(7, shape=(24, 32, 3))))
+        expected = cv2.resize(_frame(7, shape=(24, 32, 3))[:, :, ::-1], (128, 96), interpolation=cv2.INTER_NEAREST)
+        np.testing.assert_array_equal(_pixels(screen), expected)
+        bg.resize((64, 48))
+        assert bg.compose(bg.convert(_frame(8))).get_size() == (64, 48)
@@ -0,0 +1,29 @@
+import pytest
+from src.engine.clock import Clock, MonotonicClock, VirtualClock
+
+
+class TestClock:
+    def test_monotonic_non_decreasing(self):
+        c = MonotonicClock()
+        assert c.now() <= c.now()
+
+    def test_virtual_advance(self):
+        c = VirtualClock(start=10.0)
+        assert c.now() == 10.0
+        assert c.advance(0.5) == 10.5
+        c.set(20.0)
+        assert c.now() == 20.0
+
+    def test_virtual_cannot_go_backwards(self):
+        c = VirtualClock(start=5.0)
+        with pytest.raises(ValueError):
+            c.advance(-1)
+        with pytest.raises(ValueError):
+            c.set(4.0)
+
+    def test_clock_requires_now(self):
+        class Broken(Clock):
+            pass
+
+        with pytest.raises(TypeError):
+            Broken()
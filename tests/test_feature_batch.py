@@ -0,0 +1,85 @@
+import os
+
+import numpy as np
+import pytest
+from src.vision.feature_extractor import FeatureExtractor
+from src.vision.features import FEATURE_REGISTRY
+from src.vision.features.base import FeatureBatch
+from src.vision.features.combo_guaiqiao import GuaiQiaoDetector
+from src.vision.features.hand_guaiqiao import GuaiqiaoDetector
+from src.vision.features.hand_thumbsdown import ThumbsDownDetector
+from src.vision.landmarks import GROUP_SIZES
+
+FIX = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "config")
+DETECTORS = list(FEATURE_REGISTRY.values()) + [GuaiQiaoDetector, GuaiqiaoDetector, ThumbsDownDetector]
+
+
+def _random_batch(t, seed=0):
+    """围绕一个中心点随机抖动的关键点，约 10% 的帧缺失某个部位（坐标填 NaN）。"""
+    rng = np.random.default_rng(seed)
+    center = rng.random((t, 1, 3)) * 0.5 + 0.25
+    spread = rng.choice([0.02, 0.05, 0.1, 0.3], size=(t, 1, 1))
+    landmarks, presence = {}, {}
+    for group, n in GROUP_SIZES.items():
+        arr = (center + rng.normal(0, 1, (t, n, 3)) * spread).astype(np.float32)
+        has = rng.random(t) >= 0.1
+        arr[~has] = np.nan
+        landmarks[group], presence[group] = arr, has
+    return FeatureBatch(landmarks, presence)
+
+
+class TestFeatureBatch:
+    @pytest.mark.parametrize("detector_cls", DETECTORS, ids=lambda c: c.__name__)
+    def test_batch_matches_per_frame(self, detector_cls):
+        batch = _random_batch(3000)
+        detector = detector_cls()
+        expected = np.array([detector.detect(batch.context(t)) for t in range(len(batch))])
+        result = detector.detect_batch(batch)
+        assert result.dtype == bool and result.shape == (len(batch),)
+        np.testing.assert_array_equal(result, expected)
+
+    def test_default_detect_batch_falls_back_to_detect(self):
+        class Custom(ThumbsDownDetector):
+            detect_batch = ThumbsDownDetector.__mro__[1].detect_batch
+
+        batch = _random_batch(200, seed=1)
+        np.testing.assert_array_equal(Custom().detect_batch(batch), ThumbsDownDetector().detect_batch(batch))
+
+    def test_presence_inferred_from_nan(self):
+        pose = np.zeros((3, 33, 3), dtype=np.float32)
+        pose[1] = np.nan
+        batch = FeatureBatch({"pose": pose})
+        assert batch.has("pose").tolist() == [True, False, True]
+        assert not batch.has("face").any()
+        assert batch.context(1).pose_landmarks is None
+
+    def test_mismatched_lengths_rejected(self):
+        with pytest.raises(ValueError):
+            FeatureBatch({"pose": np.zeros((3, 33, 3)), "face": np.zeros((4, 478, 3))})
+
+    def test_extractor_matrix(self):
+        fe = FeatureExtractor(os.path.join(FIX, "features.json"))
+        batch = _random_batch(500, seed=2)
+        matrix = fe.extract_batch(batch)
+        assert matrix.shape == (500, len(fe.active_features))
+        for t in range(0, 500, 7):
+            per_frame = [bool(d.detect(batch.context(t))) for d in fe._active_instances.values()]
+            assert matrix[t].tolist() == per_frame
+
+    def test_from_session(self, tmp_path):
+        from src.vision.landmarks import LandmarkFrame
+        from src.vision.session_recorder import SessionRecorder, SessionReader
+        src = _random_batch(50, seed=3)
+        path = str(tmp_path / "s")
+        with SessionRecorder(path) as rec:
+            frame = LandmarkFrame()
+            for t in range(len(src)):
+                ctx = src.context(t)
+                frame.set("pose", ctx.pose_landmarks)
+                frame.set("face", ctx.face_landmarks)
+                frame.set("left_hand", ctx.left_hand_landmarks)
+                frame.set("right_hand", ctx.right_hand_landmarks)
+                rec.write(frame, t, t / 30)
+        batch = FeatureBatch.from_session(SessionReader(path))
+        for cls in DETECTORS:
+            np.testing.assert_array_equal(cls().detect_batch(batch), cls().detect_batch(src))
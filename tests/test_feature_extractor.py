@@ -27,3 +27,34 @@ class TestFeatureExtractor:
         fe = FeatureExtractor("/nonexistent/path.json")
         assert fe.feature_names == []
         assert fe.extract(None, 0, 0.0).features == {}
+
+    def test_features_evaluated_lazily(self):
+        fe = FeatureExtractor(os.path.join(FIX, "features.json"))
+        fv = fe.extract(None, 0, 0.0)
+        assert fv.features.evaluated == {}
+        assert fv.features.get("is_donk") is False
+        assert fv.features.evaluated == {"is_donk": False}
+
+    def test_active_features_subset(self):
+        fe = FeatureExtractor(os.path.join(FIX, "features.json"))
+        fe.set_active_features(["is_omg", "is_unknown"])
+        assert fe.active_features == ["is_omg"]
+        fv = fe.extract(None, 0, 0.0)
+        assert list(fv.features) == ["is_omg"]
+        assert fv.features.get("is_donk", False) is False
+
+    def test_reset_active_features(self):
+        fe = FeatureExtractor(os.path.join(FIX, "features.json"))
+        fe.set_active_features([])
+        fe.set_active_features(None)
+        assert fe.active_features == fe.feature_names
+
+    def test_required_landmarks_follow_active_features(self):
+        fe = FeatureExtractor(os.path.join(FIX, "features.json"))
+        fe.set_active_features(["is_donk"])
+        req = fe.required_landmarks
+        assert req["face"] == (1, 13)
+        assert "pose" not in req
+        fe.set_active_features(["is_donk", "is_nfb"])
+        assert fe.required_landmarks["face"] == (1, 13, 14)
+        assert fe.required_landmarks["pose"] == (7, 8)
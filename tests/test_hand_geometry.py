@@ -0,0 +1,49 @@
+import pytest
+import numpy as np
+from src.vision.features.base import FeatureContext
+from src.vision.features._hand_geometry import HandGeometry
+
+
+def _hand(states, wrist=(0.5, 0.8)):
+    """states: [index, middle, ring, pinky]，True=伸直。"""
+    h = np.tile(np.float32([wrist[0], wrist[1], 0.0]), (21, 1))
+    for tip, mcp, straight in zip([8, 12, 16, 20], [5, 9, 13, 17], states):
+        h[mcp, 1] = 0.6 if straight else 0.5
+        h[tip, 1] = 0.2 if straight else 0.7
+    return h
+
+
+class TestHandGeometry:
+    def test_finger_states(self):
+        g = FeatureContext(None, _hand([True, True, False, False]), _hand([True] * 4), None).hand_geometry
+        assert g.present.tolist() == [True, True]
+        assert g.extended[0].tolist() == [True, True, False, False]
+        assert g.extended_count.tolist() == [2, 4]
+        assert g.palm_open.tolist() == [False, True]
+        assert g.fist.tolist() == [False, False]
+
+    def test_missing_hand_not_present(self):
+        g = FeatureContext(None, None, _hand([False] * 4), None).hand_geometry
+        assert g.present.tolist() == [False, True]
+        assert bool(g.fist[1])
+
+    def test_face_distances_nan_without_face(self):
+        g = FeatureContext(None, _hand([True] * 4), None, None).hand_geometry
+        assert np.isnan(g.tip_nose_dx).all()
+        assert not (g.tip_corner_dist < 1.0).any()
+
+    def test_ear_distance(self):
+        pose = np.zeros((33, 3), dtype=np.float32)
+        pose[7, :2] = (0.5, 0.6)   # 左耳正好在左手食指 MCP 上
+        g = FeatureContext(pose, _hand([True] * 4), None, None).hand_geometry
+        assert g.mcp_ear_dist[0, 0] == pytest.approx(0.0)
+
+    def test_computed_once_per_context(self):
+        ctx = FeatureContext(None, _hand([True] * 4), None, None)
+        assert ctx.hand_geometry is ctx.hand_geometry
+
+    def test_batched_leading_dims(self):
+        hands = np.stack([np.stack([_hand([True] * 4), _hand([False] * 4)])] * 5)
+        g = HandGeometry(hands, np.ones((5, 2), dtype=bool))
+        assert g.palm_open.shape == (5, 2)
+        assert g.palm_open[:, 0].all() and g.fist[:, 1].all()
@@ -0,0 +1,75 @@
+import pytest
+import numpy as np
+from types import SimpleNamespace
+from src.vision.holistic_runner import HolisticRunner, HolisticResult
+
+
+class _FakeLandmarker:
+    def __init__(self):
+        self.calls = []
+
+    def detect_async(self, image, timestamp_ms):
+        self.calls.append(timestamp_ms)
+
+    def close(self):
+        pass
+
+
+def _empty_result():
+    return SimpleNamespace(pose_landmarks=[], face_landmarks=[],
+                           left_hand_landmarks=[], right_hand_landmarks=[])
+
+
+@pytest.fixture
+def runner():
+    r = HolisticRunner("unused.task", running_mode="live_stream")
+    r._landmarker = _FakeLandmarker()
+    return r
+
+
+FRAME = np.zeros((8, 8, 3), dtype=np.uint8)
+
+
+class TestHolisticRunnerAsync:
+    def test_invalid_mode(self):
+        with pytest.raises(ValueError):
+            HolisticRunner("unused.task", running_mode="batch")
+
+    def test_not_initialized(self):
+        r = HolisticRunner("unused.task", running_mode="live_stream")
+        assert not r.submit(FRAME, 0, 0.0)
+        assert r.poll() is None
+
+    def test_result_carries_frame_timestamp(self, runner):
+        assert runner.submit(FRAME, 7, 12.5)
+        ts_ms = runner._landmarker.calls[-1]
+        runner._on_result(_empty_result(), None, ts_ms)
+        res = runner.poll()
+        assert isinstance(res, HolisticResult)
+        assert res.frame_id == 7
+        assert res.timestamp == 12.5
+        assert res.latency_ms >= 0.0
+        assert runner.poll() is None
+
+    def test_busy_drops_submit(self, runner):
+        assert runner.submit(FRAME, 0, 1.0)
+        assert not runner.submit(FRAME, 1, 1.033)
+        assert runner.dropped_submits == 1
+        runner._on_result(_empty_result(), None, runner._landmarker.calls[-1])
+        assert runner.submit(FRAME, 2, 1.066)
+
+    def test_timestamps_strictly_increase(self, runner):
+        for i in range(3):
+            runner.submit(FRAME, i, 5.0)
+            runner._on_result(_empty_result(), None, runner._landmarker.calls[-1])
+        calls = runner._landmarker.calls
+        assert calls == sorted(set(calls))
+
+    def test_stale_callback_ignored(self, runner):
+        runner.submit(FRAME, 0, 1.0)
+        runner._on_result(_empty_result(), None, 42)
+        assert runner.poll() is None
+
+    def test_process_rejected_in_async_mode(self, runner):
+        with pytest.raises(RuntimeError):
+            runner.process(FRAME)
@@ -0,0 +1,55 @@
+import os
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame
+import pytest
+from src.renderer.hud import Hud
+
+
+@pytest.fixture
+def screen():
+    pygame.font.init()
+    return pygame.Surface((320, 240))
+
+
+class TestHud:
+    def test_renders_only_changed_lines(self, screen):
+        hud = Hud(font_name=None, refresh_hz=0)
+        assert hud.update(["a", "b", "c"], now=0.0)
+        assert hud.renders == 3
+        assert hud.update(["a", "b2", "c"], now=0.1)
+        assert hud.renders == 4
+        # 内容完全相同：不重画叠加层
+        assert not hud.update(["a", "b2", "c"], now=0.2)
+        # 缓存命中：回到旧内容也不重新渲染
+        assert hud.update(["a", "b", "c"], now=0.3)
+        assert hud.renders == 4
+
+    def test_refresh_rate(self, screen):
+        hud = Hud(font_name=None, refresh_hz=10)
+        calls = []
+
+        def lines():
+            calls.append(1)
+            return [f"n={len(calls)}"]
+
+        for i in range(30):
+            hud.draw(screen, lines, now=i / 30)
+        # 1 秒 30 帧，10 Hz 刷新
+        assert len(calls) == 10
+        assert hud.lines == ["n=10"]
+
+    def test_draws_overlay(self, screen):
+        hud = Hud(font_name=None, color=(0, 255, 0), origin=(0, 0), refresh_hz=0)
+        screen.fill((0, 0, 0))
+        hud.draw(screen, ["#####"], now=0.0)
+        pixels = pygame.surfarray.pixels3d(screen)
+        assert pixels[:, :, 1].max() == 255
+        del pixels
+
+    def test_cache_bounded(self, screen):
+        hud = Hud(font_name=None, refresh_hz=0, cache_size=4)
+        for i in range(10):
+            hud.update([str(i)], now=i)
+        assert len(hud._cache) == 4
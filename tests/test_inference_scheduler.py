@@ -0,0 +1,87 @@
+import pytest
+import numpy as np
+from src.vision.landmarks import LandmarkFrame
+from src.vision.inference_scheduler import InferenceScheduler
+
+
+def _results(x):
+    """右手 21 个点都位于 (x, 0.5)。"""
+    frame = LandmarkFrame()
+    frame.set("right_hand", np.tile(np.float32([x, 0.5, 0.0]), (21, 1)))
+    return frame
+
+
+class _FakeRunner:
+    def __init__(self, speed=0.0):
+        self.calls = 0
+        self.speed = speed
+
+    def process(self, frame, timestamp=None, rgb_frame=None):
+        self.calls += 1
+        return _results(0.2 + self.speed * timestamp)
+
+
+def _run(scheduler, frames, fps=30, force=False):
+    out = []
+    for i in range(frames):
+        out.append(scheduler.process(None, i / fps, force=force))
+    return out
+
+
+class TestInferenceScheduler:
+    def test_still_scene_skips_inference(self):
+        runner = _FakeRunner(speed=0.0)
+        sched = InferenceScheduler(runner, max_interval=3)
+        _run(sched, 30)
+        assert sched.interval == 3
+        assert runner.calls < 15
+        assert sched.inference_ratio < 0.5
+
+    def test_fast_motion_infers_every_frame(self):
+        runner = _FakeRunner(speed=1.0)
+        sched = InferenceScheduler(runner, max_interval=3)
+        _run(sched, 30)
+        assert sched.interval == 1
+        assert runner.calls >= 28
+
+    def test_force_always_infers(self):
+        runner = _FakeRunner(speed=0.0)
+        sched = InferenceScheduler(runner, max_interval=4)
+        _run(sched, 12, force=True)
+        assert runner.calls == 12
+
+    def test_extrapolation_follows_velocity(self):
+        runner = _FakeRunner(speed=0.1)
+        sched = InferenceScheduler(runner, max_interval=2, motion_low=0.5, motion_high=5.0)
+        # 外推结果复用缓冲，逐帧读取
+        xs = [float(sched.process(None, i / 30).right_hand[8, 0]) for i in range(6)]
+        assert runner.calls < 6
+        # 前两次推理之后才有速度估计
+        for i in range(2, 6):
+            assert xs[i] == pytest.approx(0.2 + 0.1 * i / 30, abs=1e-5)
+
+    def test_absent_hand_stays_absent(self):
+        runner = _FakeRunner()
+        runner.process = lambda frame, ts=None, rgb_frame=None: LandmarkFrame()
+        sched = InferenceScheduler(runner, max_interval=3)
+        out = _run(sched, 6)
+        assert all(r.get("right_hand") is None for r in out)
+
+    def test_snapshot_survives_runner_buffer_reuse(self):
+        shared = LandmarkFrame()
+        def process(frame, ts=None, rgb_frame=None):
+            shared.set("right_hand", np.tile(np.float32([0.2, 0.5, 0.0]), (21, 1)))
+            return shared
+        runner = _FakeRunner()
+        runner.process = process
+        sched = InferenceScheduler(runner, max_interval=3)
+        sched.process(None, 0.0)
+        shared.discard("right_hand")
+        out = sched.process(None, 1 / 30)
+        assert out.get("right_hand") is not None
+
+    def test_cpu_pressure_relaxes_interval(self):
+        runner = _FakeRunner(speed=0.1)
+        sched = InferenceScheduler(runner, max_interval=3, motion_low=0.01, motion_high=5.0, frame_budget_ms=-1.0)
+        _run(sched, 10)
+        assert sched.interval > 1
@@ -0,0 +1,57 @@
+import re
+
+import numpy as np
+from src.engine.keyword_matcher import KeywordMatcher, KeywordSpotter, normalize_text
+
+
+class TestKeywordMatcher:
+    def test_overlapping_patterns(self):
+        m = KeywordMatcher(["he", "she", "his", "hers"])
+        assert sorted(m.find("ushers")) == ["he", "hers", "she"]
+
+    def test_chinese_phrases(self):
+        m = KeywordMatcher(["卧槽", "槽点", "太强了", "强"])
+        assert m.find("卧 槽 这 个 槽点 太 强 了") == ["卧槽", "槽点", "强", "太强了"]
+
+    def test_normalizes_keywords(self):
+        m = KeywordMatcher(["Good Job", "goodjob", ""])
+        assert m.keywords == ["goodjob"]
+        assert m.find("GOOD job") == ["goodjob"]
+
+    def test_matches_naive_search(self):
+        rng = np.random.default_rng(0)
+        alphabet = list("ab卧槽")
+        keywords = ["".join(rng.choice(alphabet, rng.integers(1, 4))) for _ in range(8)]
+        m = KeywordMatcher(keywords)
+        for _ in range(200):
+            text = "".join(rng.choice(alphabet, 20))
+            expected = sorted(kw for kw in m.keywords for _ in re.finditer(f"(?={re.escape(kw)})", text))
+            assert sorted(m.find(text)) == expected
+
+
+class TestKeywordSpotter:
+    def test_partial_then_final_reported_once(self):
+        sp = KeywordSpotter(KeywordMatcher(["卧槽", "nice"]))
+        assert sp.partial("我") == []
+        assert sp.partial("我 卧 槽") == ["卧槽"]
+        assert sp.partial("我 卧 槽 了") == []
+        assert sp.final("我 卧 槽 了") == []
+        # 新的一句重新计数
+        assert sp.partial("卧槽") == ["卧槽"]
+
+    def test_repeated_keyword_in_one_utterance(self):
+        sp = KeywordSpotter(KeywordMatcher(["nice"]))
+        assert sp.partial("nice") == ["nice"]
+        assert sp.partial("nice nice") == ["nice"]
+        assert sp.final("nice nice") == []
+
+    def test_revised_hypothesis(self):
+        sp = KeywordSpotter(KeywordMatcher(["卧槽"]))
+        assert sp.partial("我 卧") == []
+        assert sp.partial("我 们") == []
+        assert sp.partial("我 们 卧 槽") == ["卧槽"]
+
+    def test_final_only(self):
+        sp = KeywordSpotter(KeywordMatcher(["nice"]))
+        assert sp.final("very nice") == ["nice"]
+        assert normalize_text(" A b ") == "ab"
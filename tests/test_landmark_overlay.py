@@ -0,0 +1,94 @@
+import os
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import numpy as np
+import pygame
+from src.renderer.landmarks import LandmarkOverlay, segment_pixels
+from src.vision.landmarks import LandmarkFrame
+
+SIZE = (200, 100)
+
+
+def _points(n, xy):
+    pts = np.zeros((n, 3), dtype=np.float32)
+    pts[:, :2] = xy
+    return pts
+
+
+def _lit(screen, color):
+    rgb = pygame.surfarray.array3d(screen)
+    return set(zip(*np.nonzero((rgb == color).all(axis=2))))
+
+
+class TestSegmentPixels:
+    def test_endpoints_and_continuity(self):
+        a = np.array([[0, 0], [10, 5], [3, 3]], dtype=np.int32)
+        b = np.array([[9, 3], [10, 0], [3, 3]], dtype=np.int32)
+        px = segment_pixels(a, b)
+        assert len(px) == 10 + 6 + 1
+        assert px[0].tolist() == [0, 0] and px[9].tolist() == [9, 3]
+        assert px[10].tolist() == [10, 5] and px[15].tolist() == [10, 0]
+        # 每步最多移动一个像素
+        assert np.abs(np.diff(px[:10], axis=0)).max() == 1
+
+    def test_empty(self):
+        assert segment_pixels(np.empty((0, 2), np.int32), np.empty((0, 2), np.int32)).shape == (0, 2)
+
+
+class TestLandmarkOverlay:
+    def test_face_points(self):
+        screen = pygame.Surface(SIZE, depth=32)
+        overlay = LandmarkOverlay(SIZE, refresh_hz=0, point_radius=0)
+        face = _points(3, [[0.1, 0.1], [0.5, 0.5], [0.75, 0.75]])
+        overlay.draw(screen, {"face": face}, now=0.0)
+        assert _lit(screen, (0, 128, 255)) == {(20, 10), (100, 50), (150, 75)}
+
+    def test_lines_match_frame_object(self):
+        screen = pygame.Surface(SIZE, depth=32)
+        overlay = LandmarkOverlay(SIZE, refresh_hz=0)
+        frame = LandmarkFrame()
+        hand = _points(21, [0.5, 0.5])
+        hand[4, :2] = [0.6, 0.5]   # 拇指尖向右 20 像素
+        frame.set("left_hand", hand)
+        overlay.draw(screen, frame, now=0.0)
+        lit = _lit(screen, (255, 255, 0))
+        assert {(x, 50) for x in range(100, 121)} <= lit
+        assert overlay.pixel_count >= 21
+
+    def test_pose_width_and_selection(self):
+        screen = pygame.Surface(SIZE, depth=32)
+        overlay = LandmarkOverlay(SIZE, refresh_hz=0, pose_width=2)
+        pose = _points(33, [0.5, 0.5])
+        pose[11, :2] = [0.25, 0.2]
+        pose[12, :2] = [0.75, 0.2]
+        overlay.draw(screen, {"pose": pose}, now=0.0, selection={"pose": (11, 12)})
+        lit = _lit(screen, (0, 255, 0))
+        assert {(x, y) for x in range(50, 151) for y in (20, 21)} <= lit
+        # 只有 (11, 12) 两端都已转换，其余连线不画
+        assert all(y in (20, 21) for _, y in lit)
+
+    def test_offscreen_points_clipped(self):
+        screen = pygame.Surface(SIZE, depth=32)
+        overlay = LandmarkOverlay(SIZE, refresh_hz=0)
+        overlay.draw(screen, {"face": _points(2, [[-0.5, 0.5], [1.5, 2.0]])}, now=0.0)
+        assert overlay.pixel_count == 0
+        assert not _lit(screen, (0, 128, 255))
+
+    def test_refresh_rate_reuses_pixels(self):
+        screen = pygame.Surface(SIZE, depth=32)
+        overlay = LandmarkOverlay(SIZE, refresh_hz=10, point_radius=0)
+        overlay.draw(screen, {"face": _points(1, [0.1, 0.1])}, now=0.0)
+        overlay.draw(screen, {"face": _points(1, [0.5, 0.5])}, now=0.05)   # 未到刷新时间
+        assert overlay.renders == 1
+        assert _lit(screen, (0, 128, 255)) == {(20, 10)}
+        screen.fill((0, 0, 0))
+        overlay.draw(screen, {"face": _points(1, [0.5, 0.5])}, now=0.1)
+        assert overlay.renders == 2
+        assert _lit(screen, (0, 128, 255)) == {(100, 50)}
+
+    def test_24bit_fallback(self):
+        screen = pygame.Surface(SIZE, depth=24)
+        overlay = LandmarkOverlay(SIZE, refresh_hz=0, point_radius=0)
+        overlay.draw(screen, {"face": _points(1, [0.5, 0.5])}, now=0.0)
+        assert _lit(screen, (0, 128, 255)) == {(100, 50)}
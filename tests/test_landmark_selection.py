@@ -0,0 +1,66 @@
+import pytest
+import numpy as np
+from types import SimpleNamespace
+from src.vision.landmarks import GROUP_SIZES, LandmarkFrame, merge_selections
+from src.vision.features import FEATURE_REGISTRY
+from src.vision.features.base import BaseFeature, FeatureContext
+
+
+def _pts(n, rng):
+    return [SimpleNamespace(x=float(x), y=float(y), z=0.0) for x, y in rng.random((n, 2))]
+
+
+class TestMergeSelections:
+    def test_union_of_indices(self):
+        merged = merge_selections([{"face": (1, 13)}, {"face": (13, 61), "pose": (7,)}])
+        assert merged == {"face": (1, 13, 61), "pose": (7,)}
+
+    def test_whole_group_dominates(self):
+        merged = merge_selections([{"left_hand": (8,)}, {"left_hand": None}, {"left_hand": (4,)}])
+        assert merged == {"left_hand": None}
+
+    def test_unknown_group(self):
+        with pytest.raises(ValueError):
+            merge_selections([{"tail": None}])
+
+
+class TestSelectiveFill:
+    def test_unselected_group_skipped(self):
+        rng = np.random.default_rng(0)
+        result = SimpleNamespace(pose_landmarks=_pts(33, rng), face_landmarks=_pts(478, rng),
+                                 left_hand_landmarks=[], right_hand_landmarks=_pts(21, rng))
+        f = LandmarkFrame().fill(result, {"face": (1, 13), "right_hand": None})
+        assert not f.has_pose
+        assert f.has_face and f.has_right_hand
+        assert f.face[13, 0] == pytest.approx(result.face_landmarks[13].x)
+
+
+class TestDetectorDeclarations:
+    @pytest.mark.parametrize("name", sorted(FEATURE_REGISTRY))
+    def test_declared_groups_are_known(self, name):
+        groups = FEATURE_REGISTRY[name].landmark_groups
+        assert groups and set(groups) <= set(GROUP_SIZES)
+
+    @pytest.mark.parametrize("name", sorted(FEATURE_REGISTRY))
+    def test_undeclared_landmarks_do_not_matter(self, name):
+        """把未声明的关键点置为 NaN / 部位置空，检测结果必须不变。"""
+        cls = FEATURE_REGISTRY[name]
+        rng = np.random.default_rng(1)
+        det = cls()
+        for _ in range(300):
+            full = {g: (rng.normal(0.5, 0.1, (n, 3))).astype(np.float32) for g, n in GROUP_SIZES.items()}
+            masked = {}
+            for g, arr in full.items():
+                if g not in cls.landmark_groups:
+                    masked[g] = None
+                    continue
+                idx = cls.landmark_groups[g]
+                m = arr.copy()
+                if idx is not None:
+                    keep = np.zeros(len(m), dtype=bool)
+                    keep[list(idx)] = True
+                    m[~keep] = np.nan
+                masked[g] = m
+            ctx_full = FeatureContext(full["pose"], full["left_hand"], full["right_hand"], full["face"])
+            ctx_masked = FeatureContext(masked["pose"], masked["left_hand"], masked["right_hand"], masked["face"])
+            assert det.detect(ctx_full) == det.detect(ctx_masked)
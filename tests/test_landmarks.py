@@ -0,0 +1,71 @@
+import pytest
+import numpy as np
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+from src.vision.landmarks import LandmarkFrame, as_landmark_array
+from src.vision.features.base import FeatureContext
+
+
+def _pts(n, x=0.5):
+    return [SimpleNamespace(x=x, y=i / n, z=0.0) for i in range(n)]
+
+
+def _result(pose=0, face=0, left=0, right=0):
+    return SimpleNamespace(pose_landmarks=_pts(pose), face_landmarks=_pts(face),
+                           left_hand_landmarks=_pts(left), right_hand_landmarks=_pts(right))
+
+
+class TestLandmarkFrame:
+    def test_empty_frame(self):
+        f = LandmarkFrame()
+        assert f.is_empty
+        assert f.get("pose") is None
+
+    def test_fill_from_result(self):
+        f = LandmarkFrame().fill(_result(pose=33, face=478, right=21))
+        assert f.has_pose and f.has_face and f.has_right_hand
+        assert not f.has_left_hand
+        assert f.pose.shape == (33, 3) and f.pose.dtype == np.float32
+        assert f.right_hand[10, 1] == pytest.approx(10 / 21)
+
+    def test_fill_reuses_buffers(self):
+        f = LandmarkFrame()
+        f.fill(_result(right=21))
+        buf = f.right_hand
+        f.fill(_result(right=21))
+        assert np.shares_memory(buf, f.right_hand)
+
+    def test_refill_clears_missing_groups(self):
+        f = LandmarkFrame().fill(_result(left=21))
+        f.fill(_result(right=21))
+        assert f.get("left_hand") is None
+
+    def test_copy_is_independent(self):
+        f = LandmarkFrame().fill(_result(pose=33))
+        c = f.copy()
+        f.pose[:] = 0
+        assert c.pose[5, 1] == pytest.approx(5 / 33)
+
+    def test_slots(self):
+        with pytest.raises(AttributeError):
+            LandmarkFrame().foo = 1
+
+
+class TestFeatureContext:
+    def test_from_frame(self):
+        f = LandmarkFrame().fill(_result(face=478, left=21))
+        ctx = FeatureContext.from_frame(f)
+        assert ctx.face_landmarks.shape == (478, 3)
+        assert ctx.left_hand_landmarks is not None
+        assert ctx.pose_landmarks is None and ctx.right_hand_landmarks is None
+
+    def test_from_none(self):
+        ctx = FeatureContext.from_frame(None)
+        assert ctx.pose_landmarks is None
+
+    def test_legacy_objects_converted(self):
+        m = MagicMock()
+        m.landmark = _pts(21, x=0.3)
+        arr = as_landmark_array(m)
+        assert arr.shape == (21, 3)
+        assert arr[0, 0] == pytest.approx(0.3)
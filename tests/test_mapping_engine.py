@@ -37,3 +37,116 @@ class TestMappingEngine:
         me.load(os.path.join(FIX, "mappings.default.json"))
         priorities = [m.priority for m in me._mappings]
         assert priorities == sorted(priorities, reverse=True)
+
+    def test_required_features_priority_order(self):
+        me = MappingEngine()
+        me.load(os.path.join(FIX, "mappings.default.json"))
+        assert me.required_features[0] == "is_omg"
+        assert set(me.required_features) == {m.features[0] for m in me._mappings}
+
+    def test_match_stops_at_first_satisfied(self):
+        me = MappingEngine()
+        me.load(os.path.join(FIX, "mappings.default.json"))
+        accessed = []
+
+        class Recording(dict):
+            def get(self, k, default=None):
+                accessed.append(k)
+                return super().get(k, default)
+
+        r = me.match_vision(Recording({"is_nfb": True}))
+        assert r.id == "nfb"
+        assert accessed == ["is_omg", "is_nfb"]
+
+
+def _load(tmp_path, mappings):
+    import json
+    path = tmp_path / "mappings.json"
+    path.write_text(json.dumps({"version": 1, "mappings": mappings}), encoding="utf-8")
+    me = MappingEngine()
+    me.load(str(path))
+    return me
+
+
+def _m(mid, features, condition="all", priority=0, enabled=True):
+    return {"id": mid, "name": mid, "enabled": enabled, "priority": priority,
+            "conditions": {"type": condition, "features": features}}
+
+
+class TestCompiledMatcher:
+    MAPPINGS = [
+        _m("both", ["a", "b"], "all", priority=30),
+        _m("either", ["c", "d"], "any", priority=20),
+        _m("single", ["a"], "all", priority=10),
+        _m("off", ["e"], "all", priority=40, enabled=False),
+    ]
+
+    def test_feature_index_skips_disabled(self, tmp_path):
+        me = _load(tmp_path, self.MAPPINGS)
+        assert me.feature_index == {"a": 0, "b": 1, "c": 2, "d": 3}
+
+    def test_pack(self, tmp_path):
+        me = _load(tmp_path, self.MAPPINGS)
+        assert me.pack({"a": True, "d": True, "e": True}) == 0b1001
+
+    def test_bits_and_dict_agree(self, tmp_path):
+        import itertools
+        me = _load(tmp_path, self.MAPPINGS)
+        names = ["a", "b", "c", "d", "e"]
+        for values in itertools.product((False, True), repeat=len(names)):
+            features = dict(zip(names, values))
+            by_dict = me.match_vision(features)
+            by_bits = me.match_vision(me.pack(features))
+            assert (by_dict and by_dict.id) == (by_bits and by_bits.id), features
+
+    def test_priority(self, tmp_path):
+        me = _load(tmp_path, self.MAPPINGS)
+        assert me.match_vision({"a": True, "b": True, "c": True}).id == "both"
+        assert me.match_vision({"a": True, "c": True}).id == "either"
+        assert me.match_vision({"a": True}).id == "single"
+        assert me.match_vision({"e": True}) is None
+
+    def test_match_all_excluded_mapping_keeps_features(self, tmp_path):
+        me = _load(tmp_path, self.MAPPINGS)
+        assert me.match_vision_all({"a": True, "b": True}) == 0b001
+        # both 不在 allowed 中（如冷却中）：不返回，但仍占用特征 a，single 不满足
+        assert me.match_vision_all({"a": True, "b": True}, allowed=0b110) == 0
+        assert me.match_vision_all({"a": True}, allowed=0b110) == 0b100
+
+    def test_zero_bits_no_match(self, tmp_path):
+        me = _load(tmp_path, self.MAPPINGS)
+        assert me.match_bits(0) is None
+
+    def test_feature_evaluated_once(self, tmp_path):
+        me = _load(tmp_path, self.MAPPINGS)
+        accessed = []
+
+        class Recording(dict):
+            def get(self, k, default=None):
+                accessed.append(k)
+                return super().get(k, default)
+
+        assert me.match_vision(Recording({"a": True})).id == "single"
+        assert sorted(accessed) == ["a", "b", "c", "d"]
+
+
+class TestVoiceKeywords:
+    def _engine(self, tmp_path):
+        low = _m("low", [], priority=1)
+        low["conditions"]["voice_keywords"] = ["Good Job", "卧槽"]
+        high = _m("high", [], priority=5)
+        high["conditions"]["voice_keywords"] = ["太强了"]
+        return _load(tmp_path, [low, high])
+
+    def test_keywords_normalized(self, tmp_path):
+        me = self._engine(tmp_path)
+        # 识别器词表保留原始短语（多词关键词的空格不能去掉），匹配时归一化
+        assert sorted(me.voice_keywords) == sorted(["太强了", "good job", "卧槽"])
+        assert me.match_audio("good job").id == "low"
+        assert me.match_audio("goodjob").id == "low"
+
+    def test_transcript_matches_highest_priority(self, tmp_path):
+        me = self._engine(tmp_path)
+        assert me.match_audio("卧 槽 太 强 了").id == "high"
+        assert me.match_audio("我 卧 槽").id == "low"
+        assert me.match_audio("没有") is None
@@ -0,0 +1,97 @@
+import pytest, os, time
+import cv2
+import numpy as np
+from src.vision.replay_source import ReplaySource
+
+
+def _frame(i):
+    img = np.zeros((48, 64, 3), dtype=np.uint8)
+    img[:, :32] = i * 10
+    return img
+
+
+@pytest.fixture
+def image_dir(tmp_path):
+    for i in range(5):
+        cv2.imwrite(str(tmp_path / f"{i:04d}.png"), _frame(i))
+    return str(tmp_path)
+
+
+@pytest.fixture
+def video_path(tmp_path):
+    path = str(tmp_path / "session.avi")
+    writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*"MJPG"), 20, (64, 48))
+    for i in range(6):
+        writer.write(_frame(i))
+    writer.release()
+    return path
+
+
+class TestReplaySource:
+    def test_image_sequence_in_order(self, image_dir):
+        src = ReplaySource(image_dir, pacing="fast")
+        assert src.open()
+        assert (src.width, src.height) == (64, 48)
+        values = []
+        while True:
+            ret, frame = src.read()
+            if not ret:
+                break
+            values.append(int(frame[0, 0, 0]))
+        src.release()
+        assert values == [0, 10, 20, 30, 40]
+
+    def test_video_file(self, video_path):
+        src = ReplaySource(video_path, pacing="fast")
+        assert src.open()
+        assert src.frame_count == 6
+        assert src.fps == pytest.approx(20)
+        count = 0
+        while src.read()[0]:
+            count += 1
+        src.release()
+        assert count == 6
+
+    def test_seek(self, image_dir):
+        src = ReplaySource(image_dir, pacing="fast")
+        src.open()
+        src.seek(3)
+        ret, frame = src.read()
+        assert ret and int(frame[0, 0, 0]) == 30
+        assert src.position == 4
+
+    def test_loop_wraps_around(self, image_dir):
+        src = ReplaySource(image_dir, pacing="fast", loop=True)
+        src.open()
+        values = [int(src.read()[1][0, 0, 0]) for _ in range(7)]
+        assert values == [0, 10, 20, 30, 40, 0, 10]
+
+    def test_media_timestamp(self, image_dir):
+        src = ReplaySource(image_dir, fps=10, pacing="fast")
+        src.open()
+        src.read(); src.read()
+        assert src.frame_timestamp == pytest.approx(0.1)
+
+    def test_realtime_pacing(self, image_dir):
+        src = ReplaySource(image_dir, fps=50, pacing="realtime")
+        src.open()
+        start = time.monotonic()
+        while src.read()[0]:
+            pass
+        assert time.monotonic() - start >= 4 / 50 * 0.9
+
+    def test_flip(self, image_dir):
+        src = ReplaySource(image_dir, pacing="fast", flip=True)
+        src.open()
+        src.seek(1)
+        _, frame = src.read()
+        assert int(frame[0, 0, 0]) == 0 and int(frame[0, -1, 0]) == 10
+
+    def test_missing_path(self, tmp_path):
+        src = ReplaySource(str(tmp_path / "nope.mp4"))
+        assert not src.open()
+        assert src.read() == (False, None)
+
+    def test_invalid_pacing(self, image_dir):
+        with pytest.raises(ValueError):
+            ReplaySource(image_dir, pacing="slow")
@@ -0,0 +1,76 @@
+import json
+
+import numpy as np
+import pytest
+from src.vision.landmarks import LandmarkFrame
+from src.vision.session_recorder import SessionRecorder, SessionReader
+
+
+def _frame(seed, hands=True):
+    rng = np.random.default_rng(seed)
+    f = LandmarkFrame()
+    f.set("pose", rng.random((33, 3), dtype=np.float32))
+    if hands:
+        f.set("left_hand", rng.random((21, 3), dtype=np.float32))
+    return f
+
+
+class TestSessionRecorder:
+    def test_roundtrip(self, tmp_path):
+        path = str(tmp_path / "session")
+        frames = [_frame(i, hands=i % 2 == 0) for i in range(5)]
+        with SessionRecorder(path, features=["is_a", "is_b"]) as rec:
+            for i, f in enumerate(frames):
+                rec.write(f, frame_id=i, timestamp=i / 30, features={"is_a": i % 2 == 0, "is_b": True})
+
+        reader = SessionReader(path)
+        assert len(reader) == 5
+        assert reader.timestamps.tolist() == pytest.approx([i / 30 for i in range(5)])
+        assert reader.frame_ids.tolist() == list(range(5))
+        assert reader.feature("is_a").tolist() == [True, False, True, False, True]
+        assert reader.features[:, 1].all()
+        assert reader.has("left_hand").tolist() == [True, False, True, False, True]
+        assert not reader.has("face").any()
+        np.testing.assert_array_equal(reader.landmarks("pose")[3], frames[3].pose)
+        assert np.isnan(reader.landmarks("left_hand")[1]).all()
+
+    def test_zero_copy_views(self, tmp_path):
+        path = str(tmp_path / "session")
+        with SessionRecorder(path) as rec:
+            rec.write(_frame(0), 0, 0.0)
+        reader = SessionReader(path)
+        pose = reader.landmarks("pose")
+        assert isinstance(pose, np.memmap)
+        assert pose.shape == (1, 33, 3) and pose.dtype == np.float32
+        assert not pose.flags.writeable
+
+    def test_frame_rebuild(self, tmp_path):
+        path = str(tmp_path / "session")
+        original = _frame(7)
+        with SessionRecorder(path) as rec:
+            rec.write(original, 0, 0.0)
+            rec.write(None, 1, 0.1)
+        reader = SessionReader(path)
+        f = reader.frame(0)
+        np.testing.assert_array_equal(f.get("left_hand"), original.left_hand)
+        assert f.get("right_hand") is None
+        assert reader.frame(1, out=f).is_empty
+
+    def test_readable_without_final_meta(self, tmp_path):
+        path = str(tmp_path / "session")
+        rec = SessionRecorder(path, features=["x"])
+        rec.open()
+        for i in range(3):
+            rec.write(_frame(i), i, float(i), {"x": True})
+        for f in rec._files.values():
+            f.flush()   # 模拟崩溃：数据已落盘但 meta 帧数未更新
+        assert json.load(open(f"{path}/meta.json"))["frame_count"] == 0
+        assert len(SessionReader(path)) == 3
+        rec.close()
+
+    def test_refuses_overwrite(self, tmp_path):
+        path = str(tmp_path / "session")
+        with SessionRecorder(path) as rec:
+            rec.write(None, 0, 0.0)
+        with pytest.raises(FileExistsError):
+            SessionRecorder(path).open()
@@ -0,0 +1,114 @@
+import time
+import wave
+
+import numpy as np
+import pytest
+from src.audio.sfx import NullOutput, SfxPlayer, SoundBank, load_wav
+
+
+def _write_wav(path, samples, rate=22050, channels=1):
+    data = np.asarray(samples, dtype=np.int16).reshape(-1, channels)
+    with wave.open(str(path), "wb") as w:
+        w.setnchannels(channels)
+        w.setsampwidth(2)
+        w.setframerate(rate)
+        w.writeframes(data.tobytes())
+    return str(path)
+
+
+def _bank(*sounds, budget=1 << 20):
+    bank = SoundBank(sample_rate=8000, channels=2, budget_bytes=budget)
+    for key, value, n in sounds:
+        bank.add(key, np.full((n, 2), value, dtype=np.float32))
+    return bank
+
+
+class TestLoadWav:
+    def test_resample_and_upmix(self, tmp_path):
+        path = _write_wav(tmp_path / "a.wav", np.full(22050, 16384), rate=22050)
+        data = load_wav(path, 44100, 2)
+        assert data.shape == (44100, 2) and data.dtype == np.float32
+        assert data == pytest.approx(0.5)
+
+    def test_downmix(self, tmp_path):
+        stereo = np.stack([np.full(100, 8192), np.full(100, -8192)], axis=1)
+        path = _write_wav(tmp_path / "s.wav", stereo, rate=8000, channels=2)
+        assert load_wav(path, 8000, 1) == pytest.approx(0.0)
+
+
+class TestSoundBank:
+    def test_budget(self, tmp_path):
+        path = _write_wav(tmp_path / "a.wav", np.zeros(1000), rate=8000)
+        bank = SoundBank(sample_rate=8000, channels=2, budget_bytes=12000)
+        assert bank.load_all([("a", path), ("b", path)]) == 1
+        assert bank.keys == ["a"] and bank.used_bytes == 8000
+
+    def test_missing_file(self, tmp_path):
+        bank = SoundBank()
+        assert not bank.load("x", str(tmp_path / "missing.wav"))
+        assert "x" not in bank
+
+
+class TestSfxPlayer:
+    def test_mixes_overlapping_effects(self):
+        player = SfxPlayer(_bank(("a", 0.25, 300), ("b", 0.5, 100)), master_volume=1.0, block_size=128)
+        assert player.play("a") and player.play("b", volume=0.5)
+        assert not player.play("missing")
+        block = player.mix_block()
+        assert block[0] == pytest.approx(0.5) and block[100] == pytest.approx(0.25)
+        assert player.active_voices == 1
+        player.mix_block()
+        block = player.mix_block()
+        # 300 样本的音效在第 3 块中间结束
+        assert block[43] == pytest.approx(0.25) and block[44] == pytest.approx(0.0)
+        assert player.active_voices == 0
+
+    def test_master_volume_and_clip(self):
+        player = SfxPlayer(_bank(("a", 0.8, 64)), master_volume=0.5, block_size=64)
+        player.play("a")
+        assert player.mix_block()[0] == pytest.approx(0.4)
+        player.master_volume = 1.0
+        for _ in range(3):
+            player.play("a")
+        assert player.mix_block().max() == pytest.approx(1.0)
+
+    def test_volume_and_clip_on_final_block(self):
+        # 两个音效在第 2 块中间同时结束：最后一块也要乘主音量并限幅
+        player = SfxPlayer(_bank(("a", 0.9, 600)), master_volume=0.5, block_size=512)
+        player.play("a")
+        player.play("a")
+        player.mix_block()
+        block = player.mix_block()
+        assert player.active_voices == 0
+        assert block[0] == pytest.approx(0.9)
+        assert block[88] == pytest.approx(0.0)
+        assert np.abs(block).max() <= 1.0
+        player.master_volume = 1.0
+        player.play("a")
+        player.play("a")
+        player.mix_block()
+        assert player.mix_block().max() == pytest.approx(1.0)
+
+    def test_max_voices_and_stop_all(self):
+        player = SfxPlayer(_bank(("a", 0.1, 1000)), master_volume=1.0, block_size=64, max_voices=2)
+        for _ in range(4):
+            player.play("a")
+        assert player.mix_block()[0] == pytest.approx(0.2)
+        player.stop_all()
+        assert not player.mix_block().any()
+
+    def test_starts_within_one_buffer(self):
+        output = NullOutput(8000, 2, realtime=True)
+        player = SfxPlayer(_bank(("a", 0.5, 4000)), output=output, master_volume=1.0, block_size=256)
+        assert player.start()
+        time.sleep(0.05)
+        before = output.blocks_written
+        player.play("a")
+        deadline = time.monotonic() + 1.0
+        while output.blocks_written < before + 2 and time.monotonic() < deadline:
+            time.sleep(0.005)
+        player.stop()
+        written = output.blocks[-(output.blocks_written - before):]
+        first = next(i for i, b in enumerate(written) if b.any())
+        assert first <= 1
+        assert player.start_latency_ms <= 2 * 256 / 8000 * 1000
@@ -1,69 +1,254 @@
 import pytest, time, os
 from src.engine.state_machine import StateMachine, EngineState
-from src.engine.signals import VisionSignal
+from src.engine.signals import VisionSignal, AudioSignal
 from src.engine.mapping_engine import MappingEngine
+from src.engine.clock import VirtualClock
 
 FIX = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "config")
 
+FPS = 30
+DEBOUNCE_FRAMES = 9   # 默认映射 debounce_ms=250：30 FPS 下第 9 帧（8/30 ≈ 267ms）确认
+
+
+@pytest.fixture
+def clock():
+    return VirtualClock(100.0)
+
+
 @pytest.fixture
-def sm():
+def sm(clock):
     me = MappingEngine()
     me.load(os.path.join(FIX, "mappings.default.json"), os.path.join(FIX, "mappings.user.json"))
-    return StateMachine(me)
+    return StateMachine(me, clock=clock)
+
+
+def _donk(sm, clock, frames, start=0):
+    """按 30 FPS 连续送入 is_donk 帧，返回最后一帧的结果。"""
+    result = None
+    for i in range(start, start + frames):
+        result = sm.update(vision_signal=VisionSignal(
+            features={"is_donk": True}, frame_id=i, timestamp=clock.now()))
+        clock.advance(1 / FPS)
+    return result
 
 
 class TestStateMachine:
     def test_initial_state_idle(self, sm):
         assert sm.state == EngineState.IDLE
 
-    def test_idle_to_detecting(self, sm):
-        sm.update(vision_signal=VisionSignal(
-            features={"is_donk": True},
-            frame_id=0, timestamp=time.time()))
+    def test_idle_to_detecting(self, sm, clock):
+        _donk(sm, clock, 1)
         assert sm.state == EngineState.DETECTING
 
-    def test_detecting_to_idle_on_loss(self, sm):
-        sm.update(vision_signal=VisionSignal(
-            features={"is_donk": True},
-            frame_id=0, timestamp=time.time()))
+    def test_detecting_to_idle_on_loss(self, sm, clock):
+        _donk(sm, clock, 1)
         assert sm.state == EngineState.DETECTING
         sm.update()
         assert sm.state == EngineState.IDLE
 
-    def test_detecting_to_triggered_after_debounce(self, sm):
-        result = None
-        for i in range(8):
-            result = sm.update(vision_signal=VisionSignal(
-                features={"is_donk": True},
-                frame_id=i, timestamp=time.time()))
+    def test_detecting_to_triggered_after_debounce(self, sm, clock):
+        assert _donk(sm, clock, DEBOUNCE_FRAMES - 1) is None
+        result = _donk(sm, clock, 1, start=DEBOUNCE_FRAMES - 1)
         assert result is not None
         assert result.mapping_id == "donk"
         assert sm.state == EngineState.TRIGGERED
 
-    def test_triggered_to_cooldown(self, sm):
-        for i in range(8):
-            sm.update(vision_signal=VisionSignal(
-                features={"is_donk": True},
-                frame_id=i, timestamp=time.time()))
+    def test_debounce_window_independent_of_frame_rate(self, clock):
+        me = MappingEngine()
+        me.load(os.path.join(FIX, "mappings.default.json"))
+        for fps in (15, 30, 60):
+            sm = StateMachine(me, clock=clock)
+            start = clock.now()
+            i = 0
+            while sm.update(vision_signal=VisionSignal(
+                    features={"is_donk": True}, frame_id=i, timestamp=clock.now())) is None:
+                clock.advance(1 / fps)
+                i += 1
+            assert clock.now() - start == pytest.approx(0.25, abs=1 / fps)
+            clock.advance(10)
+
+    def test_triggered_to_cooldown(self, sm, clock):
+        _donk(sm, clock, DEBOUNCE_FRAMES)
         sm.update()
         assert sm.state == EngineState.COOLDOWN
 
-    def test_cooldown_blocks_retrigger(self, sm):
-        for i in range(8):
-            sm.update(vision_signal=VisionSignal(
-                features={"is_donk": True},
-                frame_id=i, timestamp=time.time()))
+    def test_cooldown_blocks_retrigger(self, sm, clock):
+        _donk(sm, clock, DEBOUNCE_FRAMES)
         sm.update()  # -> COOLDOWN
-        r = sm.update(vision_signal=VisionSignal(
-            features={"is_donk": True},
-            frame_id=100, timestamp=time.time()))
+        r = _donk(sm, clock, 1, start=100)
         assert r is None
         assert sm.state == EngineState.COOLDOWN
 
-    def test_debounce_progress(self, sm):
+    def test_debounce_progress(self, sm, clock):
+        assert sm.debounce_progress == 0.0
+        _donk(sm, clock, 4)
+        assert sm.debounce_progress == pytest.approx((3 / FPS) / 0.25)
+
+
+def _engine(tmp_path, mappings):
+    import json
+    path = tmp_path / "mappings.json"
+    path.write_text(json.dumps({"version": 1, "mappings": mappings}), encoding="utf-8")
+    me = MappingEngine()
+    me.load(str(path))
+    return me
+
+
+def _m(mid, features, priority=0, debounce_frames=8, cooldown_ms=3000):
+    return {"id": mid, "name": mid, "priority": priority,
+            "conditions": {"type": "all", "features": features},
+            "debounce_frames": debounce_frames, "cooldown_ms": cooldown_ms}
+
+
+def _feed(sm, features, n):
+    fired = []
+    for i in range(n):
+        fired += [e.mapping_id for e in sm.update_all(
+            vision_signal=VisionSignal(features=features, frame_id=i, timestamp=time.time()))]
+    return fired
+
+
+class TestPerMappingStateMachines:
+    def test_per_mapping_debounce(self, tmp_path):
+        sm = StateMachine(_engine(tmp_path, [_m("slow", ["a"], priority=10, debounce_frames=6),
+                                             _m("fast", ["b"], priority=5, debounce_frames=2)]))
+        assert _feed(sm, {"a": True, "b": True}, 2) == ["fast"]
+        assert sm.mapping_state("fast") == EngineState.TRIGGERED
+        assert sm.mapping_state("slow") == EngineState.DETECTING
+        assert _feed(sm, {"a": True, "b": True}, 4) == ["slow"]
+
+    def test_concurrent_active(self, tmp_path):
+        sm = StateMachine(_engine(tmp_path, [_m("x", ["a"], priority=10, debounce_frames=1),
+                                             _m("y", ["b"], priority=5, debounce_frames=1)]))
+        assert _feed(sm, {"a": True, "b": True}, 1) == ["x", "y"]
+        assert [m.id for m in sm.active_mappings] == ["x", "y"]
+
+    def test_low_priority_does_not_starve_high(self, tmp_path):
+        sm = StateMachine(_engine(tmp_path, [_m("high", ["a"], priority=10, debounce_frames=3),
+                                             _m("low", ["b"], priority=5, debounce_frames=3)]))
+        _feed(sm, {"b": True}, 2)
+        # 低优先级映射的进度不会被高优先级信号打断，反之亦然
+        assert _feed(sm, {"a": True, "b": True}, 1) == ["low"]
+        assert _feed(sm, {"a": True}, 2) == ["high"]
+
+    def test_conflicting_mappings_priority_wins(self, tmp_path):
+        sm = StateMachine(_engine(tmp_path, [_m("combo", ["a", "b"], priority=10, debounce_frames=2),
+                                             _m("single", ["a"], priority=5, debounce_frames=2)]))
+        assert _feed(sm, {"a": True, "b": True}, 2) == ["combo"]
+        assert sm.mapping_state("single") == EngineState.IDLE
+        # combo 冷却期间仍占用特征 a，single 不会因同一手势触发
+        assert _feed(sm, {"a": True, "b": True}, 6) == []
+        assert sm.mapping_state("combo") == EngineState.COOLDOWN
+        assert sm.mapping_state("single") == EngineState.IDLE
+
+    def test_per_mapping_cooldown(self, tmp_path):
+        sm = StateMachine(_engine(tmp_path, [_m("short", ["a"], debounce_frames=1, cooldown_ms=0),
+                                             _m("long", ["b"], debounce_frames=1, cooldown_ms=60000)]))
+        assert _feed(sm, {"a": True, "b": True}, 1) == ["short", "long"]
+        assert _feed(sm, {"a": True, "b": True}, 1) == ["short"]
+        assert sm.mapping_state("long") == EngineState.COOLDOWN
+
+
+    def test_voice_keyword_fires_without_debounce(self, tmp_path):
+        m = _m("wow", [], debounce_frames=8)
+        m["conditions"]["voice_keywords"] = ["卧槽"]
+        me = _engine(tmp_path, [m, _m("x", ["a"], debounce_frames=8)])
+        assert me.voice_keywords == ["卧槽"]
+        sm = StateMachine(me)
+        event = sm.update(audio_signal=AudioSignal(keyword="卧槽", confidence=0.9, timestamp=time.time()))
+        assert event is not None and event.mapping_id == "wow"
+        # 冷却中的关键词不再触发
+        assert sm.update(audio_signal=AudioSignal(keyword="卧槽", confidence=0.9, timestamp=time.time())) is None
+        assert sm.mapping_state("wow") == EngineState.COOLDOWN
+
+
+class TestVirtualClock:
+    def test_debounce_ms_uses_signal_timestamps(self, tmp_path):
+        m = _m("x", ["a"], debounce_frames=100)
+        m["debounce_ms"] = 250
+        sm = StateMachine(_engine(tmp_path, [m]))
+        fired_at = None
+        for i in range(30):
+            t = i / 30
+            if sm.update(vision_signal=VisionSignal(features={"a": True}, frame_id=i, timestamp=t)):
+                fired_at = t
+                break
+        assert fired_at == pytest.approx(0.25, abs=1 / 30)
+
+    def test_cooldown_follows_virtual_clock(self, tmp_path):
+        from src.engine.clock import VirtualClock
+        clock = VirtualClock()
+        sm = StateMachine(_engine(tmp_path, [_m("x", ["a"], debounce_frames=1, cooldown_ms=1000)]), clock=clock)
+        assert sm.update(vision_signal=VisionSignal(features={"a": True}, frame_id=0, timestamp=clock.now()))
+        clock.advance(0.5)
+        sm.update()
+        assert sm.state == EngineState.COOLDOWN
+        clock.advance(0.5)
+        sm.update()
+        assert sm.state == EngineState.IDLE
+
+    def test_replay_faster_than_real_time(self, tmp_path):
+        from src.engine.clock import VirtualClock
+        clock = VirtualClock()
+        sm = StateMachine(_engine(tmp_path, [_m("x", ["a"], debounce_frames=8, cooldown_ms=3000)]), clock=clock)
+        start = time.perf_counter()
+        triggers = 0
+        for i in range(30 * 60 * 10):   # 10 分钟 @ 30 FPS，手势一直保持
+            clock.advance(1 / 30)
+            if sm.update(vision_signal=VisionSignal(features={"a": True}, frame_id=i, timestamp=clock.now())):
+                triggers += 1
+        assert time.perf_counter() - start < 60
+        # 每轮：8 帧去抖动 + 3 秒冷却
+        assert triggers == pytest.approx(600 / (3 + 8 / 30), abs=2)
+
+
+class TestRepeatedVisionSignal:
+    def test_repeated_frame_does_not_advance_debounce(self, tmp_path):
+        # 异步推理：显示帧率高于推理帧率，同一推理结果被重复送入
+        sm = StateMachine(_engine(tmp_path, [_m("x", ["a"], debounce_frames=3)]))
+        fired = []
+        for frame_id in range(3):
+            signal = VisionSignal(features={"a": True}, frame_id=frame_id, timestamp=10.0 + frame_id)
+            for _ in range(4):
+                fired += sm.update_all(vision_signal=signal)
+            if frame_id < 2:
+                assert not fired
+                assert sm.mapping_state("x") == EngineState.DETECTING
+        assert [e.mapping_id for e in fired] == ["x"]
         assert sm.debounce_progress == 0.0
-        for i in range(4):
-            sm.update(vision_signal=VisionSignal(
-                features={"is_donk": True},
-                frame_id=i, timestamp=time.time()))
-        assert sm.debounce_progress == 4 / 8
+
+    def test_repeated_frame_lets_cooldown_expire(self, tmp_path):
+        from src.engine.clock import VirtualClock
+        clock = VirtualClock(0.0)
+        sm = StateMachine(_engine(tmp_path, [_m("x", ["a"], debounce_frames=1, cooldown_ms=1000)]), clock=clock)
+        signal = VisionSignal(features={"a": True}, frame_id=0, timestamp=0.0)
+        assert sm.update(vision_signal=signal)
+        clock.advance(1.5)
+        sm.update(vision_signal=signal)   # 推理未更新：时间按时钟推进
+        assert sm.state == EngineState.IDLE
+
+    def test_mixed_stale_and_fresh_time_never_goes_back(self, tmp_path):
+        from src.engine.clock import VirtualClock
+        clock = VirtualClock(0.0)
+        sm = StateMachine(_engine(tmp_path, [_m("x", ["a"], debounce_frames=1, cooldown_ms=1000)]), clock=clock)
+        first = VisionSignal(features={"a": True}, frame_id=0, timestamp=0.0)
+        assert sm.update(vision_signal=first)
+        clock.set(1.2)
+        sm.update(vision_signal=first)    # 重复信号按时钟计时（1.2），冷却到期
+        assert sm.state == EngineState.IDLE
+        # 新推理结果的时间戳（1.1）早于上一轮：按 1.2 计，冷却截止 2.2
+        event = sm.update(vision_signal=VisionSignal(features={"a": True}, frame_id=1, timestamp=1.1))
+        assert event.timestamp == pytest.approx(1.2)
+        clock.set(2.15)
+        second = VisionSignal(features={"a": True}, frame_id=2, timestamp=2.15)
+        assert sm.update(vision_signal=second) is None
+        assert sm.mapping_state("x") == EngineState.COOLDOWN
+
+
+def test_trigger_event_carries_detection_start(tmp_path):
+    sm = StateMachine(_engine(tmp_path, [_m("x", ["a"], debounce_frames=3)]))
+    event = None
+    for i in range(3):
+        event = sm.update(vision_signal=VisionSignal(features={"a": True}, frame_id=i, timestamp=10.0 + i))
+    assert event.timestamp == 12.0
+    assert event.detected_at == 10.0
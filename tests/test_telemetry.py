@@ -0,0 +1,90 @@
+import json
+import math
+import os
+
+import pytest
+from src.telemetry.histogram import LatencyHistogram
+from src.telemetry.tracer import FrameTracer
+from src.telemetry.stats_file import StatsFile
+
+FIX = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "config")
+
+
+class FakeTimer:
+    def __init__(self):
+        self.t = 0.0
+
+    def __call__(self):
+        return self.t
+
+
+class TestLatencyHistogram:
+    def test_empty_is_nan(self):
+        assert all(math.isnan(v) for v in LatencyHistogram().percentiles())
+
+    def test_percentiles(self):
+        h = LatencyHistogram(window=1000)
+        for i in range(1, 101):
+            h.record(float(i))
+        p50, p95, p99 = h.percentiles()
+        assert p50 == pytest.approx(50.5)
+        assert p95 == pytest.approx(95.05)
+        assert p99 == pytest.approx(99.01)
+
+    def test_rolling_window(self):
+        h = LatencyHistogram(window=10)
+        for _ in range(10):
+            h.record(1000.0)
+        for _ in range(10):
+            h.record(1.0)
+        assert h.count == 20
+        assert h.summary()["max"] == 1.0
+
+
+class TestFrameTracer:
+    def test_stage_marks(self):
+        timer = FakeTimer()
+        tracer = FrameTracer(timer=timer)
+        for _ in range(3):
+            tracer.begin_frame()
+            timer.t += 0.005
+            tracer.mark("capture")
+            timer.t += 0.020
+            tracer.mark("inference")
+            tracer.end_frame()
+        assert tracer.names == ["capture", "inference", "frame"]
+        assert tracer.percentiles("capture")[0] == pytest.approx(5.0)
+        assert tracer.percentiles("inference")[2] == pytest.approx(20.0)
+        assert tracer.percentiles("frame")[1] == pytest.approx(25.0)
+
+    def test_disabled_records_nothing(self):
+        tracer = FrameTracer(enabled=False)
+        tracer.begin_frame()
+        tracer.mark("capture")
+        tracer.record("gesture_to_meme", 100.0)
+        tracer.end_frame()
+        assert tracer.names == []
+
+    def test_detector_timing(self):
+        from src.vision.feature_extractor import FeatureExtractor
+        fe = FeatureExtractor(os.path.join(FIX, "features.json"))
+        tracer = FrameTracer()
+        fe.set_tracer(tracer)
+        fv = fe.extract(None, 0, 0.0)
+        fv.features["is_donk"]
+        fv.features["is_donk"]   # 缓存命中不重复计时
+        assert tracer.histogram("detector.is_donk").count == 1
+        assert tracer.histogram("detector.is_omg") is None
+
+
+class TestStatsFile:
+    def test_flush_interval(self, tmp_path):
+        path = tmp_path / "sub" / "latency.json"
+        tracer = FrameTracer()
+        tracer.record("render", 4.0)
+        stats = StatsFile(str(path), interval_s=5.0)
+        assert not stats.maybe_flush(tracer, now=stats._last_flush + 1)
+        assert stats.maybe_flush(tracer, now=stats._last_flush + 5)
+        data = json.loads(path.read_text(encoding="utf-8"))
+        assert data["latency_ms"]["render"]["p50"] == 4.0
+        assert data["latency_ms"]["render"]["count"] == 1
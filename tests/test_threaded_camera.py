@@ -0,0 +1,133 @@
+import pytest, time
+import numpy as np
+from src.vision import threaded_camera
+from src.vision.threaded_camera import ThreadedCamera
+
+
+class _FakeCapture:
+    """按序号生成帧的假驱动：第 i 帧左半为 i，右半为 255。"""
+    def __init__(self, index, max_frames=1000, interval_s=0.002):
+        self._i = 0
+        self._max = max_frames
+        self._interval = interval_s
+        self.released = False
+        self.read_after_release = False
+
+    def isOpened(self):
+        return True
+
+    def set(self, prop, value):
+        return True
+
+    def read(self, image=None):
+        if self._i >= self._max:
+            return False, None
+        time.sleep(self._interval)
+        self.read_after_release |= self.released
+        self._i += 1
+        if image is None:
+            image = np.empty((4, 8, 3), dtype=np.uint8)
+        image[:, :4] = self._i % 255
+        image[:, 4:] = 255
+        return True, image
+
+    def release(self):
+        self.released = True
+
+
+@pytest.fixture
+def fake_cap(monkeypatch):
+    caps = []
+
+    def factory(**kwargs):
+        def create(index):
+            caps.append(_FakeCapture(index, **kwargs))
+            return caps[-1]
+        monkeypatch.setattr(threaded_camera.cv2, "VideoCapture", create)
+        return caps
+    return factory
+
+
+class TestThreadedCamera:
+    def test_read_returns_flipped_frame(self, fake_cap):
+        fake_cap()
+        cam = ThreadedCamera()
+        assert cam.open()
+        ret, frame = cam.read()
+        cam.release()
+        assert ret
+        assert frame.shape == (4, 8, 3)
+        assert (frame[:, :4] == 255).all()  # 翻转后右半到了左边
+
+    def test_frames_are_fresh(self, fake_cap):
+        fake_cap()
+        cam = ThreadedCamera()
+        cam.open()
+        _, a = cam.read()
+        a_val = int(a[0, 7, 0])
+        _, b = cam.read()
+        cam.release()
+        assert int(b[0, 7, 0]) != a_val
+
+    def test_slow_consumer_drops_stale_frames(self, fake_cap):
+        fake_cap()
+        cam = ThreadedCamera()
+        cam.open()
+        cam.read()
+        time.sleep(0.05)
+        cam.read()
+        stats = cam.stats
+        cam.release()
+        assert stats.dropped > 0
+        assert stats.consumed == 2
+        assert stats.captured >= stats.consumed + stats.dropped
+
+    def test_frame_age_reported(self, fake_cap):
+        fake_cap()
+        cam = ThreadedCamera()
+        cam.open()
+        cam.read()
+        time.sleep(0.01)
+        cam.read()
+        cam.release()
+        assert cam.stats.last_age_ms >= 0.0
+
+    def test_capture_failure_returns_false(self, fake_cap):
+        fake_cap(max_frames=1)
+        cam = ThreadedCamera(read_timeout_s=0.5)
+        cam.open()
+        assert cam.read()[0]
+        assert cam.read() == (False, None)
+        cam.release()
+
+    def test_read_after_release(self, fake_cap):
+        fake_cap()
+        cam = ThreadedCamera()
+        cam.open()
+        cam.release()
+        assert not cam.is_open
+        assert cam.read() == (False, None)
+
+    def test_release_deferred_while_read_blocks(self, fake_cap):
+        caps = fake_cap(interval_s=0.3)
+        cam = ThreadedCamera(release_timeout_s=0.05)
+        cam.open()
+        time.sleep(0.05)            # 采集线程阻塞在 read() 中
+        cam.release()
+        assert not cam.is_open
+        assert not caps[0].released
+        assert not cam.open()       # 旧线程仍持有驱动，不能重新打开
+        deadline = time.monotonic() + 2.0
+        while not caps[0].released and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert caps[0].released
+        assert not caps[0].read_after_release
+        assert cam.open()
+        cam.release()
+
+    def test_release_after_thread_exit(self, fake_cap):
+        caps = fake_cap()
+        cam = ThreadedCamera()
+        cam.open()
+        cam.release()
+        assert caps[0].released
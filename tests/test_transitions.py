@@ -0,0 +1,76 @@
+import os
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame
+import pytest
+from src.renderer.transitions import MemeTransitions
+
+
+def _asset(color=(255, 0, 0), size=(40, 20)):
+    surf = pygame.Surface(size, pygame.SRCALPHA)
+    surf.fill((*color, 255))
+    return surf
+
+
+class TestMemeTransitions:
+    def test_time_driven_fade(self):
+        tr = MemeTransitions(duration_ms=200, easing="linear", steps=100)
+        tr.add_asset("a", _asset())
+        tr.show("a", 1.0)
+        assert tr.alpha("a", 1.0) == 0
+        assert tr.alpha("a", 1.1) == pytest.approx(128, abs=2)
+        assert tr.alpha("a", 1.2) == 255
+        tr.hide("a", 2.0)
+        assert tr.alpha("a", 2.05) == pytest.approx(191, abs=2)
+        assert not tr.visible("a", 2.2)
+
+    def test_reverse_midway(self):
+        tr = MemeTransitions(duration_ms=200, easing="linear", steps=100)
+        tr.add_asset("a", _asset())
+        tr.show("a", 0.0)
+        tr.hide("a", 0.1)          # 淡入一半时开始淡出
+        assert tr.level("a", 0.1) == pytest.approx(0.5)
+        tr.show("a", 0.15)
+        assert tr.level("a", 0.15) == pytest.approx(0.25)
+        assert tr.level("a", 0.3) == pytest.approx(1.0)
+
+    def test_sync_and_cleanup(self):
+        tr = MemeTransitions(duration_ms=100)
+        tr.add_asset("a", _asset())
+        tr.add_asset("b", _asset())
+        screen = pygame.Surface((100, 100))
+        tr.sync(["a", "b", "no-image"], 0.0)
+        assert sorted(tr.active) == ["a", "b"]
+        tr.sync(["a"], 0.5)
+        tr.draw(screen, (50, 50), 0.7)
+        assert tr.active == ["a"]
+
+    def test_draw_uses_cached_surfaces(self, monkeypatch):
+        tr = MemeTransitions(duration_ms=100, pop_scale=0.5, pop_steps=4)
+        asset = _asset(size=(40, 40))
+        tr.add_asset("a", asset)
+        frames = [f for f, _ in tr._frames["a"]]
+        assert len(frames) == 5 and frames[-1] is asset
+        assert frames[0].get_size() == (20, 20)
+        tr.show("a", 0.0)
+        screen = pygame.Surface((100, 100))
+        # 绘制期间不再缩放或拷贝素材
+        monkeypatch.setattr(pygame.transform, "smoothscale", None)
+        for i in range(12):
+            tr.draw(screen, (50, 50), i * 0.01)
+        assert screen.get_at((50, 50))[:3] == (255, 0, 0)
+        assert screen.get_at((25, 25))[:3] == (0, 0, 0)
+
+    def test_draw_order(self):
+        tr = MemeTransitions(duration_ms=0)
+        tr.add_asset("low", _asset((255, 0, 0)))
+        tr.add_asset("high", _asset((0, 0, 255)))
+        tr.sync(["low", "high"], 0.0)
+        screen = pygame.Surface((100, 100))
+        tr.draw(screen, (50, 50), 0.0, order={"low": 1, "high": 5}.get)
+        assert screen.get_at((50, 50))[:3] == (0, 0, 255)
+
+    def test_unknown_easing(self):
+        with pytest.raises(ValueError):
+            MemeTransitions(easing="bounce")
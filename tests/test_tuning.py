@@ -0,0 +1,149 @@
+import json
+import os
+
+import numpy as np
+import pytest
+from src.engine.mapping_engine import MappingEngine
+from src.engine.signals import VisionSignal
+from src.engine.state_machine import StateMachine
+from src.tuning.__main__ import main as tuning_main
+from src.tuning.sweep import (
+    grid_settings, parse_param_spec, random_settings, run_sweep, simulate_triggers,
+)
+from src.vision.landmarks import LandmarkFrame
+from src.vision.session_recorder import SessionRecorder
+
+GESTURES = [(5.0, 8.0), (12.0, 14.0)]
+DISTRACTOR = (16.0, 17.0)
+
+
+def _heart_session(path, fps=30, seconds=20):
+    """双手指尖距离：手势区间内 0.05，干扰区间 0.1，其余 0.2。"""
+    frame = LandmarkFrame()
+    with SessionRecorder(str(path)) as rec:
+        for i in range(fps * seconds):
+            t = i / fps
+            d = 0.2
+            if any(a <= t < b for a, b in GESTURES):
+                d = 0.05
+            elif DISTRACTOR[0] <= t < DISTRACTOR[1]:
+                d = 0.1
+            frame.set("left_hand", np.tile(np.float32([0.4, 0.5, 0.0]), (21, 1)))
+            frame.set("right_hand", np.tile(np.float32([0.4 + d, 0.5, 0.0]), (21, 1)))
+            rec.write(frame, i, t)
+    (path / "labels.json").write_text(json.dumps({"is_heart": [list(g) for g in GESTURES]}))
+    return str(path)
+
+
+class TestParamSpace:
+    def test_parse_list(self):
+        assert parse_param_spec("a=0.1,0.2") == ("a", [0.1, 0.2])
+
+    def test_parse_range_inclusive(self):
+        name, values = parse_param_spec("ear_distance=0.08:0.12:0.01")
+        assert name == "ear_distance"
+        assert values == pytest.approx([0.08, 0.09, 0.10, 0.11, 0.12])
+
+    def test_parse_invalid(self):
+        with pytest.raises(ValueError):
+            parse_param_spec("novalue")
+
+    def test_grid_and_random(self):
+        space = {"a": [1.0, 2.0], "b": [0.1, 0.2, 0.3]}
+        assert len(grid_settings(space)) == 6
+        rand = random_settings(space, 50, seed=1)
+        assert len(rand) == 50
+        assert all(1.0 <= s["a"] <= 2.0 and 0.1 <= s["b"] <= 0.3 for s in rand)
+
+
+class TestSimulateTriggers:
+    @pytest.mark.parametrize("debounce,cooldown_ms", [(1, 0), (3, 100), (8, 3000)])
+    def test_matches_state_machine(self, tmp_path, debounce, cooldown_ms):
+        path = tmp_path / "m.json"
+        path.write_text(json.dumps({"mappings": [{
+            "id": "x", "conditions": {"type": "all", "features": ["a"]},
+            "debounce_frames": debounce, "cooldown_ms": cooldown_ms}]}))
+        me = MappingEngine()
+        me.load(str(path))
+        sm = StateMachine(me)
+
+        rng = np.random.default_rng(debounce)
+        active = np.repeat(rng.random(400) < 0.6, rng.integers(1, 12, 400))
+        timestamps = np.arange(len(active)) / 30
+        expected = [i for i, (a, t) in enumerate(zip(active, timestamps))
+                    if sm.update(vision_signal=VisionSignal({"a": bool(a)}, i, float(t)))]
+        assert simulate_triggers(active, timestamps, debounce, cooldown_ms / 1000).tolist() == expected
+
+    @pytest.mark.parametrize("debounce_ms,cooldown_ms", [(0, 0), (100, 0), (250, 3000)])
+    def test_time_debounce_matches_state_machine(self, tmp_path, debounce_ms, cooldown_ms):
+        path = tmp_path / "m.json"
+        path.write_text(json.dumps({"mappings": [{
+            "id": "x", "conditions": {"type": "all", "features": ["a"]},
+            "debounce_ms": debounce_ms, "cooldown_ms": cooldown_ms}]}))
+        me = MappingEngine()
+        me.load(str(path))
+        sm = StateMachine(me)
+
+        rng = np.random.default_rng(debounce_ms)
+        active = np.repeat(rng.random(400) < 0.6, rng.integers(1, 12, 400))
+        # 帧间隔不均匀（15~60 FPS）：按时间去抖动与帧数无关
+        timestamps = np.cumsum(rng.uniform(1 / 60, 1 / 15, len(active)))
+        expected = [i for i, (a, t) in enumerate(zip(active, timestamps))
+                    if sm.update(vision_signal=VisionSignal({"a": bool(a)}, i, float(t)))]
+        assert expected
+        assert simulate_triggers(active, timestamps, cooldown_s=cooldown_ms / 1000,
+                                 debounce_s=debounce_ms / 1000).tolist() == expected
+
+
+class TestSweep:
+    def test_precision_recall_latency(self, tmp_path):
+        session = _heart_session(tmp_path / "s1")
+        settings = [{"distance_threshold": v} for v in (0.03, 0.06, 0.12)]
+        strict, good, loose = run_sweep([session], "is_heart", "hand_heart", settings,
+                                        workers=1, debounce_frames=8, cooldown_ms=3000)
+        assert strict.triggers == 0 and strict.recall == 0.0
+        assert good.precision == 1.0 and good.recall == 1.0
+        # 8 帧去抖动：首次触发在区间开始后 7 帧
+        assert good.latency_mean_ms == pytest.approx(7 / 30 * 1000)
+        assert loose.recall == 1.0 and loose.precision < 1.0
+
+    def test_process_pool_matches_in_process(self, tmp_path):
+        sessions = [_heart_session(tmp_path / "s1"), _heart_session(tmp_path / "s2")]
+        settings = grid_settings({"distance_threshold": [0.04, 0.06, 0.08, 0.11, 0.15]})
+        serial = run_sweep(sessions, "is_heart", "hand_heart", settings, workers=1)
+        parallel = run_sweep(sessions, "is_heart", "hand_heart", settings, workers=2)
+        assert json.dumps([r.as_dict() for r in parallel]) == json.dumps([r.as_dict() for r in serial])
+        assert serial[1].gestures == 4
+
+    def test_cli(self, tmp_path, capsys):
+        session = _heart_session(tmp_path / "s1")
+        out = tmp_path / "results.json"
+        assert tuning_main(["--feature", "is_heart", "--sessions", session,
+                            "--param", "distance_threshold=0.03:0.12:0.03",
+                            "--workers", "1", "--output", str(out),
+                            "--features-config", str(_features_config(tmp_path))]) == 0
+        rows = json.loads(out.read_text())
+        assert len(rows) == 4
+        assert rows[0]["f1"] == 1.0
+        assert "settings in" in capsys.readouterr().out
+
+    def test_cli_uses_mapping_trigger_rule(self, tmp_path, capsys):
+        session = _heart_session(tmp_path / "s1")
+        mappings = tmp_path / "mappings.json"
+        mappings.write_text(json.dumps({"mappings": [{
+            "id": "heart", "conditions": {"type": "all", "features": ["is_heart"]},
+            "debounce_ms": 500, "cooldown_ms": 1000}]}))
+        out = tmp_path / "results.json"
+        assert tuning_main(["--feature", "is_heart", "--sessions", session,
+                            "--param", "distance_threshold=0.06", "--workers", "1", "--output", str(out),
+                            "--features-config", str(_features_config(tmp_path)),
+                            "--mappings", str(mappings), "--user-mappings", str(tmp_path / "none.json")]) == 0
+        assert "debounce 500 ms, cooldown 1000 ms" in capsys.readouterr().out
+        # 持续 500ms 才触发：首次触发在区间开始后 15 帧
+        assert json.loads(out.read_text())[0]["latency_mean_ms"] == pytest.approx(500)
+
+
+def _features_config(tmp_path):
+    path = tmp_path / "features.json"
+    path.write_text(json.dumps({"features": {"is_heart": {"module": "hand_heart", "params": {}}}}))
+    return path
@@ -0,0 +1,101 @@
+import wave
+
+import numpy as np
+import pytest
+from src.audio.sources import WavFileSource
+from src.audio.vad import VadGate, frame_features
+
+SR = 16000
+
+
+def _tone(seconds, amp=0.3, freq=220.0):
+    t = np.arange(int(SR * seconds)) / SR
+    return (amp * 32767 * np.sin(2 * np.pi * freq * t)).astype(np.int16)
+
+
+def _hiss(seconds, amp=0.02, seed=0):
+    """低电平白噪声（清音/底噪，过零率高）。"""
+    rng = np.random.default_rng(seed)
+    return (rng.uniform(-amp, amp, int(SR * seconds)) * 32767).astype(np.int16)
+
+
+def _silence(seconds):
+    return _hiss(seconds, amp=0.0005, seed=1)
+
+
+def _wav_fixture(path, *parts):
+    data = np.concatenate(parts)
+    with wave.open(str(path), "wb") as w:
+        w.setnchannels(1)
+        w.setsampwidth(2)
+        w.setframerate(SR)
+        w.writeframes(data.tobytes())
+    return WavFileSource(str(path)).samples
+
+
+def _run(gate, samples, block):
+    out = []
+    for pos in range(0, len(samples), block):
+        out += gate.process(samples[pos:pos + block])
+    return out + gate.flush()
+
+
+class TestFrameFeatures:
+    def test_levels_and_zcr(self):
+        frames = np.stack([_silence(0.02), _tone(0.02), _hiss(0.02, amp=0.5)])
+        db, zcr = frame_features(frames)
+        assert db[0] < -50 and db[1] > -20
+        assert zcr[2] > 0.3 > zcr[1]
+
+    def test_vectorized_matches_per_frame(self):
+        gate = VadGate()
+        samples = np.concatenate([_silence(0.3), _tone(0.2), _hiss(0.2), _silence(0.3)])
+        frames = samples[:len(samples) // gate.frame_len * gate.frame_len].reshape(-1, gate.frame_len)
+        batch = gate.is_speech(frames)
+        single = [bool(gate.is_speech(f[None])[0]) for f in frames]
+        assert batch.tolist() == single
+
+
+class TestVadGate:
+    def test_single_utterance_with_preroll(self, tmp_path):
+        samples = _wav_fixture(tmp_path / "utt.wav", _silence(2.0), _tone(0.5), _silence(2.0))
+        gate = VadGate(hangover_ms=200, preroll_ms=300)
+        out = _run(gate, samples, 1600)
+        passed = np.concatenate([s for s, _ in out])
+        assert gate.stats.segments == 1
+        assert [end for _, end in out].count(True) == 1 and out[-1][1]
+        # 预卷 300ms + 语音 500ms + hangover 200ms
+        assert len(passed) == int(SR * 1.0)
+        np.testing.assert_array_equal(passed, samples[int(SR * 1.7):int(SR * 2.7)])
+        assert gate.stats.skipped_ratio == pytest.approx(1 - 1.0 / 4.5)
+        assert gate.stats.added_latency_ms == 0.0
+
+    def test_silence_is_skipped(self, tmp_path):
+        samples = _wav_fixture(tmp_path / "quiet.wav", _silence(3.0))
+        gate = VadGate()
+        assert _run(gate, samples, 1600) == []
+        assert gate.stats.skipped_ratio == 1.0
+
+    def test_unvoiced_hiss_passes(self):
+        gate = VadGate(energy_db=-20.0, unvoiced_margin_db=20.0)
+        out = _run(gate, np.concatenate([_silence(0.5), _hiss(0.3), _silence(1.0)]), 1600)
+        assert gate.stats.segments == 1 and out
+
+    def test_two_utterances(self, tmp_path):
+        samples = _wav_fixture(tmp_path / "two.wav",
+                               _silence(1.0), _tone(0.3), _silence(1.5), _tone(0.3), _silence(1.0))
+        gate = VadGate(hangover_ms=300, preroll_ms=200)
+        out = _run(gate, samples, 1600)
+        assert gate.stats.segments == 2
+        assert [end for _, end in out].count(True) == 2
+
+    @pytest.mark.parametrize("block", [320, 1000, 1600, 4801])
+    def test_block_size_independent(self, tmp_path, block):
+        samples = _wav_fixture(tmp_path / "utt.wav",
+                               _silence(1.0), _tone(0.4), _silence(0.25), _tone(0.2), _silence(1.0))
+        reference = np.concatenate([s for s, _ in _run(VadGate(), samples, 1600)])
+        gate = VadGate()
+        out = np.concatenate([s for s, _ in _run(gate, samples, block)])
+        np.testing.assert_array_equal(out, reference)
+        if block % gate.frame_len:
+            assert gate.stats.added_latency_ms > 0